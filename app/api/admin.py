@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db, get_waiting_room
+from app.config import get_settings
+from app.database import pool_monitor, replica_router
+
+from app.cache import cache_stats
+from app.models import ImportCheckpoint
+import app.services.event_cache  # noqa: F401  (registers the event caches)
+from app.services.geo_tiles import geo_tile_cache
+from app.schemas.waiting_room import WaitingRoomOpen
+from app.services.waiting_room import WaitingRoom
+
+settings = get_settings()
+
+router = APIRouter()
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Hit, miss and eviction counters for the response caches of this process"""
+    return cache_stats()
+
+
+@router.get("/geo-tiles")
+async def get_geo_tile_stats():
+    """Hit ratio and latency of nearby-event searches per geohash precision"""
+    return geo_tile_cache.stats()
+
+
+@router.get("/pool")
+async def get_pool_stats():
+    """Connection pool of this process: checkout latency, saturation, overflow and adaptive sizing"""
+    return pool_monitor.stats()
+
+
+@router.get("/replica")
+async def get_replica_stats():
+    """Read replica lag and where this process sent its read-only requests"""
+    return replica_router.stats()
+
+
+@router.get("/imports")
+async def get_imports(db: AsyncSession = Depends(get_db)):
+    """Progress of bulk import jobs, most recently active first"""
+    result = await db.execute(select(ImportCheckpoint).order_by(ImportCheckpoint.updated_at.desc()))
+    return [
+        {
+            "job": checkpoint.job,
+            "kind": checkpoint.kind,
+            "source": checkpoint.source,
+            "records_done": checkpoint.records_done,
+            "rows_loaded": checkpoint.rows_loaded,
+            "rows_rejected": checkpoint.rows_rejected,
+            "byte_offset": checkpoint.byte_offset,
+            "started_at": checkpoint.started_at,
+            "updated_at": checkpoint.updated_at,
+            "finished_at": checkpoint.finished_at,
+        }
+        for checkpoint in result.scalars().all()
+    ]
+
+
+@router.get("/waiting-room")
+async def get_waiting_room_stats(waiting_room: WaitingRoom = Depends(get_waiting_room)):
+    """Queue depth of every open waiting room, with admissions and wait times seen by this process"""
+    rooms = await waiting_room.depths()
+    for event_id, room in rooms.items():
+        metrics = waiting_room.metrics.get(event_id)
+        if metrics is not None:
+            room.update(metrics.stats())
+    return rooms
+
+
+@router.put("/waiting-room/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def open_waiting_room(
+    event_id: int,
+    room: WaitingRoomOpen,
+    waiting_room: WaitingRoom = Depends(get_waiting_room)
+):
+    """Gate an event's reservations behind a waiting room, or change its release rate"""
+    await waiting_room.open(event_id, room.rate or settings.WAITING_ROOM_DEFAULT_RATE)
+
+
+@router.delete("/waiting-room/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def close_waiting_room(
+    event_id: int,
+    waiting_room: WaitingRoom = Depends(get_waiting_room)
+):
+    """Stop gating an event; reservations no longer need an admission token"""
+    await waiting_room.close(event_id)
@@ -3,13 +3,21 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
-from app.database import get_db
+from app.api.deps import get_current_user, get_current_user_fresh, get_db
 from app.schemas.auth import Token, UserCreate, UserResponse
-from app.services.auth import AuthService, oauth2_scheme
+from app.services.auth import AuthService
+from app.services.password_hasher import PasswordHasherBusy
 from app.models import User
 
 router = APIRouter()
 
+def password_hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user: UserCreate,
@@ -19,6 +27,8 @@ async def register(
     auth_service = AuthService(db)
     try:
         return await auth_service.create_user(user)
+    except PasswordHasherBusy:
+        raise password_hasher_busy()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -32,7 +42,10 @@ async def login(
 ):
     """Log in and get an access token"""
     auth_service = AuthService(db)
-    user = await auth_service.authenticate_user(form_data.username, form_data.password)
+    try:
+        user = await auth_service.authenticate_user(form_data.username, form_data.password)
+    except PasswordHasherBusy:
+        raise password_hasher_busy()
     
     if not user:
         raise HTTPException(
@@ -50,7 +63,28 @@ async def login(
 
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(
-    current_user: User = Depends(AuthService(get_db).get_current_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get the current user's profile"""
     return current_user
+
+@router.post("/users/{user_id}/deactivate", response_model=UserResponse)
+async def deactivate_user(
+    user_id: int,
+    current_user: User = Depends(get_current_user_fresh),
+    db: AsyncSession = Depends(get_db)
+):
+    """Deactivate a user (superusers only); their tokens stop working"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    auth_service = AuthService(db)
+    try:
+        return await auth_service.deactivate_user(user_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
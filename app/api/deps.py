@@ -1,7 +1,68 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional
+from fastapi import Depends, Header, HTTPException, Response, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db as get_db_session
+from app.database import get_db as get_db_session, replica_router
+from app.models import User
+from app.redis_client import get_redis
+from app.services.auth import AuthService, oauth2_scheme
+from app.services.expiry_scheduler import ExpiryScheduler
+from app.services.waiting_room import WaitingRoom
 
 # Re-export get_db from database module
-get_db = get_db_session
\ No newline at end of file
+get_db = get_db_session
+
+
+def read_your_writes(response: Response) -> None:
+    """Route dependency for writes: the client's next reads go to the primary"""
+    replica_router.mark_write(response)
+
+
+def get_expiry_scheduler(redis: Redis = Depends(get_redis)) -> ExpiryScheduler:
+    """Dependency that provides the reservation expiry scheduler"""
+    return ExpiryScheduler(redis)
+
+
+def get_waiting_room(redis: Redis = Depends(get_redis)) -> WaitingRoom:
+    """Dependency that provides the on-sale waiting room"""
+    return WaitingRoom(redis)
+
+
+def get_admission_tokens(
+    x_admission_token: Optional[str] = Header(None),
+) -> List[str]:
+    """Admission tokens sent in ``X-Admission-Token`` (comma separated, one per event)"""
+    if not x_admission_token:
+        return []
+    return [token.strip() for token in x_admission_token.split(",") if token.strip()]
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Dependency that provides the authenticated user, from the principal cache when possible"""
+    return await AuthService(db).get_current_user(token)
+
+
+async def get_current_user_fresh(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Like ``get_current_user`` but always reads the user from the database.
+
+    Use it on sensitive routes, where a deactivation or privilege change must
+    take effect immediately in every process.
+    """
+    return await AuthService(db).get_current_user(token, use_cache=False)
+
+
+async def get_current_superuser(current_user: User = Depends(get_current_user_fresh)) -> User:
+    """Dependency that only lets superusers through, checked against the database"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
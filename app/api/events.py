@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from typing import List, Optional
 
-from app.database import get_db
+from app.config import get_settings
+from app.api.deps import read_your_writes
+from app.database import get_db, get_read_db, get_read_sessionmaker
+from app.responses import FastJSONResponse
 from app.schemas.event import EventCreate, EventResponse, EventUpdate
 from app.services.event import EventService
+from app.services.lean_reads import LeanReadService
+from app.services.ticket_export import MEDIA_TYPES, TicketExporter
+
+settings = get_settings()
 
 router = APIRouter()
 
-@router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(read_your_writes)])
 async def create_event(
     event_data: EventCreate,
     db: AsyncSession = Depends(get_db)
@@ -26,27 +35,65 @@ async def create_event(
 
 @router.get("/", response_model=List[EventResponse])
 async def list_events(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all events with pagination"""
+    """List events ordered by start time.
+    
+    Use skip/limit for offset pages, or follow the X-Next-Cursor response
+    header with ``cursor`` for keyset pages that stay fast at any depth.
+    """
     event_service = EventService(db)
-    events = await event_service.get_all_events()
-    return events[skip : skip + limit]
+    try:
+        events, next_cursor = await event_service.get_events_page(skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return events
 
 @router.get("/{event_id}", response_model=EventResponse)
 async def get_event(
     event_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get event by ID"""
     event_service = EventService(db)
     try:
+        if settings.LEAN_READS_ENABLED:
+            return FastJSONResponse(await LeanReadService(db).get_event(event_id))
         event = await event_service.get_event_by_id(event_id)
         return event
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+@router.get("/{event_id}/tickets/export")
+async def export_event_tickets(
+    event_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_read_db),
+    sessions: async_sessionmaker = Depends(get_read_sessionmaker)
+):
+    """Stream an event's tickets (attendee list) as NDJSON or CSV"""
+    event_service = EventService(db)
+    try:
+        await event_service.get_event_by_id(event_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    return StreamingResponse(
+        TicketExporter(sessions).for_event(event_id, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="event-{event_id}-tickets.{format}"'}
+    )
@@ -1,21 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_read_db
 from app.schemas.event import EventResponse
 from app.services.for_you import ForYouService
 
+settings = get_settings()
+
 router = APIRouter()
 
 @router.get("/events/nearby", response_model=List[EventResponse])
 async def get_nearby_events(
     latitude: float,
     longitude: float,
-    radius_km: float = 10,
+    radius_km: float = Query(10, gt=0, le=settings.NEARBY_MAX_RADIUS_KM),
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get events near a specific location"""
     for_you_service = ForYouService(db)
@@ -38,7 +41,7 @@ async def get_nearby_events(
 async def get_recommended_events(
     user_id: int,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get recommended events for a user"""
     for_you_service = ForYouService(db)
@@ -1,25 +1,175 @@
+import logging
+from collections import Counter
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from redis.asyncio import Redis
 from typing import List
 
-from app.database import get_db
-from app.schemas.ticket import TicketCreate, TicketResponse, TicketPayment
+from app.config import get_settings
+from app.api.deps import get_admission_tokens, get_expiry_scheduler, get_waiting_room, read_your_writes
+from app.database import get_db, get_read_db, get_read_sessionmaker
+from app.redis_client import get_redis
+from app.responses import FastJSONResponse
+from app.schemas.ticket import (
+    BatchPayment, BulkTicketCreate, PaymentOutcome, TicketCreate, TicketResponse, TicketPayment,
+    ReservationResponse
+)
+from app.services.expiry_scheduler import ExpiryScheduler
+from app.services.lean_reads import LeanReadService
+from app.services.reservation_ledger import ReservationLedger
 from app.services.ticket import TicketService
-from app.celery_app.tasks import expire_ticket
+from app.services.ticket_export import MEDIA_TYPES, TicketExporter
+from app.services.waiting_room import NotAdmitted, WaitingRoom
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
+def not_admitted(error: NotAdmitted) -> HTTPException:
+    if error.retry_after is None:
+        return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(error))
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+@asynccontextmanager
+async def admission(waiting_room: WaitingRoom, event_ids, tokens: List[str]):
+    """Only clients let out of an open waiting room may reserve for its event.
+
+    The tokens are spent for the reservation made in the block; if it fails
+    they are given back, so the client keeps its place.
+    """
+    try:
+        used = await waiting_room.admit(event_ids, tokens)
+    except NotAdmitted as e:
+        raise not_admitted(e)
+    try:
+        yield
+    except BaseException:
+        await waiting_room.release(used)
+        raise
+
+@router.post("/", response_model=TicketResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(read_your_writes)])
 async def create_ticket(
     ticket_data: TicketCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    expiry_scheduler: ExpiryScheduler = Depends(get_expiry_scheduler),
+    waiting_room: WaitingRoom = Depends(get_waiting_room),
+    admission_tokens: List[str] = Depends(get_admission_tokens)
 ):
     """Create a new ticket for an event"""
     ticket_service = TicketService(db)
+    async with admission(waiting_room, [ticket_data.event_id], admission_tokens):
+        try:
+            ticket = await ticket_service.create_ticket(ticket_data)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
     try:
-        ticket = await ticket_service.create_ticket(ticket_data)
-        return ticket
+        await expiry_scheduler.schedule(ticket.id, ticket.created_at)
+    except Exception:
+        # The periodic sweep still expires the reservation
+        logger.warning("Could not schedule expiry for ticket %s", ticket.id, exc_info=True)
+    
+    return ticket
+
+@router.post("/bulk", response_model=List[TicketResponse], status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(read_your_writes)])
+async def create_tickets_bulk(
+    bulk_data: BulkTicketCreate,
+    db: AsyncSession = Depends(get_db),
+    expiry_scheduler: ExpiryScheduler = Depends(get_expiry_scheduler),
+    waiting_room: WaitingRoom = Depends(get_waiting_room),
+    admission_tokens: List[str] = Depends(get_admission_tokens)
+):
+    """Reserve several tickets, possibly for several events; either all are reserved or none"""
+    quantities = Counter()
+    for item in bulk_data.items:
+        quantities[item.event_id] += item.quantity
+    ticket_service = TicketService(db)
+    async with admission(waiting_room, quantities, admission_tokens):
+        try:
+            tickets = await ticket_service.create_tickets_bulk(bulk_data.user_id, quantities)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    try:
+        await expiry_scheduler.schedule_many([(ticket.id, ticket.created_at) for ticket in tickets])
+    except Exception:
+        # The periodic sweep still expires the reservations
+        logger.warning("Could not schedule expiry for %d bulk tickets", len(tickets), exc_info=True)
+    
+    return tickets
+
+@router.post("/reservations", response_model=ReservationResponse, status_code=status.HTTP_202_ACCEPTED,
+             dependencies=[Depends(read_your_writes)])
+async def create_reservation(
+    ticket_data: TicketCreate,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    waiting_room: WaitingRoom = Depends(get_waiting_room),
+    admission_tokens: List[str] = Depends(get_admission_tokens)
+):
+    """Reserve a seat through the Redis fast path; the ticket row is written shortly after"""
+    if not settings.RESERVATION_LEDGER_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation ledger is disabled"
+        )
+    ledger = ReservationLedger(redis)
+    async with admission(waiting_room, [ticket_data.event_id], admission_tokens):
+        try:
+            reservation_id = await ledger.reserve(db, ticket_data.event_id, ticket_data.user_id)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    return {"reservation_id": reservation_id, "status": "pending", "ticket_id": None}
+
+@router.get("/reservations/{reservation_id}", response_model=ReservationResponse)
+async def get_reservation(
+    reservation_id: int,
+    redis: Redis = Depends(get_redis)
+):
+    """Get the state of a fast-path reservation and its ticket id once written"""
+    reservation = await ReservationLedger(redis).status(reservation_id)
+    if reservation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Reservation with id {reservation_id} not found"
+        )
+    return reservation
+
+@router.post("/pay/batch", response_model=List[PaymentOutcome], dependencies=[Depends(read_your_writes)])
+async def pay_tickets_batch(
+    batch: BatchPayment,
+    db: AsyncSession = Depends(get_db)
+):
+    """Confirm many payments at once, e.g. from a provider's reconciliation file
+    
+    Safe to replay: tickets already paid with the same reference come back as
+    ``already_paid``.
+    """
+    ticket_service = TicketService(db)
+    try:
+        return await ticket_service.pay_tickets(
+            [(payment.ticket_id, payment.payment_reference) for payment in batch.payments],
+            paid_at=datetime.now(timezone.utc)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -29,9 +179,17 @@ async def create_ticket(
 @router.get("/{ticket_id}", response_model=TicketResponse)
 async def get_ticket(
     ticket_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get ticket by ID"""
+    if settings.LEAN_READS_ENABLED:
+        try:
+            return FastJSONResponse(await LeanReadService(db).get_ticket(ticket_id))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=str(e)
+            )
     ticket_service = TicketService(db)
     try:
         ticket = await ticket_service.get_ticket_by_id(ticket_id)
@@ -45,9 +203,11 @@ async def get_ticket(
 @router.get("/user/{user_id}", response_model=List[TicketResponse])
 async def get_user_tickets(
     user_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all tickets for a user"""
+    if settings.LEAN_READS_ENABLED:
+        return FastJSONResponse(await LeanReadService(db).get_user_tickets(user_id))
     ticket_service = TicketService(db)
     try:
         tickets = await ticket_service.get_tickets_by_user(user_id)
@@ -58,7 +218,20 @@ async def get_user_tickets(
             detail=str(e)
         )
 
-@router.post("/{ticket_id}/pay", response_model=TicketResponse)
+@router.get("/user/{user_id}/export")
+async def export_user_tickets(
+    user_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    sessions: async_sessionmaker = Depends(get_read_sessionmaker)
+):
+    """Stream all tickets of a user as NDJSON or CSV, without loading them all in memory"""
+    return StreamingResponse(
+        TicketExporter(sessions).for_user(user_id, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="user-{user_id}-tickets.{format}"'}
+    )
+
+@router.post("/{ticket_id}/pay", response_model=TicketResponse, dependencies=[Depends(read_your_writes)])
 async def pay_ticket(
     ticket_id: int,
     payment_data: TicketPayment,
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.deps import get_waiting_room
+from app.schemas.waiting_room import WaitingRoomPosition
+from app.services.waiting_room import WaitingRoom
+
+router = APIRouter()
+
+@router.post("/{event_id}", response_model=WaitingRoomPosition, status_code=status.HTTP_201_CREATED)
+async def join_waiting_room(
+    event_id: int,
+    waiting_room: WaitingRoom = Depends(get_waiting_room)
+):
+    """Take a place in an event's waiting room"""
+    try:
+        return await waiting_room.join(event_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+@router.get("/{event_id}/{token}", response_model=WaitingRoomPosition)
+async def get_waiting_room_position(
+    event_id: int,
+    token: str,
+    waiting_room: WaitingRoom = Depends(get_waiting_room)
+):
+    """Poll a place in the waiting room; reserve once ``admitted`` is true"""
+    try:
+        return await waiting_room.status(event_id, token)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
@@ -0,0 +1,234 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Every named cache, for stats and test resets
+_registry: Dict[str, "TwoTierCache"] = {}
+_local_registry: Dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """In-process LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: Optional[float] = None) -> None:
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TwoTierCache:
+    """JSON payload cache: an in-process ``TTLCache`` in front of Redis.
+
+    Redis is shared by every API process and Celery worker, so deletes made
+    anywhere reach it at once; the local tier of other processes catches up
+    within ``local_ttl``. Redis failures degrade to the local tier and pause
+    Redis use for ``retry_after`` seconds instead of failing the request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        local_maxsize: int,
+        local_ttl: float,
+        redis_ttl: float,
+        retry_after: float = 5.0,
+    ):
+        self.name = name
+        self.local = TTLCache(local_maxsize, local_ttl)
+        self.redis_ttl = redis_ttl
+        self.retry_after = retry_after
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+        self._client = None
+        self._client_set = False
+        self._redis_down_until = 0.0
+        _registry[name] = self
+
+    def _key(self, key) -> str:
+        return f"cache:{self.name}:{key}"
+
+    def use_redis(self, client) -> None:
+        """Pin the Redis client (``None`` disables the Redis tier)"""
+        self._client = client
+        self._client_set = True
+
+    @property
+    def redis(self):
+        if not self._client_set:
+            from app.redis_client import get_redis
+            self.use_redis(get_redis())
+        if self._client is None or time.monotonic() < self._redis_down_until:
+            return None
+        return self._client
+
+    def _redis_failed(self) -> None:
+        self.redis_errors += 1
+        self._redis_down_until = time.monotonic() + self.retry_after
+        logger.warning("Redis unavailable for cache %s", self.name, exc_info=True)
+
+    async def get(self, key) -> Optional[Any]:
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: Iterable) -> Dict[Any, Any]:
+        """Return the cached values found for ``keys``"""
+        keys = list(keys)
+        found = await self._lookup(keys)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def _lookup(self, keys: List) -> Dict[Any, Any]:
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.local.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        client = self.redis
+        if missing and client is not None:
+            try:
+                raw_values = await client.mget([self._key(key) for key in missing])
+            except RedisError:
+                self._redis_failed()
+                return found
+            for key, raw in zip(missing, raw_values):
+                if raw is None:
+                    self.redis_misses += 1
+                    continue
+                self.redis_hits += 1
+                value = json.loads(raw)
+                self.local.set(key, value)
+                found[key] = value
+        return found
+
+    async def set(self, key, value) -> None:
+        await self.set_many({key: value})
+
+    async def set_many(self, items: Dict[Any, Any]) -> None:
+        for key, value in items.items():
+            self.local.set(key, value)
+        client = self.redis
+        if not items or client is None:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(self._key(key), json.dumps(value), ex=max(int(self.redis_ttl), 1))
+                await pipe.execute()
+        except RedisError:
+            self._redis_failed()
+
+    async def delete_many(self, keys: Iterable) -> None:
+        keys = list(keys)
+        for key in keys:
+            self.local.delete(key)
+        client = self.redis
+        if not keys or client is None:
+            return
+        try:
+            await client.delete(*[self._key(key) for key in keys])
+        except RedisError:
+            self._redis_failed()
+
+    async def delete(self, key) -> None:
+        await self.delete_many([key])
+
+    def clear_local(self) -> None:
+        self.local.clear()
+
+    def stats(self) -> dict:
+        local = self.local.stats()
+        return {
+            "local": local,
+            "redis": {
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "errors": self.redis_errors,
+            },
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": local["evictions"],
+        }
+
+
+def registered_caches() -> List[TwoTierCache]:
+    return list(_registry.values())
+
+
+def register_local_cache(name: str, cache: TTLCache) -> TTLCache:
+    """Report a process-local cache in ``cache_stats``"""
+    _local_registry[name] = cache
+    return cache
+
+
+def clear_local_caches() -> None:
+    for cache in _local_registry.values():
+        cache.clear()
+    for cache in _registry.values():
+        cache.clear_local()
+
+
+def cache_stats() -> Dict[str, dict]:
+    """Hit/miss/eviction counters of every named cache"""
+    stats = {name: cache.stats() for name, cache in _local_registry.items()}
+    stats.update({name: cache.stats() for name, cache in _registry.items()})
+    return stats
@@ -21,9 +21,23 @@ app.conf.update(
     task_time_limit=30 * 60,  # 30 minutes
     imports=('app.celery_app.tasks',),
     beat_schedule={
-        'expire-tickets-every-minute': {
+        # Safety net; reservations are normally released on time by
+        # the per-second tasks queued through ExpiryScheduler
+        'expire-tickets-sweep': {
             'task': 'tasks.expire_tickets',
-            'schedule': 60.0,  # Run every 60 seconds
+            'schedule': settings.EXPIRY_SWEEP_SECONDS,
+        },
+        'reconcile-inventory': {
+            'task': 'tasks.reconcile_inventory',
+            'schedule': settings.INVENTORY_RECONCILE_SECONDS,
+        },
+        'flush-reservations': {
+            'task': 'tasks.flush_reservations',
+            'schedule': settings.RESERVATION_FLUSH_SECONDS,
+        },
+        'build-recommendations': {
+            'task': 'tasks.build_recommendations',
+            'schedule': settings.RECOMMENDATION_BUILD_SECONDS,
         },
     },
 )
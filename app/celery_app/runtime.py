@@ -0,0 +1,97 @@
+from __future__ import absolute_import
+import asyncio
+import threading
+from typing import Awaitable, Optional, TypeVar
+
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.cache import registered_caches
+from app.config import get_settings
+from app.instrumentation import instrument_engine
+from app.redis_client import create_redis
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """Event loop, engine and Redis client shared by all tasks in a worker process.
+
+    The loop runs in a background thread, so tasks executed concurrently by a
+    threads/gevent pool are multiplexed onto one loop and one connection pool
+    instead of each paying for a fresh loop, pool and handshake.
+    """
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.engine: Optional[AsyncEngine] = None
+        self.sessions: Optional[async_sessionmaker] = None
+        self.redis: Optional[redis.Redis] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self.loop is not None
+
+    def start(self, force: bool = False) -> None:
+        """Create the loop, engine and clients.
+
+        ``force`` discards state inherited from a parent process after fork
+        without touching it, since its loop thread does not exist here.
+        """
+        with self._lock:
+            if self.started and not force:
+                return
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self.loop.run_forever, name="celery-asyncio", daemon=True
+            )
+            self._thread.start()
+            self.engine = create_async_engine(
+                settings.DATABASE_URL,
+                pool_size=settings.CELERY_DB_POOL_SIZE,
+                max_overflow=settings.CELERY_DB_MAX_OVERFLOW,
+            )
+            # Slow and sampled SQL logging, as in the API
+            instrument_engine(self.engine)
+            self.sessions = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+            self.redis = create_redis()
+            # Cache invalidations made by tasks go through this loop's client
+            for cache in registered_caches():
+                cache.use_redis(self.redis)
+
+    def session(self) -> AsyncSession:
+        if not self.started:
+            self.start()
+        return self.sessions()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the shared loop and wait for its result"""
+        if not self.started:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self) -> None:
+        """Dispose of the engine and clients and stop the loop"""
+        with self._lock:
+            if not self.started:
+                return
+            loop, thread = self.loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout=10)
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(timeout=10)
+                loop.close()
+                self.loop = self._thread = None
+                self.engine = self.sessions = self.redis = None
+
+    async def _close(self) -> None:
+        await self.engine.dispose()
+        await self.redis.aclose()
+
+
+runtime = WorkerRuntime()
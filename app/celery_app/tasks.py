@@ -1,58 +1,149 @@
 from __future__ import absolute_import
-import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import logging
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 from app.config import get_settings
+from app.services.expiry_scheduler import ExpiryScheduler
+from app.services.recommendations import RecommendationService
+from app.services.reservation_ledger import ReservationLedger
 from app.services.ticket import TicketService
 from .celery import app
+from .runtime import runtime
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Give each forked pool process its own loop, engine and Redis client"""
+    runtime.start(force=True)
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    """Close pooled connections when the worker process exits"""
+    runtime.stop()
 
 def get_async_session():
-    engine = create_async_engine(settings.DATABASE_URL)
-    return async_sessionmaker(engine, expire_on_commit=False)()
+    return runtime.session()
+
+def get_ledger():
+    return ReservationLedger(runtime.redis) if settings.RESERVATION_LEDGER_ENABLED else None
 
 async def _expire_tickets_async():
     """Async function to expire unpaid tickets"""
     async with get_async_session() as db:
-        ticket_service = TicketService(db)
+        ticket_service = TicketService(db, ledger=get_ledger())
         try:
             expired_count = await ticket_service.expire_old_tickets()
             return expired_count
-        except Exception as e:
-            print(f"Error in expire_tickets: {str(e)}")
+        except Exception:
+            logger.exception("expire_tickets failed")
             raise
 
 @app.task(name='tasks.expire_tickets')
 def expire_tickets():
     """Celery task to expire unpaid tickets"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_expire_tickets_async())
-    finally:
-        loop.close()
+    return runtime.run(_expire_tickets_async())
 
 async def _expire_ticket_async(ticket_id: int):
     """Async function to expire a specific ticket"""
     async with get_async_session() as db:
-        ticket_service = TicketService(db)
+        ticket_service = TicketService(db, ledger=get_ledger())
         try:
-            ticket = await ticket_service.get_ticket_by_id(ticket_id)
-            if ticket and ticket.status == 'reserved':
-                ticket.status = 'expired'
-                await db.commit()
-                return True
-            return False
-        except Exception as e:
-            print(f"Error in expire_ticket: {str(e)}")
+            # Goes through the bulk expiry path so the seat is returned too
+            return await ticket_service.expire_tickets([ticket_id]) == 1
+        except Exception:
+            logger.exception("expire_ticket failed")
             raise
 
 @app.task(name='tasks.expire_ticket')
 def expire_ticket(ticket_id: int):
     """Celery task to expire a specific ticket"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    return runtime.run(_expire_ticket_async(ticket_id))
+
+async def _expire_due_tickets_async(deadline: int):
+    """Async function to expire every scheduled ticket due by ``deadline``"""
+    scheduler = ExpiryScheduler(runtime.redis)
     try:
-        return loop.run_until_complete(_expire_ticket_async(ticket_id))
-    finally:
-        loop.close()
\ No newline at end of file
+        ticket_ids = await scheduler.due(deadline)
+        if not ticket_ids:
+            return 0
+        async with get_async_session() as db:
+            expired_count = await TicketService(db, ledger=get_ledger()).expire_tickets(ticket_ids)
+        await scheduler.discard(ticket_ids)
+        return expired_count
+    except Exception:
+        logger.exception("expire_due_tickets failed")
+        raise
+
+@app.task(name='tasks.expire_due_tickets')
+def expire_due_tickets(deadline: int):
+    """Celery ETA task releasing all reservations whose deadline second has passed"""
+    return runtime.run(_expire_due_tickets_async(deadline))
+
+async def _reconcile_inventory_async():
+    """Async function to sync event counters with inventory shards"""
+    async with get_async_session() as db:
+        ticket_service = TicketService(db)
+        try:
+            return await ticket_service.reconcile_inventory()
+        except Exception:
+            logger.exception("reconcile_inventory failed")
+            raise
+
+@app.task(name='tasks.reconcile_inventory')
+def reconcile_inventory():
+    """Celery task to sync Event.tickets_sold with the sharded inventory"""
+    if settings.INVENTORY_SHARDS <= 0:
+        return 0
+    return runtime.run(_reconcile_inventory_async())
+
+async def _flush_reservations_async():
+    """Async function to write queued ledger reservations to Postgres"""
+    ledger = ReservationLedger(runtime.redis)
+    flushed = 0
+    try:
+        async with get_async_session() as db:
+            while True:
+                count = await ledger.flush(db)
+                flushed += count
+                if count < settings.RESERVATION_FLUSH_BATCH_SIZE:
+                    return flushed
+    except Exception:
+        logger.exception("flush_reservations failed")
+        raise
+
+@app.task(name='tasks.flush_reservations')
+def flush_reservations():
+    """Celery task to drain the reservation ledger into the tickets table"""
+    if not settings.RESERVATION_LEDGER_ENABLED:
+        return 0
+    return runtime.run(_flush_reservations_async())
+
+async def _rebuild_reservation_ledger_async():
+    """Async function to replay the reservation ledger from the tickets table"""
+    try:
+        async with get_async_session() as db:
+            return await ReservationLedger(runtime.redis).rebuild(db)
+    except Exception:
+        logger.exception("rebuild_reservation_ledger failed")
+        raise
+
+@app.task(name='tasks.rebuild_reservation_ledger')
+def rebuild_reservation_ledger():
+    """Celery task to rebuild the Redis seat counters after a crash"""
+    return runtime.run(_rebuild_reservation_ledger_async())
+
+async def _build_recommendations_async():
+    """Async function to rebuild recommendation candidates of changed users"""
+    async with get_async_session() as db:
+        try:
+            return await RecommendationService(db).build()
+        except Exception:
+            logger.exception("build_recommendations failed")
+            raise
+
+@app.task(name='tasks.build_recommendations')
+def build_recommendations():
+    """Celery task to incrementally refresh the precomputed recommendations"""
+    return runtime.run(_build_recommendations_async())
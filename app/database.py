@@ -1,19 +1,31 @@
 from typing import AsyncGenerator
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.config import get_settings
+from app.db_pool import InstrumentedQueuePool, PoolMonitor
+from app.db_replica import ReplicaRouter
+from app.instrumentation import instrument_engine
 
 settings = get_settings()
 
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=True,  # Set to False in production
+    # Full statement logging is costly; see SQL_LOG_SAMPLE_RATE / SQL_LOG_SLOW_MS
+    echo=settings.SQL_ECHO,
     future=True,
-    pool_pre_ping=True,
-    pool_size=20,
-    max_overflow=10,
+    # In adaptive mode the pool monitor pings idle connections instead
+    pool_pre_ping=not settings.DB_POOL_ADAPTIVE,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    poolclass=InstrumentedQueuePool,
 )
+# Statement counts, DB time per request and sampled SQL logging
+instrument_engine(engine)
+pool_monitor = PoolMonitor(engine)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -24,6 +36,30 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Read replica for read-only routes, when configured
+read_engine = None
+ReadSessionLocal = None
+if settings.READ_REPLICA_URL:
+    read_engine = create_async_engine(
+        settings.READ_REPLICA_URL,
+        echo=settings.SQL_ECHO,
+        future=True,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    instrument_engine(read_engine)
+    ReadSessionLocal = async_sessionmaker(
+        bind=read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+replica_router = ReplicaRouter(AsyncSessionLocal, ReadSessionLocal)
+
 # Base class for models
 Base = declarative_base()
 
@@ -39,4 +75,35 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+def get_sessionmaker() -> async_sessionmaker:
+    """Dependency that provides the session factory.
+    
+    For work that outlives the request's own session, such as streaming
+    response bodies.
+    """
+    return AsyncSessionLocal
+
+
+async def get_read_sessionmaker(request: Request) -> async_sessionmaker:
+    """Session factory for read-only work, possibly outliving the request.
+
+    Bound to the read replica unless it lags too far behind or the client
+    wrote recently, in which case the primary serves the read. FastAPI
+    caches the result per request, so routing is decided once even when a
+    route also takes ``get_read_db``.
+    """
+    return await replica_router.sessions_for(request)
+
+
+async def get_read_db(
+    sessions: async_sessionmaker = Depends(get_read_sessionmaker)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides a session for read-only routes"""
+    async with sessions() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import get_settings
+from app.instrumentation import current_request, pool_wait
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class PoolTelemetryMixin:
+    """Checkout latency, saturation and overflow counters for a ``QueuePool``.
+
+    Peaks are tracked per window; ``take_window`` returns and resets them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.telemetry = {
+            "checkouts": 0,
+            "waited_checkouts": 0,
+            "timeouts": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "waiting": 0,
+            "peak_in_use": 0,
+            "peak_overflow": 0,
+            "window_peak_in_use": 0,
+            "window_peak_waiting": 0,
+            "window_timeouts": 0,
+        }
+
+    def _do_get(self):
+        telemetry = self.telemetry
+        telemetry["waiting"] += 1
+        telemetry["window_peak_waiting"] = max(telemetry["window_peak_waiting"], telemetry["waiting"])
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            telemetry["timeouts"] += 1
+            telemetry["window_timeouts"] += 1
+            raise
+        finally:
+            telemetry["waiting"] -= 1
+            waited = time.perf_counter() - start
+            pool_wait.observe(waited)
+            stats = current_request.get()
+            if stats is not None:
+                stats.pool_wait_seconds += waited
+            telemetry["wait_seconds_total"] += waited
+            telemetry["wait_seconds_max"] = max(telemetry["wait_seconds_max"], waited)
+            if waited > 0.001:
+                telemetry["waited_checkouts"] += 1
+
+        telemetry["checkouts"] += 1
+        in_use = self.checkedout()
+        telemetry["peak_in_use"] = max(telemetry["peak_in_use"], in_use)
+        telemetry["window_peak_in_use"] = max(telemetry["window_peak_in_use"], in_use)
+        telemetry["peak_overflow"] = max(telemetry["peak_overflow"], self.overflow())
+        return record
+
+    def take_window(self) -> dict:
+        """Peak demand since the previous call"""
+        telemetry = self.telemetry
+        window = {
+            "peak_in_use": max(telemetry["window_peak_in_use"], self.checkedout()),
+            "peak_waiting": telemetry["window_peak_waiting"],
+            "timeouts": telemetry["window_timeouts"],
+        }
+        telemetry["window_peak_in_use"] = 0
+        telemetry["window_peak_waiting"] = 0
+        telemetry["window_timeouts"] = 0
+        return window
+
+    def set_max_overflow(self, max_overflow: int) -> None:
+        """Change how many connections may be opened beyond ``pool_size``.
+
+        Lowering it never closes connections in use; surplus connections are
+        closed as they come back.
+        """
+        with self._overflow_lock:
+            self._max_overflow = max_overflow
+
+    def stats(self) -> dict:
+        telemetry = self.telemetry
+        capacity = self.size() + max(self._max_overflow, 0)
+        in_use = self.checkedout()
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": in_use,
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "waiting": telemetry["waiting"],
+            "saturation": round(in_use / capacity, 3) if capacity else 0.0,
+            "checkouts": telemetry["checkouts"],
+            "waited_checkouts": telemetry["waited_checkouts"],
+            "timeouts": telemetry["timeouts"],
+            "wait_ms_avg": round(
+                telemetry["wait_seconds_total"] / telemetry["checkouts"] * 1000, 3
+            ) if telemetry["checkouts"] else 0.0,
+            "wait_ms_max": round(telemetry["wait_seconds_max"] * 1000, 3),
+            "peak_checked_out": telemetry["peak_in_use"],
+            "peak_overflow": max(telemetry["peak_overflow"], 0),
+        }
+
+
+class InstrumentedQueuePool(PoolTelemetryMixin, AsyncAdaptedQueuePool):
+    """The engine's async queue pool, with checkout telemetry"""
+
+
+def target_max_overflow(
+    pool_size: int,
+    current: int,
+    peak_in_use: int,
+    peak_waiting: int,
+    headroom: float,
+    limit: int,
+) -> int:
+    """Overflow allowance that covers the observed peak demand with headroom.
+
+    Grows at once to meet demand; shrinks by at most a quarter per step so a
+    short lull does not drop connections that are about to be needed again.
+    """
+    demand = peak_in_use + peak_waiting
+    wanted = min(max(math.ceil(demand * headroom) - pool_size, 0), limit)
+    if wanted >= current:
+        return wanted
+    return max(wanted, current - max(1, current // 4))
+
+
+class PoolMonitor:
+    """Background upkeep of the engine's pool in adaptive mode.
+
+    Every ``DB_POOL_ADAPT_SECONDS`` the overflow allowance is resized from
+    the peak concurrency seen since the last step. Every
+    ``DB_POOL_LIVENESS_SECONDS`` each idle connection is pinged once, which
+    replaces ``pool_pre_ping``'s round trip on every checkout; a dead
+    connection invalidates the pool the same way a failed pre-ping does.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.resizes = 0
+        self.liveness_checks = 0
+        self.liveness_failures = 0
+        self.last_resize_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pool(self):
+        return self.engine.pool
+
+    def resize(self) -> int:
+        window = self.pool.take_window()
+        current = self.pool._max_overflow
+        target = target_max_overflow(
+            self.pool.size(),
+            current,
+            window["peak_in_use"],
+            window["peak_waiting"],
+            settings.DB_POOL_HEADROOM,
+            settings.DB_POOL_MAX_OVERFLOW_LIMIT,
+        )
+        if target != current:
+            self.pool.set_max_overflow(target)
+            self.resizes += 1
+            logger.info("Pool max_overflow %d -> %d (peak in use %d, waiting %d)",
+                        current, target, window["peak_in_use"], window["peak_waiting"])
+        self.last_resize_at = time.time()
+        return target
+
+    async def check_liveness(self) -> int:
+        """Ping every idle connection once; returns how many failed"""
+        failures = 0
+        # The queue hands out idle connections in FIFO order, so checking one
+        # out this many times visits each of them
+        for _ in range(self.pool.checkedin()):
+            try:
+                async with self.engine.connect() as conn:
+                    await conn.exec_driver_sql("SELECT 1")
+            except exc.DBAPIError:
+                failures += 1
+        self.liveness_checks += 1
+        self.liveness_failures += failures
+        return failures
+
+    async def run(self) -> None:
+        last_liveness = time.monotonic()
+        while True:
+            await asyncio.sleep(settings.DB_POOL_ADAPT_SECONDS)
+            try:
+                self.resize()
+                if time.monotonic() - last_liveness >= settings.DB_POOL_LIVENESS_SECONDS:
+                    last_liveness = time.monotonic()
+                    await self.check_liveness()
+            except Exception:
+                logger.warning("Pool upkeep failed", exc_info=True)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "adaptive": settings.DB_POOL_ADAPTIVE,
+            "pre_ping": not settings.DB_POOL_ADAPTIVE,
+            "max_overflow_limit": settings.DB_POOL_MAX_OVERFLOW_LIMIT,
+            "resizes": self.resizes,
+            "liveness_checks": self.liveness_checks,
+            "liveness_failures": self.liveness_failures,
+            "pool": self.pool.stats(),
+        }
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Clients that just wrote read from the primary until this epoch second
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+async def measure_replica_lag(primary: async_sessionmaker, replica: async_sessionmaker) -> float:
+    """Seconds the replica is behind the primary.
+
+    A replica that has replayed all of the primary's WAL counts as current
+    even if its last replayed transaction is old, i.e. the primary was idle.
+    A database that is not in recovery stands in for a replica with no lag.
+    """
+    async with replica() as db:
+        in_recovery, replay_lsn, lag = (await db.execute(text(
+            "SELECT pg_is_in_recovery(), pg_last_wal_replay_lsn()::text, "
+            "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+        ))).one()
+    if not in_recovery:
+        return 0.0
+    if replay_lsn is None:
+        return float("inf")
+    async with primary() as db:
+        behind = await db.scalar(
+            text("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), CAST(:lsn AS pg_lsn))"),
+            {"lsn": replay_lsn},
+        )
+    if behind <= 0:
+        return 0.0
+    return float(lag or 0.0)
+
+
+class ReplicaRouter:
+    """Picks the session factory for read-only requests.
+
+    Reads go to the replica unless it is lagging more than
+    ``REPLICA_MAX_LAG_SECONDS`` (or unreachable), or the client wrote
+    recently and carries the read-your-writes cookie; those read from the
+    primary. Lag is probed at most every ``REPLICA_LAG_CHECK_SECONDS`` and
+    for at most ``REPLICA_PROBE_TIMEOUT_SECONDS``; requests arriving while a
+    probe is running use the last measurement instead of waiting for it.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replica: Optional[async_sessionmaker] = None,
+        probe: Optional[Callable[[], Awaitable[float]]] = None,
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.probe = probe or (lambda: measure_replica_lag(primary, replica))
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.sticky_reads = 0
+        self.lag_fallbacks = 0
+        self._lag: Optional[float] = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def mark_write(response: Response) -> None:
+        """Send this client's reads to the primary until the replica has caught up"""
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            str(int(time.time() + settings.READ_YOUR_WRITES_SECONDS)),
+            max_age=int(settings.READ_YOUR_WRITES_SECONDS),
+            httponly=True,
+            samesite="lax",
+        )
+
+    @staticmethod
+    def is_sticky(request: Request) -> bool:
+        try:
+            return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    async def lag(self) -> Optional[float]:
+        """Last measured replica lag in seconds; ``None`` if the replica is unreachable"""
+        if time.monotonic() - self._checked_at < settings.REPLICA_LAG_CHECK_SECONDS:
+            return self._lag
+        if self._lock.locked():
+            return self._lag
+        async with self._lock:
+            if time.monotonic() - self._checked_at >= settings.REPLICA_LAG_CHECK_SECONDS:
+                try:
+                    # A replica that is down would otherwise hold every
+                    # request for the full connect timeout
+                    self._lag = await asyncio.wait_for(
+                        self.probe(), timeout=settings.REPLICA_PROBE_TIMEOUT_SECONDS
+                    )
+                except Exception:
+                    logger.warning("Could not measure replica lag", exc_info=True)
+                    self._lag = None
+                self._checked_at = time.monotonic()
+        return self._lag
+
+    async def sessions_for(self, request: Request) -> async_sessionmaker:
+        if self.replica is None:
+            self.primary_reads += 1
+            return self.primary
+        if self.is_sticky(request):
+            self.sticky_reads += 1
+            return self.primary
+        lag = await self.lag()
+        if lag is None or lag > settings.REPLICA_MAX_LAG_SECONDS:
+            self.lag_fallbacks += 1
+            return self.primary
+        self.replica_reads += 1
+        return self.replica
+
+    def stats(self) -> dict:
+        return {
+            "replica_configured": self.replica is not None,
+            "lag_seconds": self._lag,
+            "max_lag_seconds": settings.REPLICA_MAX_LAG_SECONDS,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+            "lag_fallbacks": self.lag_fallbacks,
+        }
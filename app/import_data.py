@@ -0,0 +1,46 @@
+"""Bulk import events, users or tickets from CSV or NDJSON.
+
+Rerunning the same command resumes after the last committed batch; pass
+``--restart`` to load the file again from the top. Progress is printed as
+one JSON line per batch.
+
+    python -m app.import_data events events.csv
+    python -m app.import_data users users.ndjson --batch-rows 20000 --rejects users.rejects.ndjson
+    python -m app.import_data tickets tickets.csv --job staging-tickets
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from app.services.bulk_import import LOADERS, BulkImporter, ImportProgress
+
+
+def print_progress(progress: ImportProgress) -> None:
+    print(json.dumps(progress.as_dict()), file=sys.stderr, flush=True)
+
+
+async def main(args) -> ImportProgress:
+    importer = BulkImporter(batch_rows=args.batch_rows, workers=args.workers, progress=print_progress)
+    return await importer.run(
+        args.kind,
+        args.path,
+        fmt=args.format,
+        job=args.job,
+        rejects=args.rejects,
+        restart=args.restart,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=list(LOADERS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Default: from the file extension")
+    parser.add_argument("--job", help="Checkpoint name (default: kind and absolute path)")
+    parser.add_argument("--batch-rows", type=int, help="Records per COPY and checkpoint (default: IMPORT_BATCH_ROWS)")
+    parser.add_argument("--workers", type=int, help="Parsing and validation processes (default: IMPORT_WORKERS)")
+    parser.add_argument("--rejects", help="Append rejected records and their errors to this NDJSON file")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    progress = asyncio.run(main(parser.parse_args()))
+    print(json.dumps(progress.as_dict()))
@@ -0,0 +1,170 @@
+import logging
+import random
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+sql_logger = logging.getLogger("app.sql")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class Histogram:
+    """Prometheus-style histogram with fixed buckets and string labels"""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def clear(self) -> None:
+        self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total) in sorted(self._series.items()):
+            labels = [f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values)]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                bucket_labels = ",".join(labels + [f'le="{le}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = "{" + ",".join(labels) + "}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency by route",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+request_db_time = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+request_statements = Histogram(
+    "http_request_sql_statements", "SQL statements executed per request",
+    ("method", "route"), STATEMENT_BUCKETS,
+)
+pool_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    (), POOL_WAIT_BUCKETS,
+)
+HISTOGRAMS = [request_duration, request_db_time, request_statements, pool_wait]
+
+
+class RequestStats:
+    """Database work done on behalf of the current request"""
+
+    __slots__ = ("route", "statements", "db_seconds", "pool_wait_seconds")
+
+    def __init__(self):
+        self.route = None
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def render_metrics() -> str:
+    """All metrics of this process in the Prometheus text exposition format"""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+class InstrumentationMiddleware:
+    """ASGI middleware timing each request and the SQL it runs, per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            route = scope.get("route")
+            stats.route = route.path if route is not None else "unmatched"
+            method = scope["method"]
+            request_duration.observe(elapsed, method, stats.route, str(status_code))
+            request_db_time.observe(stats.db_seconds, method, stats.route)
+            request_statements.observe(stats.statements, method, stats.route)
+            if stats.statements > settings.SQL_STATEMENTS_WARN:
+                logger.warning(
+                    "%s %s ran %d SQL statements (%.1f ms in the database)",
+                    method, stats.route, stats.statements, stats.db_seconds * 1000,
+                )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+    sample_rate = settings.SQL_LOG_SAMPLE_RATE
+    if elapsed * 1000 >= settings.SQL_LOG_SLOW_MS or (sample_rate and random.random() < sample_rate):
+        sql_logger.info(
+            "sql duration_ms=%.2f rows=%s executemany=%s statement=%r",
+            elapsed * 1000, cursor.rowcount, executemany, " ".join(statement.split())[:1000],
+        )
+
+
+def instrument_engine(engine) -> None:
+    """Count and time every statement run through ``engine`` (sync or async)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,21 +1,41 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.database import get_db
-from app.api import events, tickets, for_you, auth
+from app.config import get_settings
+from app.database import get_db, pool_monitor
+from app.api import events, tickets, for_you, auth, admin, waiting_room
+from app.api.deps import get_current_superuser
 from app.models import User
+from app.instrumentation import InstrumentationMiddleware, render_metrics
+from app.responses import FastJSONResponse
 from app.services.auth import AuthService
 
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.DB_POOL_ADAPTIVE:
+        pool_monitor.start()
+    yield
+    await pool_monitor.stop()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Event Ticketing API",
     description="REST API for event management and ticket booking with geospatial features",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    # Routers may pick another class with APIRouter(default_response_class=...)
+    default_response_class=FastJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse
 )
 
 # Configure CORS
@@ -25,13 +45,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
+# Per-route latency, SQL statement count and DB time, exported at /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(InstrumentationMiddleware)
+
 # Include API routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(events.router, prefix="/api/v1/events", tags=["Events"])
 app.include_router(tickets.router, prefix="/api/v1/tickets", tags=["Tickets"])
+app.include_router(waiting_room.router, prefix="/api/v1/waiting-room", tags=["Waiting Room"])
 app.include_router(for_you.router, prefix="/api/v1/for-you", tags=["Personalized"])
+# Operational internals (caches, pools, import jobs, waiting rooms) are for superusers only
+app.include_router(
+    admin.router,
+    prefix="/api/v1/admin",
+    tags=["Admin"],
+    dependencies=[Depends(get_current_superuser)],
+)
 
 # Health check endpoints
 @app.get("/", tags=["Health"])
@@ -48,4 +81,9 @@ async def health_check():
     return {
         "status": "healthy",
         "version": "1.0.0"
-    }
\ No newline at end of file
+    }
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """Request and database metrics of this process in Prometheus text format"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
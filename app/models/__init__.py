@@ -1,5 +1,11 @@
 from .user import User
 from .event import Event
 from .ticket import Ticket, TicketStatus
+from .inventory import EventInventoryShard
+from .recommendation import UserRecommendation, RecommendationBuild
+from .bulk_import import ImportCheckpoint
 
-__all__ = ["User", "Event", "Ticket", "TicketStatus"]
\ No newline at end of file
+__all__ = [
+    "User", "Event", "Ticket", "TicketStatus", "EventInventoryShard",
+    "UserRecommendation", "RecommendationBuild", "ImportCheckpoint",
+]
\ No newline at end of file
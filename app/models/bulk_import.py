@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from app.database import Base
+
+class ImportCheckpoint(Base):
+    """Progress of one bulk import job.
+
+    Updated in the same transaction as each loaded batch, so a restarted
+    job resumes after the last committed batch without loading rows twice.
+    """
+    __tablename__ = "import_checkpoints"
+
+    job = Column(String, primary_key=True)
+    kind = Column(String, nullable=False)
+    source = Column(String, nullable=False)
+    # Input records consumed, loaded or rejected
+    records_done = Column(BigInteger, nullable=False, default=0)
+    rows_loaded = Column(BigInteger, nullable=False, default=0)
+    rows_rejected = Column(BigInteger, nullable=False, default=0)
+    # Position in the source file after the last committed batch
+    byte_offset = Column(BigInteger, nullable=False, default=0)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy import Column, String, Integer, DateTime, Index
+from sqlalchemy.sql import func
 from geoalchemy2 import Geography
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -15,11 +16,22 @@ class Event(Base):
     total_tickets = Column(Integer, nullable=False)
     tickets_sold = Column(Integer, default=0)
     venue_address = Column(String, nullable=False)
-    venue_location = Column(Geography(geometry_type='POINT', srid=4326), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # The GiST index is declared below so Alembic manages it
+    venue_location = Column(Geography(geometry_type='POINT', srid=4326, spatial_index=False), nullable=False)
     
     # Relationships
     tickets = relationship("Ticket", back_populates="event", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Keyset pagination of the event listing
+        Index("ix_events_start_time_id", "start_time", "id"),
+        # Radius filters and KNN (<->) ordering of nearby events
+        Index("ix_events_venue_location", "venue_location", postgresql_using="gist"),
+        # New events since the last recommendation build
+        Index("ix_events_created_at", "created_at"),
+    )
+    
     @property
     def available_tickets(self) -> int:
         return self.total_tickets - self.tickets_sold
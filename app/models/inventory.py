@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, ForeignKey, CheckConstraint
+from app.database import Base
+
+class EventInventoryShard(Base):
+    """One slice of an event's capacity.
+
+    In sharded inventory mode a purchase claims a seat from any shard with
+    spare capacity instead of locking the single ``events`` row, so
+    concurrent buyers of the same event spread over several rows.
+    """
+    __tablename__ = "event_inventory_shards"
+
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    shard_no = Column(Integer, primary_key=True)
+    capacity = Column(Integer, nullable=False)
+    sold = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        CheckConstraint("sold >= 0 AND sold <= capacity", name="ck_event_inventory_shards_sold"),
+    )
+
+    @property
+    def available(self) -> int:
+        return self.capacity - self.sold
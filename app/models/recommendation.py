@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, REAL
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.database import Base
+
+class UserRecommendation(Base):
+    """Precomputed recommendation candidates for one user, best first.
+
+    Event ids and scores are parallel arrays, so serving a user reads one
+    narrow row instead of a row per candidate.
+    """
+    __tablename__ = "user_recommendations"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    event_ids = Column(ARRAY(Integer), nullable=False)
+    scores = Column(ARRAY(REAL), nullable=False)
+    built_at = Column(DateTime(timezone=True), nullable=False)
+
+class RecommendationBuild(Base):
+    """One completed run of the recommendation build.
+
+    The latest ``watermark`` is where the next incremental run picks up.
+    """
+    __tablename__ = "recommendation_builds"
+
+    id = Column(Integer, primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
+    users_built = Column(Integer, nullable=False, default=0)
+    finished_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
@@ -22,10 +22,37 @@ class Ticket(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     
+    # Inventory shard the seat was claimed from (sharded inventory mode only)
+    inventory_shard = Column(Integer, nullable=True)
+    
+    # Reservation ledger id for tickets written behind the Redis fast path
+    reservation_id = Column(BigInteger, unique=True, nullable=True)
+    
     # Relationships
     user = relationship("User", back_populates="tickets")
     event = relationship("Event", back_populates="tickets")
     
+    __table_args__ = (
+        # Keeps the expiry sweep off the paid/expired bulk of the table
+        Index(
+            "ix_tickets_reserved_created_at",
+            "created_at",
+            postgresql_where=text("status = 'RESERVED'")
+        ),
+        # One payment pays for one ticket; retried confirmations are matched on it
+        Index(
+            "ix_tickets_payment_reference",
+            "payment_reference",
+            unique=True
+        ),
+        # Purchases since the last recommendation build
+        Index(
+            "ix_tickets_paid_paid_at",
+            "paid_at",
+            postgresql_where=text("status = 'PAID'")
+        ),
+    )
+    
     @property
     def is_expired(self) -> bool:
         """Check if the ticket has expired"""
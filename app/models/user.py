@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geography
@@ -15,7 +15,7 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     
     # User location for geospatial queries (latitude, longitude)
-    location = Column(Geography(geometry_type='POINT', srid=4326), nullable=True)
+    location = Column(Geography(geometry_type='POINT', srid=4326, spatial_index=False), nullable=True)
     
     # Authentication fields
     is_active = Column(Boolean, default=True)
@@ -26,5 +26,10 @@ class User(Base):
     # Relationships
     tickets = relationship("Ticket", back_populates="user", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Radius search of users by location
+        Index("ix_users_location", "location", postgresql_using="gist"),
+    )
+    
     def __repr__(self):
         return f"<User {self.email}>"
\ No newline at end of file
@@ -0,0 +1,21 @@
+from functools import lru_cache
+import redis.asyncio as redis
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def create_redis() -> redis.Redis:
+    """Create a client for the Redis instance Celery already uses as its broker.
+
+    redis.asyncio clients are tied to the event loop they first run on, so
+    code that spins up its own loop (Celery tasks) should create its own
+    client and close it when done.
+    """
+    return redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
+
+
+@lru_cache()
+def get_redis() -> redis.Redis:
+    """Dependency that provides the process-wide Redis client."""
+    return create_redis()
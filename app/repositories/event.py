@@ -1,9 +1,12 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Integer, cast, column, func, or_, select, tuple_, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
+from geoalchemy2 import Geography, Geometry
 from geoalchemy2.functions import ST_DWithin
-from geoalchemy2.elements import WKTElement
 from app.models import Event
 from app.repositories.base import BaseRepository
+from app.repositories.spatial import geography_point
 
 class EventRepository(BaseRepository[Event]):
     def __init__(self, db: AsyncSession):
@@ -17,17 +20,115 @@ class EventRepository(BaseRepository[Event]):
         skip: int = 0,
         limit: int = 100
     ) -> List[Event]:
-        """Get events within a certain radius of a location."""
-        point = WKTElement(f'POINT({longitude} {latitude})', srid=4326)
+        """Get events within a certain radius of a location, nearest first.
+        
+        Both the radius filter and the ``<->`` KNN ordering are answered from
+        the GiST index on ``venue_location``, so only the rows of the
+        requested page are read instead of sorting every match.
+        """
+        point = geography_point(latitude, longitude)
         query = (
             select(self.model)
-            .where(ST_DWithin(self.model.venue_location, point, radius_km * 1000))
+            .where(ST_DWithin(self.model.venue_location, point, radius_km * 1000.0))
+            .order_by(self.model.venue_location.op("<->")(point))
             .offset(skip)
             .limit(limit)
         )
         result = await self.db.execute(query)
         return result.scalars().all()
     
+    async def get_locations_in_boxes(
+        self,
+        boxes: List[Tuple[float, float, float, float]],
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, float, float]]:
+        """``(id, longitude, latitude)`` of events inside any of the
+        ``(west, south, east, north)`` boxes (may include a few just outside),
+        at most ``limit`` of them.
+        """
+        if not boxes:
+            return []
+        geometry = cast(self.model.venue_location, Geometry(geometry_type='POINT', srid=4326))
+        query = select(self.model.id, geometry.ST_X(), geometry.ST_Y()).where(
+            or_(*[
+                self.model.venue_location.op("&&")(
+                    cast(
+                        func.ST_MakeEnvelope(west, south, east, north, 4326),
+                        Geography(geometry_type='POLYGON', srid=4326)
+                    )
+                )
+                for west, south, east, north in boxes
+            ])
+        ).limit(limit)
+        result = await self.db.execute(query)
+        return result.all()
+    
+    async def get_row(self, event_id: int):
+        """Plain row of the columns an event response needs, or ``None``"""
+        geometry = cast(self.model.venue_location, Geometry(geometry_type='POINT', srid=4326))
+        result = await self.db.execute(
+            select(
+                self.model.id,
+                self.model.title,
+                self.model.description,
+                self.model.start_time,
+                self.model.end_time,
+                self.model.total_tickets,
+                self.model.tickets_sold,
+                self.model.venue_address,
+                geometry.ST_X(),
+                geometry.ST_Y(),
+            ).where(self.model.id == event_id)
+        )
+        return result.first()
+    
+    async def get_page(
+        self,
+        limit: int = 100,
+        skip: int = 0,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Event]:
+        """Get events ordered by ``(start_time, id)``.
+        
+        With ``after`` set this is a keyset page starting just past that
+        position, which costs the same however deep it is; ``skip`` is then
+        ignored.
+        """
+        result = await self.db.execute(self._page_query(select(self.model), limit, skip, after))
+        return result.scalars().all()
+    
+    async def get_page_keys(
+        self,
+        limit: int = 100,
+        skip: int = 0,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Tuple[int, datetime]]:
+        """Same page as ``get_page`` but only ``(id, start_time)``, read from the index."""
+        query = select(self.model.id, self.model.start_time)
+        result = await self.db.execute(self._page_query(query, limit, skip, after))
+        return result.all()
+    
+    def _page_query(self, query, limit: int, skip: int, after: Optional[Tuple[datetime, int]]):
+        query = query.order_by(self.model.start_time, self.model.id)
+        if after is not None:
+            query = query.where(tuple_(self.model.start_time, self.model.id) > tuple_(*after))
+        elif skip:
+            query = query.offset(skip)
+        return query.limit(limit)
+    
+    async def get_by_ids(self, ids: List[int]) -> List[Event]:
+        result = await self.db.execute(
+            select(self.model).where(self.model.id.in_(ids))
+        )
+        return result.scalars().all()
+    
+    async def get_tickets_sold(self, ids: List[int]) -> Dict[int, int]:
+        """Current ``tickets_sold`` per event id."""
+        result = await self.db.execute(
+            select(self.model.id, self.model.tickets_sold).where(self.model.id.in_(ids))
+        )
+        return dict(result.all())
+    
     async def get_upcoming_events(
         self,
         skip: int = 0,
@@ -44,4 +145,30 @@ class EventRepository(BaseRepository[Event]):
             .limit(limit)
         )
         result = await self.db.execute(query)
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+    
+    async def adjust_tickets_sold(self, deltas: Dict[int, int]) -> None:
+        """Apply per-event ``tickets_sold`` deltas in one statement.
+
+        The event rows are locked in id order first, so concurrent callers
+        touching overlapping events cannot deadlock. Does not commit.
+        """
+        deltas = {event_id: delta for event_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        
+        await self.db.execute(
+            select(self.model.id)
+            .where(self.model.id.in_(deltas))
+            .order_by(self.model.id)
+            .with_for_update()
+        )
+        changes = values(
+            column("event_id", Integer), column("delta", Integer), name="sold_deltas"
+        ).data(sorted(deltas.items()))
+        await self.db.execute(
+            update(self.model)
+            .where(self.model.id == changes.c.event_id)
+            .values(tickets_sold=self.model.tickets_sold + changes.c.delta)
+            .execution_options(synchronize_session=False)
+        )
\ No newline at end of file
@@ -0,0 +1,190 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Integer, column, select, update, values, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Event, EventInventoryShard
+from app.repositories.base import BaseRepository
+
+class InventoryRepository(BaseRepository[EventInventoryShard]):
+    """Counter slots used by the sharded inventory mode.
+
+    None of these methods commit; they run inside the caller's transaction
+    so a claimed seat and its ticket row are written atomically.
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(EventInventoryShard, db)
+
+    async def create_shards(self, event: Event, shard_count: int) -> None:
+        """Split an event's capacity (and any seats already sold) across shards."""
+        shard_count = max(1, min(shard_count, event.total_tickets))
+        base, extra = divmod(event.total_tickets, shard_count)
+        sold_left = event.tickets_sold or 0
+
+        rows = []
+        for shard_no in range(shard_count):
+            capacity = base + (1 if shard_no < extra else 0)
+            sold = min(capacity, sold_left)
+            sold_left -= sold
+            rows.append({
+                "event_id": event.id,
+                "shard_no": shard_no,
+                "capacity": capacity,
+                "sold": sold,
+            })
+
+        await self.db.execute(
+            insert(EventInventoryShard)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["event_id", "shard_no"])
+        )
+
+    async def has_shards(self, event_id: int) -> bool:
+        result = await self.db.execute(
+            select(EventInventoryShard.shard_no)
+            .where(EventInventoryShard.event_id == event_id)
+            .limit(1)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def claim(self, event_id: int) -> Optional[int]:
+        """Take one seat from a random shard with spare capacity.
+
+        Shards locked by concurrent buyers are skipped first; only when every
+        free shard is busy do we wait on one. Returns the shard number, or
+        None when the event has no free seat (or no shards at all).
+        """
+        shard_no = await self._claim(event_id, skip_locked=True)
+        if shard_no is None:
+            shard_no = await self._claim(event_id, skip_locked=False)
+        return shard_no
+
+    async def claim_many(self, event_id: int, count: int) -> Optional[List[int]]:
+        """Take ``count`` seats at once, filling shards in ``shard_no`` order.
+
+        The event's free shards are locked in that order, so concurrent bulk
+        claims cannot deadlock. Returns one shard number per seat, or None
+        (claiming nothing) when fewer than ``count`` seats are free.
+        """
+        result = await self.db.execute(
+            select(EventInventoryShard.shard_no, EventInventoryShard.capacity - EventInventoryShard.sold)
+            .where(
+                EventInventoryShard.event_id == event_id,
+                EventInventoryShard.sold < EventInventoryShard.capacity
+            )
+            .order_by(EventInventoryShard.shard_no)
+            .with_for_update()
+        )
+        taken = []
+        left = count
+        for shard_no, free in result.all():
+            if not left:
+                break
+            take = min(free, left)
+            taken.append((event_id, shard_no, take))
+            left -= take
+        if left:
+            return None
+
+        claimed = values(
+            column("event_id", Integer), column("shard_no", Integer), column("count", Integer),
+            name="claimed_seats"
+        ).data(taken)
+        await self.db.execute(
+            update(EventInventoryShard)
+            .where(
+                EventInventoryShard.event_id == claimed.c.event_id,
+                EventInventoryShard.shard_no == claimed.c.shard_no
+            )
+            .values(sold=EventInventoryShard.sold + claimed.c.count)
+            .execution_options(synchronize_session=False)
+        )
+        return [shard_no for _, shard_no, take in taken for _ in range(take)]
+
+    async def _claim(self, event_id: int, skip_locked: bool) -> Optional[int]:
+        candidate = (
+            select(EventInventoryShard.shard_no)
+            .where(
+                EventInventoryShard.event_id == event_id,
+                EventInventoryShard.sold < EventInventoryShard.capacity
+            )
+            .order_by(func.random())
+            .limit(1)
+            .with_for_update(skip_locked=skip_locked)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(EventInventoryShard)
+            .where(
+                EventInventoryShard.event_id == event_id,
+                EventInventoryShard.shard_no == candidate,
+                EventInventoryShard.sold < EventInventoryShard.capacity
+            )
+            .values(sold=EventInventoryShard.sold + 1)
+            .returning(EventInventoryShard.shard_no)
+        )
+        return result.scalar_one_or_none()
+
+    async def release(self, event_id: int, shard_no: int, count: int = 1) -> None:
+        """Return seats to the shard they were claimed from."""
+        await self.db.execute(
+            update(EventInventoryShard)
+            .where(
+                EventInventoryShard.event_id == event_id,
+                EventInventoryShard.shard_no == shard_no
+            )
+            .values(sold=func.greatest(EventInventoryShard.sold - count, 0))
+        )
+
+    async def release_many(self, counts: Dict[Tuple[int, int], int]) -> None:
+        """Return seats to many shards at once, keyed by ``(event_id, shard_no)``."""
+        if not counts:
+            return
+        released = values(
+            column("event_id", Integer), column("shard_no", Integer), column("count", Integer),
+            name="released_seats"
+        ).data(sorted((event_id, shard_no, count) for (event_id, shard_no), count in counts.items()))
+        await self.db.execute(
+            update(EventInventoryShard)
+            .where(
+                EventInventoryShard.event_id == released.c.event_id,
+                EventInventoryShard.shard_no == released.c.shard_no
+            )
+            .values(sold=func.greatest(EventInventoryShard.sold - released.c.count, 0))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def sold_counts(self, event_ids: Iterable[int]) -> Dict[int, int]:
+        """Live sold count per sharded event."""
+        result = await self.db.execute(
+            select(EventInventoryShard.event_id, func.sum(EventInventoryShard.sold))
+            .where(EventInventoryShard.event_id.in_(list(event_ids)))
+            .group_by(EventInventoryShard.event_id)
+        )
+        return {event_id: int(sold) for event_id, sold in result.all()}
+
+    async def reconcile(self) -> List[int]:
+        """Copy shard totals into ``events.tickets_sold``.
+
+        Only rows that drifted are touched. Returns the ids of the events updated.
+        """
+        totals = (
+            select(
+                EventInventoryShard.event_id.label("event_id"),
+                func.sum(EventInventoryShard.sold).label("sold")
+            )
+            .group_by(EventInventoryShard.event_id)
+            .subquery()
+        )
+        result = await self.db.execute(
+            update(Event)
+            .where(
+                Event.id == totals.c.event_id,
+                Event.tickets_sold.is_distinct_from(totals.c.sold)
+            )
+            .values(tickets_sold=totals.c.sold)
+            .returning(Event.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalars().all()
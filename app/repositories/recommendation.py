@@ -0,0 +1,173 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, distinct, func, or_, select, true, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from geoalchemy2.functions import ST_DWithin
+
+from app.models import Event, RecommendationBuild, Ticket, TicketStatus, User, UserRecommendation
+from app.repositories.base import BaseRepository
+
+class RecommendationRepository(BaseRepository[UserRecommendation]):
+    """Candidate queries and storage for the recommendation build.
+
+    Co-purchase history only counts paid tickets, so ``Ticket.paid_at`` is
+    the change marker for purchases. None of these methods commit.
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(UserRecommendation, db)
+
+    async def get_for_user(self, user_id: int) -> Optional[UserRecommendation]:
+        return await self.db.get(UserRecommendation, user_id)
+
+    async def get_watermark(self) -> Optional[datetime]:
+        """Database time up to which changes are already reflected"""
+        result = await self.db.execute(select(func.max(RecommendationBuild.watermark)))
+        return result.scalar_one_or_none()
+
+    async def record_build(self, watermark: datetime, users_built: int) -> None:
+        self.db.add(RecommendationBuild(
+            watermark=watermark,
+            users_built=users_built,
+            finished_at=func.now(),
+        ))
+
+    async def changed_user_ids(
+        self,
+        since: Optional[datetime],
+        until: datetime,
+        radius_km: float
+    ) -> List[int]:
+        """Users whose candidates may have changed in ``(since, until]``.
+
+        That is buyers with new purchases, everyone who bought the same
+        events (their co-purchase counts moved), users who signed up or
+        moved, and users near newly created events. With no ``since``
+        (first run) every user qualifies.
+
+        Users without a stored row are always rebuilt and all their paid
+        tickets count as new, since bulk imports keep their historical
+        ``paid_at``/``created_at`` and would otherwise fall before the window.
+        """
+        if since is None:
+            result = await self.db.execute(select(User.id).where(User.created_at <= until))
+            return result.scalars().all()
+
+        unbuilt = select(User.id).outerjoin(
+            UserRecommendation, UserRecommendation.user_id == User.id
+        ).where(User.created_at <= until, UserRecommendation.user_id.is_(None)).cte("unbuilt")
+        new_purchases = select(Ticket.user_id, Ticket.event_id).where(
+            Ticket.status == TicketStatus.PAID,
+            or_(
+                and_(Ticket.paid_at > since, Ticket.paid_at <= until),
+                Ticket.user_id.in_(select(unbuilt.c.id)),
+            )
+        ).cte("new_purchases")
+        co_buyer = aliased(Ticket)
+        changed = union(
+            select(unbuilt.c.id),
+            select(new_purchases.c.user_id),
+            select(co_buyer.user_id).join(
+                new_purchases,
+                and_(
+                    co_buyer.event_id == new_purchases.c.event_id,
+                    co_buyer.status == TicketStatus.PAID,
+                )
+            ),
+            select(User.id).where(
+                User.location.isnot(None),
+                or_(
+                    and_(User.created_at > since, User.created_at <= until),
+                    and_(User.updated_at > since, User.updated_at <= until),
+                )
+            ),
+            select(User.id).join(
+                Event,
+                ST_DWithin(User.location, Event.venue_location, radius_km * 1000.0)
+            ).where(Event.created_at > since, Event.created_at <= until),
+        )
+        result = await self.db.execute(changed)
+        return result.scalars().all()
+
+    async def co_purchase_counts(self, user_ids: List[int]) -> List[Tuple[int, int, int]]:
+        """``(user_id, event_id, co_buyers)`` for upcoming events bought by
+        people who bought the same events as the user."""
+        mine = select(Ticket.user_id, Ticket.event_id).where(
+            Ticket.user_id.in_(user_ids),
+            Ticket.status == TicketStatus.PAID,
+        ).distinct().cte("mine")
+        peer_ticket = aliased(Ticket)
+        peers = select(mine.c.user_id, peer_ticket.user_id.label("peer_id")).join(
+            peer_ticket,
+            and_(
+                peer_ticket.event_id == mine.c.event_id,
+                peer_ticket.user_id != mine.c.user_id,
+                peer_ticket.status == TicketStatus.PAID,
+            )
+        ).distinct().cte("peers")
+        bought = aliased(Ticket)
+        query = (
+            select(peers.c.user_id, bought.event_id, func.count(distinct(peers.c.peer_id)))
+            .join(bought, and_(bought.user_id == peers.c.peer_id, bought.status == TicketStatus.PAID))
+            .join(Event, and_(Event.id == bought.event_id, Event.start_time > func.now()))
+            .group_by(peers.c.user_id, bought.event_id)
+        )
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def nearby_distances(
+        self,
+        user_ids: List[int],
+        radius_km: float,
+        per_user: int
+    ) -> List[Tuple[int, int, float]]:
+        """``(user_id, event_id, metres)`` for the closest upcoming events to each user"""
+        nearby = (
+            select(
+                Event.id.label("event_id"),
+                func.ST_Distance(Event.venue_location, User.location).label("distance")
+            )
+            .where(
+                ST_DWithin(Event.venue_location, User.location, radius_km * 1000.0),
+                Event.start_time > func.now(),
+            )
+            .order_by(Event.venue_location.op("<->")(User.location))
+            .limit(per_user)
+            .correlate(User)
+            .lateral("nearby")
+        )
+        query = (
+            select(User.id, nearby.c.event_id, nearby.c.distance)
+            .join(nearby, true())
+            .where(User.id.in_(user_ids), User.location.isnot(None))
+        )
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def owned_event_ids(self, user_ids: List[int]) -> List[Tuple[int, int]]:
+        """``(user_id, event_id)`` for events the users already hold tickets for"""
+        result = await self.db.execute(
+            select(Ticket.user_id, Ticket.event_id)
+            .where(Ticket.user_id.in_(user_ids), Ticket.status != TicketStatus.EXPIRED)
+            .distinct()
+        )
+        return result.all()
+
+    async def save(self, candidates: Dict[int, Tuple[List[int], List[float]]], built_at: datetime) -> None:
+        """Replace the stored candidates of each user (empty lists clear them)"""
+        if not candidates:
+            return
+        statement = insert(UserRecommendation).values([
+            {"user_id": user_id, "event_ids": event_ids, "scores": scores, "built_at": built_at}
+            for user_id, (event_ids, scores) in candidates.items()
+        ])
+        await self.db.execute(statement.on_conflict_do_update(
+            index_elements=[UserRecommendation.user_id],
+            set_={
+                "event_ids": statement.excluded.event_ids,
+                "scores": statement.excluded.scores,
+                "built_at": statement.excluded.built_at,
+            }
+        ))
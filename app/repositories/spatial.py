@@ -0,0 +1,14 @@
+from sqlalchemy import type_coerce
+from geoalchemy2 import Geography
+from geoalchemy2.elements import WKTElement
+
+def geography_point(latitude: float, longitude: float):
+    """A literal geography point, typed so PostGIS picks the geography operators.
+
+    ``ST_DWithin`` and the ``<->`` KNN operator can then use the GiST index on
+    geography columns without an implicit geometry cast.
+    """
+    return type_coerce(
+        WKTElement(f'POINT({longitude} {latitude})', srid=4326),
+        Geography(geometry_type='POINT', srid=4326)
+    )
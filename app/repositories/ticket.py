@@ -1,11 +1,23 @@
 from sqlalchemy import select, and_
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from datetime import datetime, timedelta
 
 from app.models.ticket import Ticket, TicketStatus
 from app.repositories.base import BaseRepository
 
+# Columns of a ticket export, in output order
+EXPORT_COLUMNS = (
+    Ticket.id,
+    Ticket.user_id,
+    Ticket.event_id,
+    Ticket.status,
+    Ticket.created_at,
+    Ticket.payment_reference,
+    Ticket.paid_at,
+)
+
 class TicketRepository(BaseRepository[Ticket]):
     def __init__(self, db: AsyncSession):
         super().__init__(Ticket, db)
@@ -46,6 +58,28 @@ class TicketRepository(BaseRepository[Ticket]):
         )
         return result.scalars().all()
 
+    async def get_rows(self, *criteria) -> List[tuple]:
+        """Plain ticket rows in ``EXPORT_COLUMNS`` order, newest first"""
+        result = await self.db.execute(
+            select(*EXPORT_COLUMNS)
+            .where(*criteria)
+            .order_by(Ticket.created_at.desc())
+        )
+        return result.all()
+
+    async def stream_rows(self, *criteria, chunk_size: int = 1000) -> AsyncResult:
+        """Stream plain ticket rows in id order through a server-side cursor
+        
+        Rows are fetched ``chunk_size`` at a time and never enter the
+        identity map, so memory stays flat whatever the result size.
+        """
+        return await self.db.stream(
+            select(*EXPORT_COLUMNS)
+            .where(*criteria)
+            .order_by(Ticket.id)
+            .execution_options(yield_per=chunk_size)
+        )
+
     async def get_expired_tickets(self) -> List[Ticket]:
         """Get all reserved tickets that have expired"""
         expiration_time = datetime.utcnow() - timedelta(minutes=2)
@@ -1,9 +1,11 @@
-from typing import List, Optional
-from sqlalchemy import select
+from typing import List, Optional, Tuple
+from sqlalchemy import cast, select
+from geoalchemy2 import Geometry
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.repositories.base import BaseRepository
+from app.repositories.spatial import geography_point
 
 class UserRepository(BaseRepository[User]):
     def __init__(self, db: AsyncSession):
@@ -16,6 +18,16 @@ class UserRepository(BaseRepository[User]):
         )
         return result.scalar_one_or_none()
     
+    async def get_location(self, user_id: int) -> Optional[Tuple[float, float]]:
+        """The user's ``(latitude, longitude)``, or None if unknown."""
+        location = cast(User.location, Geometry(geometry_type='POINT', srid=4326))
+        result = await self.db.execute(
+            select(location.ST_Y(), location.ST_X())
+            .where(User.id == user_id, User.location.isnot(None))
+        )
+        row = result.first()
+        return tuple(row) if row else None
+    
     async def get_users_near_location(
         self,
         latitude: float,
@@ -24,17 +36,17 @@ class UserRepository(BaseRepository[User]):
         skip: int = 0,
         limit: int = 100
     ) -> List[User]:
-        """Get users within a certain radius of a location."""
+        """Get users within a certain radius of a location, nearest first."""
         from geoalchemy2.functions import ST_DWithin
-        from geoalchemy2.elements import WKTElement
         
-        point = WKTElement(f'POINT({longitude} {latitude})', srid=4326)
+        point = geography_point(latitude, longitude)
         query = (
             select(User)
             .where(
                 User.location.isnot(None),
-                ST_DWithin(User.location, point, radius_km * 1000)
+                ST_DWithin(User.location, point, radius_km * 1000.0)
             )
+            .order_by(User.location.op("<->")(point))
             .offset(skip)
             .limit(limit)
         )
@@ -0,0 +1,17 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson; the app-wide default response class.
+
+    orjson handles datetimes, enums, dataclasses and non-string dict keys
+    natively, so it also renders lean payloads that skipped
+    ``jsonable_encoder``. UTC datetimes end in ``Z``, as Pydantic renders
+    them, so switching response class does not change payloads.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,24 @@
+from datetime import datetime
+from pydantic import Field, field_validator
+from typing import Optional
+
+from app.models import TicketStatus
+from app.schemas.ticket import TicketCreate
+from app.schemas.user import UserCreate
+from app.services.password_hasher import pwd_context
+
+class UserImport(UserCreate):
+    hashed_password: str = Field(..., description="Existing password hash; imports never hash passwords")
+
+    @field_validator("hashed_password")
+    @classmethod
+    def known_hash(cls, value: str) -> str:
+        if not pwd_context.identify(value):
+            raise ValueError("Unrecognized password hash")
+        return value
+
+class TicketImport(TicketCreate):
+    status: TicketStatus = TicketStatus.PAID
+    created_at: Optional[datetime] = None
+    payment_reference: Optional[str] = Field(None, min_length=1)
+    paid_at: Optional[datetime] = None
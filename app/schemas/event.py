@@ -38,9 +38,4 @@ class EventResponse(BaseModel):
     venue_address: str
     venue: Optional[Dict[str, Any]] = None
     
-    model_config = ConfigDict(
-        from_attributes=True,
-        json_encoders={
-            'datetime': lambda v: v.isoformat()
-        }
-    )
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
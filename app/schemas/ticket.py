@@ -9,6 +9,14 @@ class TicketBase(BaseModel):
 class TicketCreate(TicketBase):
     pass
 
+class BulkTicketItem(BaseModel):
+    event_id: int
+    quantity: int = Field(1, ge=1, description="Number of tickets for this event")
+
+class BulkTicketCreate(BaseModel):
+    user_id: int
+    items: List[BulkTicketItem] = Field(..., min_length=1)
+
 class TicketPayment(BaseModel):
     payment_reference: str = Field(..., min_length=1, description="Unique payment reference ID")
     paid_at: Optional[datetime] = None
@@ -20,9 +28,23 @@ class TicketResponse(TicketBase):
     payment_reference: Optional[str] = None
     paid_at: Optional[datetime] = None
 
-    model_config = ConfigDict(
-        from_attributes=True,
-        json_encoders={
-            'datetime': lambda v: v.isoformat()
-        }
-    )
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class PaymentConfirmation(BaseModel):
+    ticket_id: int
+    payment_reference: str = Field(..., min_length=1)
+
+class BatchPayment(BaseModel):
+    payments: List[PaymentConfirmation] = Field(..., min_length=1)
+
+class PaymentOutcome(BaseModel):
+    ticket_id: int
+    payment_reference: str
+    status: str = Field(..., description="paid, already_paid or rejected")
+    detail: Optional[str] = None
+    ticket: Optional[TicketResponse] = None
+
+class ReservationResponse(BaseModel):
+    reservation_id: int
+    status: str = Field(..., description="pending, confirmed or rejected")
+    ticket_id: Optional[int] = None
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class WaitingRoomOpen(BaseModel):
+    rate: Optional[float] = Field(None, gt=0, description="Clients admitted per second")
+
+class WaitingRoomPosition(BaseModel):
+    event_id: int
+    token: str = Field(..., description="Send as X-Admission-Token once admitted")
+    position: int
+    ahead: int
+    admitted: bool
+    estimated_wait_seconds: float
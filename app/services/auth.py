@@ -1,13 +1,15 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.cache import TTLCache, register_local_cache
+from app.config import get_settings
 from app.database import get_db
 from app.models import User
+from app.services.password_hasher import PasswordHasher, password_hasher, pwd_context
 from app.schemas.auth import TokenData, UserCreate, UserLogin
 import os
 from dotenv import load_dotenv
@@ -20,18 +22,35 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+settings = get_settings()
+
+# Columns kept for a cached principal; the password hash and location stay in the DB
+PRINCIPAL_FIELDS = ("id", "email", "name", "is_active", "is_superuser", "created_at", "updated_at")
+
+# Authenticated users by token subject, so repeat requests skip the user lookup.
+# Entries are per process: deactivation clears this process at once and every
+# other process within PRINCIPAL_CACHE_TTL_SECONDS.
+principal_cache = register_local_cache(
+    "principals",
+    TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS),
+)
+
+
+def invalidate_principal(email: str) -> None:
+    principal_cache.delete(email)
+
 class AuthService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, hasher: Optional[PasswordHasher] = None):
         self.db = db
+        self.hasher = hasher or password_hasher
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.hasher.verify(plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
-        return pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        return await self.hasher.hash(password)
 
     async def get_user(self, email: str) -> Optional[User]:
         result = await self.db.execute(
@@ -43,8 +62,13 @@ class AuthService:
         user = await self.get_user(email)
         if not user:
             return None
-        if not self.verify_password(password, user.hashed_password):
+        verified, new_hash = await self.hasher.verify_and_update(password, user.hashed_password)
+        if not verified:
             return None
+        if new_hash:
+            # Stored with an outdated cost factor; upgrade it while we have the password
+            user.hashed_password = new_hash
+            await self.db.commit()
         return user
 
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -57,7 +81,13 @@ class AuthService:
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
-    async def get_current_user(self, token: str = Depends(oauth2_scheme)) -> User:
+    async def get_current_user(self, token: str = Depends(oauth2_scheme), use_cache: bool = True) -> User:
+        """Resolve the bearer token to an active user.
+
+        With ``use_cache`` the user may come from the principal cache as a
+        detached ``User`` without the password hash or location; pass
+        ``use_cache=False`` where a fresh database read is required.
+        """
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -71,10 +101,33 @@ class AuthService:
             token_data = TokenData(email=email)
         except JWTError:
             raise credentials_exception
-        
+
+        use_cache = use_cache and settings.PRINCIPAL_CACHE_ENABLED
+        if use_cache:
+            principal = principal_cache.get(token_data.email)
+            if principal is not None:
+                return User(**principal)
+
         user = await self.get_user(email=token_data.email)
-        if user is None:
+        if user is None or user.is_active is False:
+            invalidate_principal(token_data.email)
             raise credentials_exception
+        if use_cache:
+            principal_cache.set(
+                token_data.email,
+                {field: getattr(user, field) for field in PRINCIPAL_FIELDS},
+            )
+        return user
+
+    async def deactivate_user(self, user_id: int) -> User:
+        """Deactivate a user and drop their cached principal"""
+        user = await self.db.get(User, user_id)
+        if user is None:
+            raise ValueError("User not found")
+        user.is_active = False
+        await self.db.commit()
+        await self.db.refresh(user)
+        invalidate_principal(user.email)
         return user
 
     async def create_user(self, user: UserCreate) -> User:
@@ -87,7 +140,7 @@ class AuthService:
             )
         
         # Create new user
-        hashed_password = self.get_password_hash(user.password)
+        hashed_password = await self.get_password_hash(user.password)
         db_user = User(
             email=user.email,
             name=user.name,
@@ -0,0 +1,574 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import os
+import struct
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+import asyncpg
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.engine import make_url
+
+from app.config import get_settings
+from app.models import TicketStatus
+from app.schemas.bulk_import import TicketImport, UserImport
+from app.schemas.event import EventCreate
+from app.services.event_cache import event_cache
+from app.services.geo_tiles import geo_tile_cache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+# Little-endian EWKB point with an SRID, the binary input format of geography
+EWKB_POINT = struct.Struct("<BIIdd")
+EWKB_POINT_WITH_SRID = 0x20000001
+
+# Seats held by these statuses count towards events.tickets_sold
+SEAT_STATUSES = {TicketStatus.PAID.name, TicketStatus.RESERVED.name}
+
+SAVE_CHECKPOINT_SQL = """
+INSERT INTO import_checkpoints
+    (job, kind, source, records_done, rows_loaded, rows_rejected, byte_offset, started_at, updated_at)
+VALUES ($1, $2, $3, $4, $5, $6, $7, now(), now())
+ON CONFLICT (job) DO UPDATE SET
+    records_done = EXCLUDED.records_done,
+    rows_loaded = EXCLUDED.rows_loaded,
+    rows_rejected = EXCLUDED.rows_rejected,
+    byte_offset = EXCLUDED.byte_offset,
+    updated_at = now(),
+    finished_at = NULL
+"""
+
+EVENT_SHARDS_SQL = """
+INSERT INTO event_inventory_shards (event_id, shard_no, capacity, sold)
+SELECT e.id, s.shard_no, e.total / e.shards + CASE WHEN s.shard_no < e.total % e.shards THEN 1 ELSE 0 END, 0
+FROM (
+    SELECT id, total, LEAST($3::int, total) AS shards
+    FROM unnest($1::int[], $2::int[]) AS u(id, total)
+) AS e
+CROSS JOIN LATERAL generate_series(0, e.shards - 1) AS s(shard_no)
+"""
+
+CLEAR_RECOMMENDATIONS_SQL = "DELETE FROM user_recommendations WHERE user_id = ANY($1::int[])"
+
+ADD_TICKETS_SOLD_SQL = """
+UPDATE events SET tickets_sold = events.tickets_sold + d.sold
+FROM unnest($1::int[], $2::int[]) AS d(id, sold)
+WHERE events.id = d.id
+"""
+
+
+def ewkb_point(latitude: float, longitude: float, srid: int = 4326) -> bytes:
+    return EWKB_POINT.pack(1, EWKB_POINT_WITH_SRID, srid, longitude, latitude)
+
+
+def naive_utc(value: datetime) -> datetime:
+    """For ``timestamp without time zone`` columns, which hold UTC"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def aware_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def asyncpg_dsn(url: str) -> str:
+    """Plain ``postgresql://`` DSN for asyncpg from a SQLAlchemy URL"""
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def detect_format(path: str) -> str:
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Cannot tell the format of {path}; pass csv or ndjson")
+    return fmt
+
+
+def read_header(path: str, fmt: str) -> Tuple[Optional[List[str]], int]:
+    """CSV column names and the byte offset of the first record; NDJSON has no header"""
+    if fmt != "csv":
+        return None, 0
+    with open(path, "rb") as handle:
+        line = handle.readline()
+    return next(csv.reader([line.decode("utf-8-sig")]), []), len(line)
+
+
+def read_chunks(path: str, fmt: str, start: int, rows: int) -> Iterator[Tuple[bytes, int]]:
+    """Raw chunks of about ``rows`` lines from ``start``, each with the offset just past it.
+
+    CSV chunks only end where the quotes are balanced, so a quoted field
+    spanning lines is never split.
+    """
+    quoted = fmt == "csv"
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        offset = start
+        lines: List[bytes] = []
+        quotes = 0
+        for line in handle:
+            lines.append(line)
+            offset += len(line)
+            if quoted:
+                quotes += line.count(b'"')
+            if len(lines) >= rows and quotes % 2 == 0:
+                yield b"".join(lines), offset
+                lines = []
+                quotes = 0
+        if lines:
+            yield b"".join(lines), offset
+
+
+def parse_chunk(fmt: str, header: Optional[List[str]], data: bytes) -> List[Any]:
+    """Records of a chunk as dicts; unparsable NDJSON lines come back as the error"""
+    text = data.decode("utf-8")
+    if fmt == "csv":
+        # Empty CSV cells are missing values
+        return [
+            {key: value for key, value in row.items() if value != ""}
+            for row in csv.DictReader(io.StringIO(text, newline=""), fieldnames=header)
+        ]
+    if fmt == "ndjson":
+        records = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                records.append(e)
+        return records
+    raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'record'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+def json_default(value: Any) -> str:
+    # Geography columns are written as hex EWKB, which PostGIS also accepts as text
+    return value.hex() if isinstance(value, bytes) else str(value)
+
+
+class Loader:
+    """How one kind of record is validated, encoded and written with ``COPY``.
+
+    ``validate`` and ``to_row`` run in the worker processes; the async hooks
+    run in the importer on the encoded rows, laid out as ``columns``.
+    """
+
+    table: str
+    columns: Tuple[str, ...]
+    schema: Type[BaseModel]
+
+    def __init__(self):
+        self.adapter = TypeAdapter(List[self.schema])
+
+    def normalize(self, record: dict) -> dict:
+        return record
+
+    def validate(self, batch: List[Any]) -> Tuple[List[Tuple[int, BaseModel]], Dict[int, str]]:
+        """Validated items with their index in ``batch``, and the reason for each rejected index"""
+        errors = {}
+        records = []
+        for index, record in enumerate(batch):
+            if isinstance(record, dict):
+                records.append((index, self.normalize(record)))
+            else:
+                errors[index] = f"Invalid record: {record}"
+        try:
+            # One call for the whole batch; row by row only to find the bad rows
+            models = self.adapter.validate_python([record for _, record in records])
+            return [(index, model) for (index, _), model in zip(records, models)], errors
+        except ValidationError:
+            pass
+        items = []
+        for index, record in records:
+            try:
+                items.append((index, self.schema.model_validate(record)))
+            except ValidationError as e:
+                errors[index] = describe(e)
+        return items, errors
+
+    def to_row(self, model: BaseModel) -> tuple:
+        raise NotImplementedError
+
+    def encode(self, batch: List[Any]) -> Tuple[List[Tuple[int, tuple]], Dict[int, str]]:
+        """``COPY`` rows with their index in ``batch``, and the reason for each rejected index"""
+        items, errors = self.validate(batch)
+        return [(index, self.to_row(model)) for index, model in items], errors
+
+    async def precheck(self, conn: asyncpg.Connection, items: List[Tuple[int, tuple]]) -> Dict[int, str]:
+        """Reasons to reject valid rows the database would refuse, by index"""
+        return {}
+
+    async def prepare(self, conn: asyncpg.Connection, rows: List[tuple]) -> List[tuple]:
+        """Fill in what only the database knows, just before the rows are copied"""
+        return rows
+
+    async def after_batch(self, conn: asyncpg.Connection, rows: List[tuple]) -> None:
+        """Runs in the batch's transaction, after ``rows`` were copied"""
+
+    async def after_commit(self, rows: List[tuple]) -> None:
+        """Cache invalidation once the batch is visible"""
+
+
+class EventLoader(Loader):
+    table = "events"
+    columns = (
+        "id", "title", "description", "start_time", "end_time", "total_tickets",
+        "tickets_sold", "venue_address", "venue_location",
+    )
+    schema = EventCreate
+
+    def normalize(self, record: dict) -> dict:
+        """Flat CSV columns (``venue_address``, ``latitude``, ``longitude``) to ``venue``"""
+        if "venue" in record:
+            return record
+        record = dict(record)
+        record["venue"] = {
+            "address": record.pop("venue_address", None) or record.pop("address", None),
+            "latitude": record.pop("latitude", None),
+            "longitude": record.pop("longitude", None),
+        }
+        return record
+
+    def to_row(self, event: EventCreate) -> tuple:
+        return (
+            None, event.title, event.description, naive_utc(event.start_time), naive_utc(event.end_time),
+            event.total_tickets, 0, event.venue.address, ewkb_point(event.venue.latitude, event.venue.longitude),
+        )
+
+    async def prepare(self, conn: asyncpg.Connection, rows: List[tuple]) -> List[tuple]:
+        # Ids are taken up front so shards can be created in the same transaction
+        ids = [row[0] for row in await conn.fetch(
+            "SELECT nextval(pg_get_serial_sequence('events', 'id')) FROM generate_series(1, $1)", len(rows)
+        )]
+        return [(event_id,) + row[1:] for event_id, row in zip(ids, rows)]
+
+    async def after_batch(self, conn: asyncpg.Connection, rows: List[tuple]) -> None:
+        if settings.INVENTORY_SHARDS > 0:
+            await conn.execute(
+                EVENT_SHARDS_SQL, [row[0] for row in rows], [row[5] for row in rows], settings.INVENTORY_SHARDS,
+            )
+
+    async def after_commit(self, rows: List[tuple]) -> None:
+        points = (EWKB_POINT.unpack(row[8])[3:] for row in rows)
+        await geo_tile_cache.invalidate_points((latitude, longitude) for longitude, latitude in points)
+
+
+class UserLoader(Loader):
+    table = "users"
+    columns = ("email", "name", "hashed_password", "location", "is_active", "is_superuser")
+    schema = UserImport
+
+    def to_row(self, user: UserImport) -> tuple:
+        location = None
+        if user.latitude is not None and user.longitude is not None:
+            location = ewkb_point(user.latitude, user.longitude)
+        return (user.email, user.name, user.hashed_password, location, True, False)
+
+    async def precheck(self, conn: asyncpg.Connection, items: List[Tuple[int, tuple]]) -> Dict[int, str]:
+        existing = {row[0] for row in await conn.fetch(
+            "SELECT email FROM users WHERE email = ANY($1::text[])", [row[0] for _, row in items]
+        )}
+        errors = {}
+        for index, row in items:
+            if row[0] in existing:
+                errors[index] = "Email already registered"
+            existing.add(row[0])
+        return errors
+
+
+class TicketLoader(Loader):
+    table = "tickets"
+    columns = ("user_id", "event_id", "status", "created_at", "payment_reference", "paid_at")
+    schema = TicketImport
+
+    def __init__(self):
+        if settings.INVENTORY_SHARDS > 0:
+            # Imported seats would be missing from the shard counters
+            raise ValueError("Ticket imports need INVENTORY_SHARDS=0")
+        super().__init__()
+
+    def encode(self, batch: List[Any]) -> Tuple[List[Tuple[int, tuple]], Dict[int, str]]:
+        self.now = datetime.now(timezone.utc)
+        return super().encode(batch)
+
+    def to_row(self, ticket: TicketImport) -> tuple:
+        created_at = aware_utc(ticket.created_at) or self.now
+        paid_at = aware_utc(ticket.paid_at)
+        if ticket.status == TicketStatus.PAID and paid_at is None:
+            paid_at = created_at
+        return (ticket.user_id, ticket.event_id, ticket.status.name, created_at, ticket.payment_reference, paid_at)
+
+    async def precheck(self, conn: asyncpg.Connection, items: List[Tuple[int, tuple]]) -> Dict[int, str]:
+        """Unknown users or events, reused payment references and seats beyond capacity"""
+        users = {row[0] for row in await conn.fetch(
+            "SELECT id FROM users WHERE id = ANY($1::int[])", list({row[0] for _, row in items})
+        )}
+        # Locked so concurrent purchases cannot take the same seats
+        free = {row[0]: row[1] for row in await conn.fetch(
+            "SELECT id, total_tickets - tickets_sold FROM events WHERE id = ANY($1::int[]) "
+            "ORDER BY id FOR UPDATE",
+            list({row[1] for _, row in items})
+        )}
+        references = {row[0] for row in await conn.fetch(
+            "SELECT payment_reference FROM tickets WHERE payment_reference = ANY($1::text[])",
+            [row[4] for _, row in items if row[4]]
+        )}
+        errors = {}
+        for index, (user_id, event_id, status, _, reference, _) in items:
+            if user_id not in users:
+                errors[index] = "User not found"
+            elif event_id not in free:
+                errors[index] = "Event not found"
+            elif reference and reference in references:
+                errors[index] = "Payment reference already used for another ticket"
+            elif status in SEAT_STATUSES and free[event_id] <= 0:
+                errors[index] = "No tickets available for this event"
+            else:
+                if reference:
+                    references.add(reference)
+                if status in SEAT_STATUSES:
+                    free[event_id] -= 1
+        return errors
+
+    async def after_batch(self, conn: asyncpg.Connection, rows: List[tuple]) -> None:
+        """Add the imported seats to ``events.tickets_sold``"""
+        sold = Counter(row[1] for row in rows if row[2] in SEAT_STATUSES)
+        if sold:
+            await conn.execute(ADD_TICKETS_SOLD_SQL, list(sold), list(sold.values()))
+        # Historical paid_at values fall before the recommendation watermark,
+        # so drop the buyers' rows and let the next build treat them as new
+        buyers = list({row[0] for row in rows if row[2] == TicketStatus.PAID.name})
+        if buyers:
+            await conn.execute(CLEAR_RECOMMENDATIONS_SQL, buyers)
+
+    async def after_commit(self, rows: List[tuple]) -> None:
+        await event_cache.invalidate_availability({row[1] for row in rows})
+
+
+LOADERS: Dict[str, Type[Loader]] = {
+    "events": EventLoader,
+    "users": UserLoader,
+    "tickets": TicketLoader,
+}
+
+# One loader per kind in each worker process, so adapters are built once
+_worker_loaders: Dict[str, Loader] = {}
+
+
+def encode_chunk(
+    kind: str, fmt: str, header: Optional[List[str]], data: bytes
+) -> Tuple[int, List[Tuple[int, tuple]], Dict[int, str], Dict[int, Any]]:
+    """Parse, validate and encode one chunk; the CPU-bound part, run in the worker processes.
+
+    Returns the number of records, the ``(index, row)`` pairs ready for
+    ``COPY``, the reason for each rejected index and the records that
+    failed validation.
+    """
+    loader = _worker_loaders.get(kind)
+    if loader is None:
+        loader = _worker_loaders[kind] = LOADERS[kind]()
+    records = parse_chunk(fmt, header, data)
+    rows, errors = loader.encode(records)
+    return len(records), rows, errors, {index: records[index] for index in errors if isinstance(records[index], dict)}
+
+
+@dataclass
+class ImportProgress:
+    """Totals of one import job, including batches loaded before a resume"""
+
+    job: str
+    kind: str
+    records: int = 0
+    loaded: int = 0
+    rejected: int = 0
+    batches: int = 0
+    resumed_from: int = 0
+    byte_offset: int = 0
+    elapsed_seconds: float = 0.0
+    finished: bool = False
+
+    @property
+    def records_per_second(self) -> float:
+        """Throughput of this run, excluding records skipped on resume"""
+        if not self.elapsed_seconds:
+            return 0.0
+        return round((self.records - self.resumed_from) / self.elapsed_seconds, 2)
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "records_per_second": self.records_per_second}
+
+
+def log_progress(progress: ImportProgress) -> None:
+    logger.info("Import %s: %s", progress.job, json.dumps(progress.as_dict()))
+
+
+class BulkImporter:
+    """Loads CSV or NDJSON files of events, users or tickets with ``COPY``.
+
+    The file is read in chunks of ``batch_rows`` lines. ``workers``
+    processes parse, validate (one Pydantic call per chunk) and encode the
+    chunks ahead of the importer, which checks each batch against the
+    database for rows it would refuse and writes it with a binary ``COPY``
+    (geography as EWKB) in one transaction together with the job's
+    checkpoint, so an interrupted job resumes at the byte where it stopped.
+    Rejected records are skipped and can be written to a rejects file.
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        batch_rows: Optional[int] = None,
+        workers: Optional[int] = None,
+        progress: Callable[[ImportProgress], None] = log_progress,
+    ):
+        self.dsn = dsn or asyncpg_dsn(settings.DATABASE_URL)
+        self.batch_rows = batch_rows or settings.IMPORT_BATCH_ROWS
+        workers = settings.IMPORT_WORKERS if workers is None else workers
+        # One core stays with the importer, which copies while the workers encode
+        self.workers = max(0, min(workers, (os.cpu_count() or 1) - 1))
+        self.progress = progress
+
+    async def run(
+        self,
+        kind: str,
+        path: str,
+        fmt: Optional[str] = None,
+        job: Optional[str] = None,
+        rejects: Optional[str] = None,
+        restart: bool = False,
+    ) -> ImportProgress:
+        """Import ``path`` as ``kind`` records; ``job`` names the checkpoint (default: kind and path)"""
+        if kind not in LOADERS:
+            raise ValueError(f"Unknown import kind: {kind}")
+        loader = LOADERS[kind]()
+        fmt = fmt or detect_format(path)
+        if fmt not in FORMATS.values():
+            raise ValueError(f"Unsupported import format: {fmt}")
+        source = os.path.abspath(path)
+        job = job or f"{kind}:{source}"
+        header, first_record = read_header(path, fmt)
+
+        conn = await asyncpg.connect(self.dsn)
+        pool = None
+        if self.workers:
+            # Workers start fresh rather than inheriting the event loop and connection
+            pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        reject_file = None
+        try:
+            await conn.set_type_codec(
+                "geography", schema="public", encoder=bytes, decoder=bytes, format="binary"
+            )
+            progress = await self._resume(conn, job, kind, restart)
+            chunks = read_chunks(path, fmt, max(progress.byte_offset, first_record), self.batch_rows)
+            reject_file = open(rejects, "a", encoding="utf-8") if rejects else None
+            start = time.perf_counter()
+            async for (count, items, errors, invalid), offset in self._encoded(pool, kind, fmt, header, chunks):
+                async with conn.transaction():
+                    if items:
+                        errors.update(await loader.precheck(conn, items))
+                    rows = [row for index, row in items if index not in errors]
+                    if rows:
+                        rows = await loader.prepare(conn, rows)
+                        await conn.copy_records_to_table(loader.table, records=rows, columns=loader.columns)
+                        await loader.after_batch(conn, rows)
+                    await conn.execute(
+                        SAVE_CHECKPOINT_SQL, job, kind, source, progress.records + count,
+                        progress.loaded + len(rows), progress.rejected + len(errors), offset,
+                    )
+                if rows:
+                    await loader.after_commit(rows)
+                if reject_file:
+                    encoded = dict(items)
+                    for index in sorted(errors):
+                        record = invalid.get(index)
+                        if index in encoded:
+                            record = dict(zip(loader.columns, encoded[index]))
+                        reject_file.write(json.dumps({
+                            "record": progress.records + index + 1,
+                            "error": errors[index],
+                            "data": record,
+                        }, default=json_default) + "\n")
+                progress.records += count
+                progress.loaded += len(rows)
+                progress.rejected += len(errors)
+                progress.byte_offset = offset
+                progress.batches += 1
+                progress.elapsed_seconds = round(time.perf_counter() - start, 3)
+                self.progress(progress)
+
+            await conn.execute(f"ANALYZE {loader.table}")
+            await conn.execute(
+                "UPDATE import_checkpoints SET finished_at = now(), updated_at = now() WHERE job = $1", job
+            )
+            progress.finished = True
+            progress.elapsed_seconds = round(time.perf_counter() - start, 3)
+            self.progress(progress)
+            return progress
+        finally:
+            if reject_file:
+                reject_file.close()
+            if pool:
+                pool.shutdown(cancel_futures=True)
+            await conn.close()
+
+    async def _encoded(
+        self,
+        pool: Optional[ProcessPoolExecutor],
+        kind: str,
+        fmt: str,
+        header: Optional[List[str]],
+        chunks: Iterator[Tuple[bytes, int]],
+    ):
+        """Encoded chunks in file order with their end offset, keeping the workers ahead of ``COPY``"""
+        if pool is None:
+            for data, offset in chunks:
+                yield encode_chunk(kind, fmt, header, data), offset
+            return
+        loop = asyncio.get_running_loop()
+        pending = deque()
+        for data, offset in chunks:
+            pending.append((loop.run_in_executor(pool, encode_chunk, kind, fmt, header, data), offset))
+            if len(pending) > 2 * self.workers:
+                future, offset = pending.popleft()
+                yield await future, offset
+        while pending:
+            future, offset = pending.popleft()
+            yield await future, offset
+
+    async def _resume(self, conn: asyncpg.Connection, job: str, kind: str, restart: bool) -> ImportProgress:
+        if restart:
+            await conn.execute("DELETE FROM import_checkpoints WHERE job = $1", job)
+            return ImportProgress(job=job, kind=kind)
+        checkpoint = await conn.fetchrow("SELECT * FROM import_checkpoints WHERE job = $1", job)
+        if checkpoint is None:
+            return ImportProgress(job=job, kind=kind)
+        if checkpoint["kind"] != kind:
+            raise ValueError(f"Import job {job} loads {checkpoint['kind']}, not {kind}")
+        return ImportProgress(
+            job=job,
+            kind=kind,
+            records=checkpoint["records_done"],
+            loaded=checkpoint["rows_loaded"],
+            rejected=checkpoint["rows_rejected"],
+            resumed_from=checkpoint["records_done"],
+            byte_offset=checkpoint["byte_offset"],
+        )
@@ -1,40 +1,29 @@
-from typing import List
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from geoalchemy2.elements import WKTElement
-from geoalchemy2.shape import to_shape
+from app.config import get_settings
 from app.models import Event
 from app.schemas import EventCreate, EventResponse, VenueSchema
 from app.repositories import EventRepository
+from app.repositories.inventory import InventoryRepository
+from app.services.event_cache import AVAILABILITY_FIELDS, EventCache, event_cache
+from app.services.event_serializer import event_to_response, events_to_responses
+from app.services.geo_tiles import GeoTileCache, geo_tile_cache
+from app.services.pagination import decode_cursor, encode_cursor
+
+settings = get_settings()
 
 class EventService:
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: Optional[EventCache] = None,
+        tiles: Optional[GeoTileCache] = None
+    ):
+        self.db = db
         self.repository = EventRepository(db)
-    
-    def _event_to_response(self, event: Event) -> EventResponse:
-        """Convert Event model to EventResponse schema."""
-        # Extract coordinates from venue_location
-        if event.venue_location:
-            shape = to_shape(event.venue_location)
-            venue = {
-                "address": event.venue_address,
-                "latitude": shape.y,
-                "longitude": shape.x
-            }
-        else:
-            venue = None
-        
-        return EventResponse(
-            id=event.id,
-            title=event.title,
-            description=event.description,
-            start_time=event.start_time,
-            end_time=event.end_time,
-            total_tickets=event.total_tickets,
-            tickets_sold=event.tickets_sold,
-            available_tickets=event.available_tickets,
-            venue_address=event.venue_address,
-            venue=venue
-        )
+        self.cache = cache or event_cache
+        self.tiles = tiles or geo_tile_cache
     
     async def create_event(self, event_data: EventCreate) -> EventResponse:
         """Create a new event with venue information."""
@@ -56,16 +45,92 @@ class EventService:
         )
         
         event = await self.repository.create(event)
-        return self._event_to_response(event)
+        
+        if settings.INVENTORY_SHARDS > 0:
+            await InventoryRepository(self.db).create_shards(event, settings.INVENTORY_SHARDS)
+            await self.db.commit()
+        
+        await self.cache.invalidate_event(event.id)
+        await self.tiles.invalidate_point(event_data.venue.latitude, event_data.venue.longitude)
+        return event_to_response(event)
+    
+    async def get_all_events(self, skip: int = 0, limit: int = 100) -> List[EventResponse]:
+        """Get events ordered by start time."""
+        events, _ = await self.get_events_page(skip=skip, limit=limit)
+        return events
     
-    async def get_all_events(self) -> List[EventResponse]:
-        """Get all events."""
-        events = await self.repository.get_all()
-        return [self._event_to_response(event) for event in events]
+    async def get_events_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[EventResponse], Optional[str]]:
+        """Get one page of events and the cursor for the next page.
+        
+        Pass the returned cursor back to continue with a keyset page; the
+        cursor is None on the last page.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        
+        # One extra row tells us whether there is a next page
+        if self.cache.enabled:
+            keys = await self.repository.get_page_keys(limit=limit + 1, skip=skip, after=after)
+            events = await self._get_cached([event_id for event_id, _ in keys[:limit]])
+        else:
+            rows = await self.repository.get_page(limit=limit + 1, skip=skip, after=after)
+            keys = [(event.id, event.start_time) for event in rows]
+            events = events_to_responses(rows[:limit])
+        
+        next_cursor = None
+        if len(keys) > limit:
+            last_id, last_start_time = keys[limit - 1]
+            next_cursor = encode_cursor(last_start_time, last_id)
+        
+        return events, next_cursor
     
     async def get_event_by_id(self, event_id: int) -> EventResponse:
         """Get event by ID."""
-        event = await self.repository.get_by_id(event_id)
+        if self.cache.enabled:
+            events = await self._get_cached([event_id])
+            event = events[0] if events else None
+        else:
+            event = await self.repository.get_by_id(event_id)
+            event = event_to_response(event) if event else None
         if not event:
             raise ValueError(f"Event with id {event_id} not found")
-        return self._event_to_response(event)
\ No newline at end of file
+        return event
+    
+    async def get_events_by_ids(self, event_ids: List[int]) -> List[EventResponse]:
+        """Get events in the order of ``event_ids``, skipping ids that do not exist."""
+        if self.cache.enabled:
+            return await self._get_cached(event_ids)
+        events = {event.id: event for event in await self.repository.get_by_ids(event_ids)}
+        return events_to_responses([events[event_id] for event_id in event_ids if event_id in events])
+    
+    async def _get_cached(self, event_ids: List[int]) -> List[EventResponse]:
+        """Build responses from the event cache, loading misses from the database.
+        
+        Keeps the order of ``event_ids`` and drops ids that no longer exist.
+        """
+        metadata = await self.cache.get_metadata(event_ids)
+        sold = await self.cache.get_tickets_sold(event_ids)
+        
+        missing = [event_id for event_id in event_ids if event_id not in metadata]
+        if missing:
+            loaded = events_to_responses(await self.repository.get_by_ids(missing))
+            await self.cache.store(loaded)
+            for response in loaded:
+                metadata[response.id] = response.model_dump(mode="json", exclude=AVAILABILITY_FIELDS)
+                sold[response.id] = response.tickets_sold
+        
+        stale = [event_id for event_id in event_ids if event_id in metadata and event_id not in sold]
+        if stale:
+            counts = await self.repository.get_tickets_sold(stale)
+            await self.cache.store_tickets_sold(counts)
+            sold.update(counts)
+        
+        return [
+            self.cache.to_response(metadata[event_id], sold[event_id])
+            for event_id in event_ids
+            if event_id in metadata and event_id in sold
+        ]
\ No newline at end of file
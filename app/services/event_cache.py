@@ -0,0 +1,88 @@
+from typing import Dict, Iterable
+
+from app.cache import TwoTierCache
+from app.config import get_settings
+from app.schemas.event import EventResponse
+
+settings = get_settings()
+
+# Fields that change with every sale; they are cached separately
+AVAILABILITY_FIELDS = {"tickets_sold", "available_tickets"}
+
+
+class EventCache:
+    """Read-through cache for serialized ``EventResponse`` payloads.
+
+    Event metadata hardly ever changes after creation, so it is cached for a
+    long time. ``tickets_sold`` lives in its own short-lived counter cache
+    that is invalidated whenever a ticket count changes, which keeps the
+    metadata entries valid across sales.
+    """
+
+    def __init__(self):
+        self.events = TwoTierCache(
+            "events",
+            local_maxsize=settings.EVENT_CACHE_LOCAL_SIZE,
+            local_ttl=settings.EVENT_CACHE_LOCAL_TTL_SECONDS,
+            redis_ttl=settings.EVENT_CACHE_TTL_SECONDS,
+        )
+        self.availability = TwoTierCache(
+            "event_availability",
+            local_maxsize=settings.EVENT_CACHE_LOCAL_SIZE,
+            local_ttl=min(1.0, settings.EVENT_AVAILABILITY_TTL_SECONDS),
+            redis_ttl=settings.EVENT_AVAILABILITY_TTL_SECONDS,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return settings.EVENT_CACHE_ENABLED
+
+    async def get_metadata(self, event_ids: Iterable[int]) -> Dict[int, dict]:
+        return await self.events.get_many(event_ids)
+
+    async def get_tickets_sold(self, event_ids: Iterable[int]) -> Dict[int, int]:
+        return await self.availability.get_many(event_ids)
+
+    async def store(self, responses: Iterable[EventResponse]) -> None:
+        """Cache freshly loaded events, metadata and counters separately"""
+        metadata = {}
+        sold = {}
+        for response in responses:
+            metadata[response.id] = response.model_dump(mode="json", exclude=AVAILABILITY_FIELDS)
+            sold[response.id] = response.tickets_sold
+        await self.events.set_many(metadata)
+        await self.availability.set_many(sold)
+
+    async def store_tickets_sold(self, sold: Dict[int, int]) -> None:
+        await self.availability.set_many(sold)
+
+    async def invalidate_event(self, event_id: int) -> None:
+        if self.enabled:
+            await self.events.delete(event_id)
+            await self.availability.delete(event_id)
+
+    async def invalidate_availability(self, event_ids: Iterable[int]) -> None:
+        """Drop cached ticket counts; call after the count change is committed"""
+        event_ids = list(event_ids)
+        if self.enabled and event_ids:
+            await self.availability.delete_many(event_ids)
+
+    @staticmethod
+    def to_dict(metadata: dict, tickets_sold: int) -> dict:
+        """Response payload without building an ``EventResponse``"""
+        return {
+            **metadata,
+            "tickets_sold": tickets_sold,
+            "available_tickets": metadata["total_tickets"] - tickets_sold,
+        }
+
+    @staticmethod
+    def to_response(metadata: dict, tickets_sold: int) -> EventResponse:
+        return EventResponse(
+            **metadata,
+            tickets_sold=tickets_sold,
+            available_tickets=metadata["total_tickets"] - tickets_sold,
+        )
+
+
+event_cache = EventCache()
@@ -0,0 +1,66 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+from geoalchemy2.elements import WKBElement, WKTElement
+
+from app.models import Event
+from app.schemas.event import EventResponse
+
+
+def decode_points(locations: Sequence[Optional[object]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Longitudes and latitudes of many point elements in one vectorized pass.
+
+    Accepts ``WKBElement`` (as loaded from the database), ``WKTElement`` (as
+    set on a new model) or ``None``, which decodes to NaN.
+    """
+    wkb = np.full(len(locations), None, dtype=object)
+    wkt = np.full(len(locations), None, dtype=object)
+    for i, location in enumerate(locations):
+        if isinstance(location, WKBElement):
+            data = location.data
+            wkb[i] = bytes(data) if isinstance(data, memoryview) else data
+        elif isinstance(location, WKTElement):
+            wkt[i] = location.data
+
+    geometries = shapely.from_wkb(wkb)
+    if any(value is not None for value in wkt):
+        parsed = shapely.from_wkt(wkt)
+        geometries = np.where(shapely.is_missing(geometries), parsed, geometries)
+    return shapely.get_x(geometries), shapely.get_y(geometries)
+
+
+def events_to_responses(events: Sequence[Event]) -> List[EventResponse]:
+    """Serialize loaded events, decoding all venue coordinates at once.
+
+    Rows come straight from the database, so the responses are built with
+    ``model_construct`` and skip re-validation.
+    """
+    longitudes, latitudes = decode_points([event.venue_location for event in events])
+    responses = []
+    for event, longitude, latitude in zip(events, longitudes.tolist(), latitudes.tolist()):
+        if longitude != longitude:  # NaN: no location
+            venue = None
+        else:
+            venue = {
+                "address": event.venue_address,
+                "latitude": latitude,
+                "longitude": longitude
+            }
+        responses.append(EventResponse.model_construct(
+            id=event.id,
+            title=event.title,
+            description=event.description,
+            start_time=event.start_time,
+            end_time=event.end_time,
+            total_tickets=event.total_tickets,
+            tickets_sold=event.tickets_sold,
+            available_tickets=event.total_tickets - event.tickets_sold,
+            venue_address=event.venue_address,
+            venue=venue
+        ))
+    return responses
+
+
+def event_to_response(event: Event) -> EventResponse:
+    return events_to_responses([event])[0]
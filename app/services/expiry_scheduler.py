@@ -0,0 +1,89 @@
+import asyncio
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+import redis.asyncio as redis
+
+from app.config import get_settings
+
+settings = get_settings()
+
+SCHEDULE_KEY = "expiry:schedule"
+BUCKET_KEY = "expiry:bucket:{deadline}"
+
+
+def enqueue_expiry_task(deadline: int) -> None:
+    """Queue the Celery task that expires everything due at ``deadline``."""
+    from app.celery_app.celery import app as celery_app
+
+    celery_app.send_task(
+        "tasks.expire_due_tickets",
+        args=[deadline],
+        eta=datetime.fromtimestamp(deadline, tz=timezone.utc),
+    )
+
+
+class ExpiryScheduler:
+    """Delayed queue that releases each reservation when its deadline passes.
+
+    Reserved tickets sit in a Redis sorted set scored by their expiry second.
+    The first ticket scheduled for a given second also queues one Celery ETA
+    task for that second; every other ticket due in the same second rides on
+    that task. The beat sweep stays in place as a safety net.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        enqueue: Callable[[int], None] = enqueue_expiry_task,
+    ):
+        self.redis = client
+        self.enqueue = enqueue
+
+    @staticmethod
+    def deadline_for(created_at: datetime) -> int:
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        expires_at = created_at + timedelta(minutes=settings.TICKET_EXPIRATION_MINUTES)
+        return math.ceil(expires_at.timestamp())
+
+    async def schedule(self, ticket_id: int, created_at: datetime) -> int:
+        """Schedule one reserved ticket and return its deadline (epoch seconds)"""
+        return (await self.schedule_many([(ticket_id, created_at)]))[0]
+
+    async def schedule_many(self, tickets) -> List[int]:
+        """Schedule ``(ticket_id, created_at)`` pairs, one Celery task per distinct second"""
+        deadlines = [self.deadline_for(created_at) for _, created_at in tickets]
+        if not deadlines:
+            return deadlines
+
+        seconds = sorted(set(deadlines))
+        now = datetime.now(timezone.utc).timestamp()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(SCHEDULE_KEY, {
+                str(ticket_id): deadline
+                for (ticket_id, _), deadline in zip(tickets, deadlines)
+            })
+            for deadline in seconds:
+                ttl = max(int(deadline - now), 0) + 60
+                pipe.set(BUCKET_KEY.format(deadline=deadline), 1, nx=True, ex=ttl)
+            results = await pipe.execute()
+
+        new_buckets = [deadline for deadline, created in zip(seconds, results[1:]) if created]
+        for deadline in new_buckets:
+            # Publishing to the broker is blocking I/O
+            await asyncio.to_thread(self.enqueue, deadline)
+        return deadlines
+
+    async def due(self, up_to: Optional[int] = None) -> List[int]:
+        """Ticket ids whose deadline is at or before ``up_to`` (default: now)"""
+        if up_to is None:
+            up_to = math.floor(datetime.now(timezone.utc).timestamp())
+        ticket_ids = await self.redis.zrangebyscore(SCHEDULE_KEY, "-inf", up_to)
+        return [int(ticket_id) for ticket_id in ticket_ids]
+
+    async def discard(self, ticket_ids: List[int]) -> None:
+        """Drop tickets that were expired, paid, or no longer need a timer"""
+        if ticket_ids:
+            await self.redis.zrem(SCHEDULE_KEY, *[str(ticket_id) for ticket_id in ticket_ids])
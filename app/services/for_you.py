@@ -1,16 +1,25 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from geoalchemy2 import functions as geofunc
-from geoalchemy2.shape import from_shape, to_shape
-from shapely.geometry import Point
 
 from app.models import Event
+from app.repositories import EventRepository
+from app.repositories.recommendation import RecommendationRepository
+from app.repositories.user import UserRepository
 from app.schemas.event import EventResponse
+from app.services.event import EventService
+from app.services.event_serializer import events_to_responses
+from app.services.geo_tiles import GeoTileCache, geo_tile_cache
+from app.services.ranking import CandidateFeatures, rank
+
+# Upcoming events considered per requested slot when topping up
+UPCOMING_POOL_FACTOR = 5
 
 class ForYouService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, tiles: Optional[GeoTileCache] = None):
         self.db = db
+        self.repository = EventRepository(db)
+        self.tiles = tiles or geo_tile_cache
 
     async def get_nearby_events(
         self,
@@ -31,57 +40,23 @@ class ForYouService:
             limit: Maximum number of records to return
             
         Returns:
-            List of EventResponse objects within the specified radius
+            List of EventResponse objects within the specified radius, nearest first
         """
-        # Convert km to meters (PostGIS uses meters)
-        radius_meters = radius_km * 1000
-        
-        # Create a point from the coordinates
-        point = from_shape(Point(longitude, latitude), srid=4326)
-        
-        # Query events within the radius, ordered by distance
-        query = (
-            select(Event)
-            .where(
-                func.ST_DWithin(
-                    Event.venue_location,
-                    point,
-                    radius_meters
-                )
+        if self.tiles.enabled:
+            event_ids = await self.tiles.nearby_event_ids(
+                self.repository, latitude, longitude, radius_km, skip=skip, limit=limit
             )
-            .order_by(
-                func.ST_Distance(Event.venue_location, point)
-            )
-            .offset(skip)
-            .limit(limit)
-        )
+            if event_ids is not None:
+                return await EventService(self.db).get_events_by_ids(event_ids)
         
-        result = await self.db.execute(query)
-        events = result.scalars().all()
-        
-        # Convert to response models
-        result_events = []
-        for event in events:
-            shape = to_shape(event.venue_location)
-            result_events.append(
-                EventResponse(
-                    id=event.id,
-                    title=event.title,
-                    description=event.description,
-                    start_time=event.start_time,
-                    end_time=event.end_time,
-                    total_tickets=event.total_tickets,
-                    tickets_sold=event.tickets_sold,
-                    available_tickets=event.total_tickets - event.tickets_sold,
-                    venue_address=event.venue_address,
-                    venue={
-                        "address": event.venue_address,
-                        "latitude": shape.y,
-                        "longitude": shape.x
-                    }
-                )
-            )
-        return result_events
+        events = await self.repository.get_nearby_events(
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            skip=skip,
+            limit=limit
+        )
+        return events_to_responses(events)
 
     async def get_recommended_events(
         self,
@@ -89,7 +64,12 @@ class ForYouService:
         limit: int = 10
     ) -> List[EventResponse]:
         """
-        Get recommended events for a user based on their preferences and history
+        Get recommended events for a user based on their purchase history and location
+        
+        Candidates are precomputed by the recommendation build; here they are
+        re-ranked against live availability, time to start and distance.
+        Users without candidates (or with too few) are topped up with ranked
+        upcoming events.
         
         Args:
             user_id: ID of the user to get recommendations for
@@ -98,8 +78,26 @@ class ForYouService:
         Returns:
             List of recommended EventResponse objects
         """
-        # For now, return upcoming events as recommendations
-        # In a real application, this would use a recommendation engine
+        origin = await UserRepository(self.db).get_location(user_id)
+        recommended = []
+        stored = await RecommendationRepository(self.db).get_for_user(user_id)
+        if stored and stored.event_ids:
+            events = await EventService(self.db).get_events_by_ids(stored.event_ids)
+            affinity = dict(zip(stored.event_ids, stored.scores))
+            features = CandidateFeatures.from_events(events, affinity=[affinity[event.id] for event in events])
+            recommended = [events[i] for i in rank(features, limit, origin=origin)]
+        
+        if len(recommended) < limit:
+            chosen = {event.id for event in recommended}
+            upcoming = [
+                event for event in await self._upcoming_events(limit * UPCOMING_POOL_FACTOR)
+                if event.id not in chosen
+            ]
+            top = rank(CandidateFeatures.from_events(upcoming), limit - len(recommended), origin=origin)
+            recommended.extend(upcoming[i] for i in top)
+        return recommended
+
+    async def _upcoming_events(self, limit: int) -> List[EventResponse]:
         query = (
             select(Event)
             .where(Event.start_time >= func.now())
@@ -110,26 +108,4 @@ class ForYouService:
         result = await self.db.execute(query)
         events = result.scalars().all()
         
-        # Convert to response models
-        result_events = []
-        for event in events:
-            shape = to_shape(event.venue_location)
-            result_events.append(
-                EventResponse(
-                    id=event.id,
-                    title=event.title,
-                    description=event.description,
-                    start_time=event.start_time,
-                    end_time=event.end_time,
-                    total_tickets=event.total_tickets,
-                    tickets_sold=event.tickets_sold,
-                    available_tickets=event.total_tickets - event.tickets_sold,
-                    venue_address=event.venue_address,
-                    venue={
-                        "address": event.venue_address,
-                        "latitude": shape.y,
-                        "longitude": shape.x
-                    }
-                )
-            )
-        return result_events
+        return events_to_responses(events)
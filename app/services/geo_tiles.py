@@ -0,0 +1,244 @@
+import math
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.cache import TwoTierCache
+from app.config import get_settings
+
+settings = get_settings()
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+MIN_PRECISION = 2
+MAX_PRECISION = 7
+
+Box = Tuple[float, float, float, float]
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            bounds[0] = mid
+        else:
+            bits = bits * 2
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = bit_count = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Width and height of a geohash cell in degrees"""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 360.0 / 2 ** lon_bits, 180.0 / 2 ** lat_bits
+
+
+def precision_for(latitude: float, radius_km: float) -> int:
+    """Finest precision whose cells are still at least ``radius_km`` across,
+    so a search circle covers a handful of cells."""
+    cos_lat = math.cos(math.radians(latitude))
+    for precision in range(MAX_PRECISION, MIN_PRECISION - 1, -1):
+        width, height = cell_size(precision)
+        if min(width * KM_PER_DEGREE * cos_lat, height * KM_PER_DEGREE) >= radius_km:
+            return precision
+    return MIN_PRECISION
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float, precision: int) -> Optional[Dict[str, Box]]:
+    """Geohash cells (with their ``(west, south, east, north)`` boxes) covering the circle.
+
+    Returns None when the circle reaches a pole or the antimeridian.
+    """
+    width, height = cell_size(precision)
+    dlat = radius_km / KM_PER_DEGREE
+    south, north = latitude - dlat, latitude + dlat
+    if south <= -90 or north >= 90:
+        return None
+    dlon = radius_km / (KM_PER_DEGREE * math.cos(math.radians(max(abs(south), abs(north)))))
+    west, east = longitude - dlon, longitude + dlon
+    if west <= -180 or east >= 180:
+        return None
+
+    cells = {}
+    for row in range(math.floor((south + 90) / height), math.floor((north + 90) / height) + 1):
+        for col in range(math.floor((west + 180) / width), math.floor((east + 180) / width) + 1):
+            cell_west, cell_south = col * width - 180, row * height - 90
+            cell = encode_geohash(cell_south + height / 2, cell_west + width / 2, precision)
+            cells[cell] = (cell_west, cell_south, cell_west + width, cell_south + height)
+    return cells
+
+
+def haversine_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distances from one point to many, in kilometres"""
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlon = np.radians(longitudes) - math.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class TileLevelStats:
+    """Cell hit ratio and lookup latency for one geohash precision"""
+
+    def __init__(self, samples: int = 1000):
+        self.lookups = 0
+        self.cell_hits = 0
+        self.cell_misses = 0
+        self.latencies = deque(maxlen=samples)
+
+    def record(self, hits: int, misses: int, seconds: float) -> None:
+        self.lookups += 1
+        self.cell_hits += hits
+        self.cell_misses += misses
+        self.latencies.append(seconds)
+
+    def stats(self) -> dict:
+        cells = self.cell_hits + self.cell_misses
+        ordered = sorted(self.latencies)
+
+        def percentile(pct: float) -> float:
+            if not ordered:
+                return 0.0
+            index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+            return round(ordered[index] * 1000, 3)
+
+        return {
+            "lookups": self.lookups,
+            "cell_hits": self.cell_hits,
+            "cell_misses": self.cell_misses,
+            "hit_ratio": round(self.cell_hits / cells, 4) if cells else 0.0,
+            "latency_ms": {"p50": percentile(50), "p95": percentile(95), "max": percentile(100)},
+        }
+
+
+class GeoTileCache:
+    """Candidate events per geohash cell for "events near me" searches.
+
+    A search is snapped to the cells covering its circle, at a precision
+    chosen from the radius. Each cell caches ``[id, longitude, latitude]`` of
+    the events inside it; the exact distance filter and ordering for the
+    requested point run in Python, so nearby clients share cached cells.
+    Creating an event drops the cells containing it. Wide searches and
+    crowded cells are left to the PostGIS nearest-neighbour query, which
+    only reads the rows it returns.
+    """
+
+    def __init__(self):
+        self.tiles = TwoTierCache(
+            "geo_tiles",
+            local_maxsize=settings.GEO_TILE_LOCAL_SIZE,
+            local_ttl=settings.GEO_TILE_LOCAL_TTL_SECONDS,
+            redis_ttl=settings.GEO_TILE_TTL_SECONDS,
+        )
+        self.levels: Dict[int, TileLevelStats] = {}
+        self.bypassed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.GEO_TILE_CACHE_ENABLED
+
+    async def nearby_event_ids(
+        self,
+        repository,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        skip: int = 0,
+        limit: int = 10
+    ) -> Optional[List[int]]:
+        """Ids of events within ``radius_km``, nearest first.
+
+        Returns None when the search is too wide (too many or too coarse
+        cells) or a cell holds more than ``GEO_TILE_MAX_CELL_EVENTS`` events;
+        the caller should query the database directly.
+        """
+        start = time.perf_counter()
+        precision = precision_for(latitude, radius_km)
+        if precision < settings.GEO_TILE_MIN_PRECISION:
+            self.bypassed += 1
+            return None
+        cells = covering_cells(latitude, longitude, radius_km, precision)
+        if cells is None or len(cells) > settings.GEO_TILE_MAX_CELLS:
+            self.bypassed += 1
+            return None
+
+        cached = await self.tiles.get_many(cells)
+        missing = [cell for cell in cells if cell not in cached]
+        if missing:
+            max_events = settings.GEO_TILE_MAX_CELL_EVENTS
+            rows = await repository.get_locations_in_boxes(
+                [cells[cell] for cell in missing], limit=max_events * len(missing) + 1
+            )
+            if len(rows) > max_events * len(missing):
+                # Cut off by the limit, so no cell is known to be complete
+                self.bypassed += 1
+                return None
+            loaded = {cell: [] for cell in missing}
+            for event_id, event_longitude, event_latitude in rows:
+                cell = encode_geohash(event_latitude, event_longitude, precision)
+                if cell in loaded:
+                    loaded[cell].append([event_id, event_longitude, event_latitude])
+            sparse = {cell: entries for cell, entries in loaded.items() if len(entries) <= max_events}
+            await self.tiles.set_many(sparse)
+            if len(sparse) < len(loaded):
+                self.bypassed += 1
+                return None
+            cached.update(loaded)
+
+        candidates = np.array([entry for cell in cells for entry in cached[cell]], dtype=float).reshape(-1, 3)
+        distances = haversine_km(latitude, longitude, candidates[:, 2], candidates[:, 1])
+        inside = distances <= radius_km
+        ids, distances = candidates[inside, 0].astype(np.int64), distances[inside]
+        order = np.lexsort((ids, distances))[skip:skip + limit]
+
+        self.levels.setdefault(precision, TileLevelStats()).record(
+            hits=len(cells) - len(missing),
+            misses=len(missing),
+            seconds=time.perf_counter() - start,
+        )
+        return ids[order].tolist()
+
+    async def invalidate_point(self, latitude: float, longitude: float) -> None:
+        """Drop every cached cell containing this point; call after the event is committed"""
+        if self.enabled:
+            await self.tiles.delete_many(
+                encode_geohash(latitude, longitude, precision)
+                for precision in range(MIN_PRECISION, MAX_PRECISION + 1)
+            )
+
+    async def invalidate_points(self, points: Iterable[Tuple[float, float]]) -> None:
+        """Drop the cells containing any of these ``(latitude, longitude)`` points at once"""
+        if self.enabled:
+            # A coarser cell's geohash is a prefix of the finest one
+            finest = {encode_geohash(latitude, longitude, MAX_PRECISION) for latitude, longitude in points}
+            await self.tiles.delete_many({
+                cell[:precision]
+                for cell in finest
+                for precision in range(MIN_PRECISION, MAX_PRECISION + 1)
+            })
+
+    def stats(self) -> dict:
+        return {
+            "bypassed": self.bypassed,
+            "levels": {precision: level.stats() for precision, level in sorted(self.levels.items())},
+        }
+
+
+geo_tile_cache = GeoTileCache()
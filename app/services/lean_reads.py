@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Ticket
+from app.repositories.event import EventRepository
+from app.repositories.ticket import TicketRepository
+from app.services.event import EventService
+from app.services.event_cache import event_cache as default_event_cache
+
+
+@dataclass(frozen=True, slots=True)
+class TicketRow:
+    """A ticket as sent to clients; fields in ``TicketResponse`` order"""
+    user_id: int
+    event_id: int
+    id: int
+    status: str
+    created_at: datetime
+    payment_reference: Optional[str]
+    paid_at: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, row) -> "TicketRow":
+        id, user_id, event_id, status, created_at, payment_reference, paid_at = row
+        return cls(user_id, event_id, id, status, created_at, payment_reference, paid_at)
+
+
+@dataclass(frozen=True, slots=True)
+class EventRow:
+    """An event as sent to clients; fields in ``EventResponse`` order"""
+    id: int
+    title: str
+    description: Optional[str]
+    start_time: datetime
+    end_time: datetime
+    total_tickets: int
+    tickets_sold: int
+    available_tickets: int
+    venue_address: str
+    venue: Optional[dict]
+
+    @classmethod
+    def from_row(cls, row) -> "EventRow":
+        (id, title, description, start_time, end_time, total_tickets, tickets_sold,
+         venue_address, longitude, latitude) = row
+        venue = None if longitude is None else {
+            "address": venue_address,
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+        return cls(id, title, description, start_time, end_time, total_tickets, tickets_sold,
+                   total_tickets - tickets_sold, venue_address, venue)
+
+
+class LeanReadService:
+    """ORM-free reads for hot GET endpoints.
+
+    Selects only the response columns as plain rows and returns slotted
+    dataclasses or dicts ready for ``FastJSONResponse``; no identity map,
+    no Pydantic validation. Payloads match the regular endpoints.
+    """
+
+    def __init__(self, db: AsyncSession, cache=None):
+        self.db = db
+        self.cache = cache or default_event_cache
+
+    async def get_event(self, event_id: int) -> Union[EventRow, dict]:
+        if self.cache.enabled:
+            metadata = await self.cache.get_metadata([event_id])
+            sold = await self.cache.get_tickets_sold([event_id])
+            if event_id in metadata and event_id in sold:
+                return self.cache.to_dict(metadata[event_id], sold[event_id])
+            # Misses go through the regular path, which also fills the cache
+            return (await EventService(self.db, cache=self.cache).get_event_by_id(event_id)).model_dump()
+        row = await EventRepository(self.db).get_row(event_id)
+        if row is None:
+            raise ValueError(f"Event with id {event_id} not found")
+        return EventRow.from_row(row)
+
+    async def get_ticket(self, ticket_id: int) -> TicketRow:
+        rows = await TicketRepository(self.db).get_rows(Ticket.id == ticket_id)
+        if not rows:
+            raise ValueError("Ticket not found")
+        return TicketRow.from_row(rows[0])
+
+    async def get_user_tickets(self, user_id: int) -> List[TicketRow]:
+        rows = await TicketRepository(self.db).get_rows(Ticket.user_id == user_id)
+        return [TicketRow.from_row(row) for row in rows]
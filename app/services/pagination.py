@@ -0,0 +1,20 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(start_time: datetime, event_id: int) -> str:
+    """Opaque keyset cursor for the position just after ``(start_time, event_id)``"""
+    raw = json.dumps([start_time.isoformat(), event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of ``encode_cursor``; raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start_time, event_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(start_time), int(event_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from app.cache import TwoTierCache
+from app.config import get_settings
+from app.models import Ticket, TicketStatus
+
+settings = get_settings()
+
+TICKET_FIELDS = (
+    "id", "user_id", "event_id", "status", "created_at",
+    "payment_reference", "paid_at", "inventory_shard", "reservation_id",
+)
+DATETIME_FIELDS = ("created_at", "paid_at")
+
+
+class PaymentCache:
+    """Confirmed payments keyed by ``payment_reference``.
+
+    Payment providers retry webhooks many times; a repeat confirmation is
+    answered from here without touching the tickets table. A payment never
+    changes once confirmed, so entries only age out.
+    """
+
+    def __init__(self):
+        self.payments = TwoTierCache(
+            "payments",
+            local_maxsize=settings.PAYMENT_CACHE_LOCAL_SIZE,
+            local_ttl=settings.PAYMENT_CACHE_TTL_SECONDS,
+            redis_ttl=settings.PAYMENT_CACHE_TTL_SECONDS,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return settings.PAYMENT_CACHE_ENABLED
+
+    async def get(self, payment_reference: str) -> Optional[dict]:
+        return (await self.get_many([payment_reference])).get(payment_reference)
+
+    async def get_many(self, payment_references: Iterable[str]) -> Dict[str, dict]:
+        if not self.enabled:
+            return {}
+        return await self.payments.get_many(payment_references)
+
+    async def store(self, tickets: Iterable[Ticket]) -> None:
+        """Remember paid tickets; call after the payment is committed"""
+        if not self.enabled:
+            return
+        await self.payments.set_many({
+            ticket.payment_reference: self.snapshot(ticket)
+            for ticket in tickets
+            if ticket.status == TicketStatus.PAID
+        })
+
+    @staticmethod
+    def snapshot(ticket: Ticket) -> dict:
+        data = {field: getattr(ticket, field) for field in TICKET_FIELDS}
+        data["status"] = TicketStatus(data["status"]).value
+        for field in DATETIME_FIELDS:
+            data[field] = data[field].isoformat() if data[field] else None
+        return data
+
+    @staticmethod
+    def to_ticket(snapshot: dict) -> Ticket:
+        """Transient ticket built from a cached payment"""
+        data = dict(snapshot)
+        data["status"] = TicketStatus(data["status"])
+        for field in DATETIME_FIELDS:
+            data[field] = datetime.fromisoformat(data[field]) if data[field] else None
+        return Ticket(**data)
+
+
+payment_cache = PaymentCache()
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.event import EventResponse
+from app.services.geo_tiles import haversine_km
+
+
+@dataclass(frozen=True)
+class RankingWeights:
+    """Contribution of each feature to an event's score (features are 0..1)"""
+    affinity: float = 0.4
+    distance: float = 0.25
+    time: float = 0.15
+    fill: float = 0.1
+    popularity: float = 0.1
+    # Distance and time-to-start at which those features fall to 1/e
+    distance_scale_km: float = 25.0
+    time_scale_hours: float = 24.0 * 14
+
+
+DEFAULT_WEIGHTS = RankingWeights()
+
+
+class CandidateFeatures:
+    """Ranking inputs for a set of candidate events, one array per feature.
+
+    ``affinity`` is any per-user prior such as a precomputed recommendation
+    score. Missing venue coordinates are NaN and score no distance term.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[int],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        start_times: Sequence[float],
+        tickets_sold: Sequence[int],
+        total_tickets: Sequence[int],
+        affinity: Optional[Sequence[float]] = None
+    ):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.start_times = np.asarray(start_times, dtype=float)
+        self.tickets_sold = np.asarray(tickets_sold, dtype=float)
+        self.total_tickets = np.asarray(total_tickets, dtype=float)
+        self.affinity = (
+            np.zeros(len(self.ids)) if affinity is None else np.asarray(affinity, dtype=float)
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_events(
+        cls,
+        events: Sequence[EventResponse],
+        affinity: Optional[Sequence[float]] = None
+    ) -> "CandidateFeatures":
+        latitudes, longitudes, start_times = [], [], []
+        for event in events:
+            venue = event.venue or {}
+            latitudes.append(venue.get("latitude", np.nan))
+            longitudes.append(venue.get("longitude", np.nan))
+            start_time = event.start_time
+            if start_time.tzinfo is None:
+                start_time = start_time.replace(tzinfo=timezone.utc)
+            start_times.append(start_time.timestamp())
+        return cls(
+            ids=[event.id for event in events],
+            latitudes=latitudes,
+            longitudes=longitudes,
+            start_times=start_times,
+            tickets_sold=[event.tickets_sold for event in events],
+            total_tickets=[event.total_tickets for event in events],
+            affinity=affinity,
+        )
+
+
+def score_candidates(
+    features: CandidateFeatures,
+    now: Optional[datetime] = None,
+    origin: Optional[Tuple[float, float]] = None,
+    weights: RankingWeights = DEFAULT_WEIGHTS
+) -> np.ndarray:
+    """Score every candidate in one vectorized pass.
+
+    Events that already started or are sold out score ``-inf``. ``origin``
+    is the user's ``(latitude, longitude)``, if known.
+    """
+    now = now or datetime.now(timezone.utc)
+    hours_to_start = (features.start_times - now.timestamp()) / 3600.0
+    total = np.maximum(features.total_tickets, 1.0)
+    fill = np.clip(features.tickets_sold / total, 0.0, 1.0)
+    sold = np.log1p(np.maximum(features.tickets_sold, 0.0))
+    popularity = sold / sold.max() if len(sold) and sold.max() > 0 else np.zeros(len(sold))
+
+    scores = (
+        weights.affinity * features.affinity
+        + weights.time * np.exp(-np.maximum(hours_to_start, 0.0) / weights.time_scale_hours)
+        + weights.fill * fill
+        + weights.popularity * popularity
+    )
+    if origin is not None:
+        distance = haversine_km(origin[0], origin[1], features.latitudes, features.longitudes)
+        scores += weights.distance * np.nan_to_num(np.exp(-distance / weights.distance_scale_km))
+
+    available = (features.total_tickets > features.tickets_sold) & (hours_to_start > 0)
+    return np.where(available, scores, -np.inf)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` best finite scores, best first"""
+    if k <= 0 or not len(scores):
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    best = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return best[np.isfinite(scores[best])]
+
+
+def rank(
+    features: CandidateFeatures,
+    k: int,
+    now: Optional[datetime] = None,
+    origin: Optional[Tuple[float, float]] = None,
+    weights: RankingWeights = DEFAULT_WEIGHTS
+) -> List[int]:
+    """Positions of the top ``k`` bookable candidates, best first"""
+    return top_k(score_candidates(features, now, origin, weights), k).tolist()
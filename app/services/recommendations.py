@@ -0,0 +1,110 @@
+import heapq
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.repositories.recommendation import RecommendationRepository
+
+settings = get_settings()
+
+# How much each signal contributes to a candidate's score (both are 0..1)
+CO_PURCHASE_WEIGHT = 0.7
+PROXIMITY_WEIGHT = 0.3
+
+
+def combine_candidates(
+    co_purchases: Iterable[Tuple[int, int, int]],
+    nearby: Iterable[Tuple[int, int, float]],
+    owned: Iterable[Tuple[int, int]],
+    user_ids: Iterable[int],
+    radius_km: float,
+    size: int
+) -> Dict[int, Tuple[List[int], List[float]]]:
+    """Score and rank candidates per user, best first.
+
+    Co-purchase counts are normalised by the user's strongest candidate and
+    proximity falls linearly to zero at ``radius_km``. Events the user already
+    holds are dropped. Every user in ``user_ids`` gets an entry, possibly empty.
+    """
+    owned_by_user: Dict[int, Set[int]] = defaultdict(set)
+    for user_id, event_id in owned:
+        owned_by_user[user_id].add(event_id)
+
+    scores: Dict[int, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+    counts: Dict[int, Dict[int, int]] = defaultdict(dict)
+    for user_id, event_id, co_buyers in co_purchases:
+        counts[user_id][event_id] = co_buyers
+    for user_id, events in counts.items():
+        strongest = max(events.values())
+        for event_id, co_buyers in events.items():
+            scores[user_id][event_id] += CO_PURCHASE_WEIGHT * co_buyers / strongest
+    radius_m = radius_km * 1000.0
+    for user_id, event_id, distance in nearby:
+        scores[user_id][event_id] += PROXIMITY_WEIGHT * max(0.0, 1.0 - distance / radius_m)
+
+    candidates = {}
+    for user_id in user_ids:
+        ranked = heapq.nlargest(
+            size,
+            (
+                (score, -event_id)
+                for event_id, score in scores.get(user_id, {}).items()
+                if event_id not in owned_by_user[user_id]
+            )
+        )
+        candidates[user_id] = ([-event_id for _, event_id in ranked], [score for score, _ in ranked])
+    return candidates
+
+
+class RecommendationService:
+    """Builds the precomputed per-user recommendation candidates.
+
+    Runs incrementally: only users whose purchases, location or nearby events
+    changed since the last build's watermark are recomputed. The watermark
+    trails the build by ``RECOMMENDATION_WATERMARK_LAG_SECONDS``, so
+    consecutive windows overlap and rows committed late are still seen.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repository = RecommendationRepository(db)
+
+    async def build(self, batch_size: Optional[int] = None) -> int:
+        """Rebuild candidates for changed users; returns how many were rebuilt"""
+        batch_size = batch_size or settings.RECOMMENDATION_BATCH_SIZE
+        until = (await self.db.execute(select(func.now()))).scalar_one()
+        since = await self.repository.get_watermark()
+        user_ids = sorted(await self.repository.changed_user_ids(
+            since, until, settings.RECOMMENDATION_RADIUS_KM
+        ))
+
+        for start in range(0, len(user_ids), batch_size):
+            await self._build_batch(user_ids[start:start + batch_size], until)
+            await self.db.commit()
+
+        # Only advance the watermark once every batch is stored, so a
+        # failed run is simply repeated. Timestamps are set by the app before
+        # commit, so a row stamped just before ``until`` may only become
+        # visible after this snapshot; the next window starts early enough
+        # to catch it (rebuilding a user twice is harmless).
+        watermark = until - timedelta(seconds=settings.RECOMMENDATION_WATERMARK_LAG_SECONDS)
+        await self.repository.record_build(watermark, len(user_ids))
+        await self.db.commit()
+        return len(user_ids)
+
+    async def _build_batch(self, user_ids: List[int], built_at) -> None:
+        size = settings.RECOMMENDATION_CANDIDATES
+        candidates = combine_candidates(
+            co_purchases=await self.repository.co_purchase_counts(user_ids),
+            nearby=await self.repository.nearby_distances(
+                user_ids, settings.RECOMMENDATION_RADIUS_KM, per_user=size
+            ),
+            owned=await self.repository.owned_event_ids(user_ids),
+            user_ids=user_ids,
+            radius_km=settings.RECOMMENDATION_RADIUS_KM,
+            size=size,
+        )
+        await self.repository.save(candidates, built_at)
@@ -0,0 +1,334 @@
+import json
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import Event, Ticket, TicketStatus, User
+from app.repositories.event import EventRepository
+from app.repositories.inventory import InventoryRepository
+from app.services.event_cache import event_cache
+from app.services.expiry_scheduler import ExpiryScheduler
+
+settings = get_settings()
+
+AVAILABLE_KEY = "ledger:event:{event_id}:available"
+SEQ_KEY = "ledger:seq"
+PENDING_KEY = "ledger:pending"
+PROCESSING_KEY = "ledger:processing"
+PENDING_COUNTS_KEY = "ledger:pending_counts"
+# Outcome of one settled reservation (its ticket id or "rejected"), kept
+# for RESERVATION_STATUS_TTL_SECONDS
+STATUS_KEY = "ledger:reservation:{reservation_id}"
+# Highest reservation id written to Postgres; the queue is in id order
+SETTLED_KEY = "ledger:settled"
+# Unbounded hash of every outcome, replaced by STATUS_KEY; dropped by rebuild
+LEGACY_TICKETS_KEY = "ledger:tickets"
+
+REJECTED = "rejected"
+
+# Take a seat and queue the reservation for write-behind in one atomic step.
+# Returns the reservation id, -1 when sold out, -2 when the event is not loaded.
+CLAIM_SCRIPT = """
+local available = redis.call('GET', KEYS[1])
+if not available then return -2 end
+if tonumber(available) <= 0 then return -1 end
+redis.call('DECR', KEYS[1])
+local reservation_id = redis.call('INCR', KEYS[2])
+redis.call('RPUSH', KEYS[3],
+    '[' .. reservation_id .. ',' .. ARGV[1] .. ',' .. ARGV[2] .. ',"' .. ARGV[3] .. '"]')
+redis.call('HINCRBY', KEYS[4], ARGV[1], 1)
+return reservation_id
+"""
+
+# Move a batch from the pending queue to the processing list. A batch left
+# in processing by a crashed flush is handed out again first.
+TAKE_BATCH_SCRIPT = """
+local stuck = redis.call('LRANGE', KEYS[2], 0, -1)
+if #stuck > 0 then return stuck end
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items > 0 then
+    redis.call('LTRIM', KEYS[1], #items, -1)
+    redis.call('RPUSH', KEYS[2], unpack(items))
+end
+return items
+"""
+
+# Raise a counter to ARGV[1] unless it is higher already.
+SET_MAX_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tonumber(ARGV[1]) > current then redis.call('SET', KEYS[1], ARGV[1]) end
+return nil
+"""
+
+# Give seats back, but only to events the ledger currently tracks.
+RELEASE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+class ReservationLedger:
+    """Redis fast path for flash-sale reservations.
+
+    Seats are claimed atomically against a per-event counter in Redis and the
+    caller gets a reservation id straight away. ``flush`` later writes the
+    queued reservations to the ``tickets`` table in batches, and ``rebuild``
+    recomputes the counters from Postgres after a crash.
+    """
+
+    def __init__(self, client: redis.Redis):
+        self.redis = client
+        self._claim = client.register_script(CLAIM_SCRIPT)
+        self._take_batch = client.register_script(TAKE_BATCH_SCRIPT)
+        self._release = client.register_script(RELEASE_SCRIPT)
+        self._set_max = client.register_script(SET_MAX_SCRIPT)
+
+    async def prime(self, event_id: int, available: int) -> None:
+        """Start tracking an event, unless it is tracked already."""
+        await self.redis.set(AVAILABLE_KEY.format(event_id=event_id), max(available, 0), nx=True)
+
+    async def available(self, event_id: int) -> Optional[int]:
+        value = await self.redis.get(AVAILABLE_KEY.format(event_id=event_id))
+        return int(value) if value is not None else None
+
+    async def reserve(self, db: AsyncSession, event_id: int, user_id: int) -> int:
+        """Claim a seat and return the reservation id"""
+        reservation_id = await self._claim_seat(event_id, user_id)
+
+        if reservation_id == -2:
+            event = await db.get(Event, event_id)
+            if not event:
+                raise ValueError("Event not found")
+            pending = await self.redis.hget(PENDING_COUNTS_KEY, str(event_id))
+            await self.prime(event_id, event.available_tickets - int(pending or 0))
+            reservation_id = await self._claim_seat(event_id, user_id)
+
+        if reservation_id < 0:
+            raise ValueError("No tickets available for this event")
+
+        return reservation_id
+
+    async def _claim_seat(self, event_id: int, user_id: int) -> int:
+        return int(await self._claim(
+            keys=[AVAILABLE_KEY.format(event_id=event_id), SEQ_KEY, PENDING_KEY, PENDING_COUNTS_KEY],
+            args=[int(event_id), int(user_id), datetime.now(timezone.utc).isoformat()],
+        ))
+
+    async def release(self, event_id: int, count: int = 1) -> None:
+        """Return expired or cancelled seats to the ledger"""
+        await self._release(keys=[AVAILABLE_KEY.format(event_id=event_id)], args=[count])
+
+    async def status(self, reservation_id: int) -> Optional[dict]:
+        """Look up a reservation: pending, confirmed (with its ticket id) or rejected.
+
+        Outcomes are kept for ``RESERVATION_STATUS_TTL_SECONDS``; older
+        reservations are not found.
+        """
+        ticket_id = await self.redis.get(STATUS_KEY.format(reservation_id=reservation_id))
+        if ticket_id == REJECTED:
+            return {"reservation_id": reservation_id, "status": REJECTED, "ticket_id": None}
+        if ticket_id is not None:
+            return {"reservation_id": reservation_id, "status": "confirmed", "ticket_id": int(ticket_id)}
+
+        last_issued, settled = await self.redis.mget(SEQ_KEY, SETTLED_KEY)
+        if last_issued is None or reservation_id > int(last_issued) or reservation_id <= int(settled or 0):
+            return None
+        return {"reservation_id": reservation_id, "status": "pending", "ticket_id": None}
+
+    async def flush(self, db: AsyncSession, batch_size: Optional[int] = None) -> int:
+        """Write one batch of queued reservations to Postgres.
+
+        Inserts are keyed on ``Ticket.reservation_id`` so a batch replayed
+        after a crash between commit and acknowledgement is not written twice.
+        Reservations the event has no seat left for in Postgres are rejected.
+        Returns the number of reservations settled.
+        """
+        batch_size = batch_size or settings.RESERVATION_FLUSH_BATCH_SIZE
+        items = await self._take_batch(keys=[PENDING_KEY, PROCESSING_KEY], args=[batch_size])
+        if not items:
+            return 0
+
+        records = [json.loads(item) for item in items]
+        user_ids = {user_id for _, _, user_id, _ in records}
+        event_ids = {event_id for _, event_id, _, _ in records}
+        known_users = set(await self._existing_ids(db, User, user_ids))
+        known_events = set(await self._existing_ids(db, Event, event_ids))
+
+        # Rows written by an earlier, unacknowledged attempt
+        result = await db.execute(
+            select(Ticket.reservation_id, Ticket.id)
+            .where(Ticket.reservation_id.in_([reservation_id for reservation_id, _, _, _ in records]))
+        )
+        ticket_ids: Dict[int, int] = dict(result.all())
+
+        wanted = defaultdict(list)
+        rejected = []
+        for reservation_id, event_id, user_id, created_at in records:
+            if reservation_id in ticket_ids:
+                continue
+            if user_id not in known_users or event_id not in known_events:
+                rejected.append((reservation_id, event_id))
+                continue
+            wanted[event_id].append({
+                "reservation_id": reservation_id,
+                "user_id": user_id,
+                "event_id": event_id,
+                "status": TicketStatus.RESERVED,
+                "created_at": datetime.fromisoformat(created_at),
+            })
+
+        rows, sold_out = await self._take_seats(db, wanted)
+        inserted = []
+        if rows:
+            result = await db.execute(
+                insert(Ticket)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=["reservation_id"])
+                .returning(Ticket.id, Ticket.reservation_id, Ticket.event_id)
+            )
+            inserted = result.all()
+            ticket_ids.update({reservation_id: ticket_id for ticket_id, reservation_id, _ in inserted})
+
+        await db.commit()
+
+        if inserted:
+            await event_cache.invalidate_availability({event_id for _, _, event_id in inserted})
+            created_at = {row["reservation_id"]: row["created_at"] for row in rows}
+            await ExpiryScheduler(self.redis).schedule_many(
+                [(ticket_id, created_at[reservation_id]) for ticket_id, reservation_id, _ in inserted]
+            )
+
+        settled = Counter(event_id for _, event_id, _, _ in records)
+        ttl = settings.RESERVATION_STATUS_TTL_SECONDS
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for reservation_id, ticket_id in ticket_ids.items():
+                pipe.set(STATUS_KEY.format(reservation_id=reservation_id), ticket_id, ex=ttl)
+            for reservation_id, event_id in rejected:
+                pipe.set(STATUS_KEY.format(reservation_id=reservation_id), REJECTED, ex=ttl)
+                pipe.incrby(AVAILABLE_KEY.format(event_id=event_id), 1)
+            for reservation_id, event_id in sold_out:
+                pipe.set(STATUS_KEY.format(reservation_id=reservation_id), REJECTED, ex=ttl)
+            # Postgres has no seat left for these events
+            for event_id in {event_id for _, event_id in sold_out}:
+                pipe.set(AVAILABLE_KEY.format(event_id=event_id), 0)
+            for event_id, count in settled.items():
+                pipe.hincrby(PENDING_COUNTS_KEY, str(event_id), -count)
+            pipe.delete(PROCESSING_KEY)
+            await pipe.execute()
+        # Only once the outcomes are stored, so a reservation is never
+        # reported unknown while it is being settled
+        await self._set_max(keys=[SETTLED_KEY], args=[max(record[0] for record in records)])
+
+        return len(records)
+
+    async def _take_seats(
+        self, db: AsyncSession, wanted: Dict[int, List[dict]]
+    ) -> Tuple[List[dict], List[Tuple[int, int]]]:
+        """Claim seats in Postgres for queued reservations, per event in queue order.
+
+        The Redis counter does not see seats sold through the other
+        reservation paths, so capacity is checked again under the event row
+        locks (or claimed from the inventory shards of sharded events).
+        Returns the rows to insert and the ``(reservation_id, event_id)``
+        pairs left without a seat.
+        """
+        if not wanted:
+            return [], []
+        result = await db.execute(
+            select(Event.id, Event.total_tickets, Event.tickets_sold)
+            .where(Event.id.in_(wanted))
+            .order_by(Event.id)
+            .with_for_update()
+        )
+        events = {event_id: (total, sold) for event_id, total, sold in result.all()}
+        inventory = InventoryRepository(db)
+        sharded = await inventory.sold_counts(wanted)
+
+        rows = []
+        sold_out = []
+        sold = Counter()
+        for event_id in sorted(wanted):
+            reservations = wanted[event_id]
+            total, tickets_sold = events[event_id]
+            if event_id in sharded:
+                seats = await self._claim_shards(inventory, event_id, total, len(reservations))
+            else:
+                seats = [None] * max(0, min(len(reservations), total - tickets_sold))
+                sold[event_id] = len(seats)
+            for row, shard_no in zip(reservations, seats):
+                rows.append({**row, "inventory_shard": shard_no})
+            sold_out.extend((row["reservation_id"], event_id) for row in reservations[len(seats):])
+
+        await EventRepository(db).adjust_tickets_sold(sold)
+        return rows, sold_out
+
+    @staticmethod
+    async def _claim_shards(inventory: InventoryRepository, event_id: int, total: int, count: int) -> List[int]:
+        """Up to ``count`` seats from the event's shards; fewer once they fill up"""
+        while count > 0:
+            claimed = await inventory.claim_many(event_id, count)
+            if claimed is not None:
+                return claimed
+            taken = (await inventory.sold_counts([event_id])).get(event_id, total)
+            count = min(count - 1, total - taken)
+        return []
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """Recompute every event counter from the ``tickets`` table.
+
+        Reservations still queued in Redis are counted as taken. Run this
+        while no reservations are being taken, e.g. on start-up after a
+        Redis restart. Returns the number of events loaded.
+        """
+        held = (
+            select(Ticket.event_id, func.count(Ticket.id).label("held"))
+            .where(Ticket.status.in_([TicketStatus.RESERVED, TicketStatus.PAID]))
+            .group_by(Ticket.event_id)
+            .subquery()
+        )
+        result = await db.execute(
+            select(Event.id, Event.total_tickets, func.coalesce(held.c.held, 0))
+            .outerjoin(held, held.c.event_id == Event.id)
+        )
+        events = result.all()
+
+        max_reservation = (await db.execute(select(func.max(Ticket.reservation_id)))).scalar_one() or 0
+        # Outcomes older than the status TTL would have expired anyway
+        ttl = settings.RESERVATION_STATUS_TTL_SECONDS
+        result = await db.execute(
+            select(Ticket.reservation_id, Ticket.id)
+            .where(
+                Ticket.reservation_id.isnot(None),
+                Ticket.created_at >= datetime.now(timezone.utc) - timedelta(seconds=ttl),
+            )
+        )
+        confirmed = result.all()
+
+        pending = await self.redis.hgetall(PENDING_COUNTS_KEY)
+        last_issued = await self.redis.get(SEQ_KEY)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for event_id, total_tickets, taken in events:
+                queued = int(pending.get(str(event_id), 0))
+                pipe.set(AVAILABLE_KEY.format(event_id=event_id), max(total_tickets - taken - queued, 0))
+            for reservation_id, ticket_id in confirmed:
+                pipe.set(STATUS_KEY.format(reservation_id=reservation_id), ticket_id, ex=ttl)
+            pipe.delete(LEGACY_TICKETS_KEY)
+            pipe.set(SEQ_KEY, max(int(last_issued or 0), max_reservation))
+            await pipe.execute()
+        await self._set_max(keys=[SETTLED_KEY], args=[max_reservation])
+
+        return len(events)
+
+    @staticmethod
+    async def _existing_ids(db: AsyncSession, model, ids) -> List[int]:
+        result = await db.execute(select(model.id).where(model.id.in_(list(ids))))
+        return result.scalars().all()
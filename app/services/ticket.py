@@ -1,16 +1,31 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import Integer, String, column, select, update, and_, insert, values
+from sqlalchemy.exc import IntegrityError
+from collections import Counter
 from datetime import datetime, timezone, timedelta
-from app.models import Ticket, Event
+from app.config import get_settings
+from app.models import Ticket, TicketStatus, Event
 from app.repositories.base import BaseRepository
-from typing import Optional, List
+from app.repositories.event import EventRepository
+from app.repositories.inventory import InventoryRepository
+from app.services.event_cache import event_cache
+from app.services.payment_cache import payment_cache
+from typing import Dict, Optional, List, Tuple
+
+settings = get_settings()
 
 class TicketService(BaseRepository[Ticket]):
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, ledger=None):
         super().__init__(Ticket, db)
+        self.inventory = InventoryRepository(db)
+        # Optional ReservationLedger that must get expired seats back
+        self.ledger = ledger
 
     async def create_ticket(self, ticket_data) -> Ticket:
         """Create a new ticket with status 'reserved'"""
+        if settings.INVENTORY_SHARDS > 0:
+            return await self._create_ticket_sharded(ticket_data)
+
         # Check if event exists and has available tickets
         result = await self.db.execute(
             select(Event)
@@ -39,32 +54,287 @@ class TicketService(BaseRepository[Ticket]):
         self.db.add(ticket)
         await self.db.commit()
         await self.db.refresh(ticket)
+        await event_cache.invalidate_availability([ticket.event_id])
         
         return ticket
 
-    async def pay_ticket(self, ticket_id: int, payment_reference: str, paid_at: datetime) -> Ticket:
-        """Mark a ticket as paid"""
+    async def _create_ticket_sharded(self, ticket_data) -> Ticket:
+        """Reserve a seat from the event's inventory shards.
+
+        The event row is only locked the first time an event is sold in
+        sharded mode, to lay out its shards. ``Event.tickets_sold`` is brought
+        up to date by the inventory reconcile task.
+        """
+        shard_no = await self.inventory.claim(ticket_data.event_id)
+        
+        if shard_no is None and not await self.inventory.has_shards(ticket_data.event_id):
+            result = await self.db.execute(
+                select(Event)
+                .where(Event.id == ticket_data.event_id)
+                .with_for_update()
+            )
+            event = result.scalar_one_or_none()
+            
+            if not event:
+                raise ValueError("Event not found")
+            
+            await self.inventory.create_shards(event, settings.INVENTORY_SHARDS)
+            shard_no = await self.inventory.claim(ticket_data.event_id)
+        
+        if shard_no is None:
+            await self.db.rollback()
+            raise ValueError("No tickets available for this event")
+        
+        ticket = Ticket(
+            user_id=ticket_data.user_id,
+            event_id=ticket_data.event_id,
+            status='reserved',
+            created_at=datetime.now(timezone.utc),
+            inventory_shard=shard_no
+        )
+        
+        self.db.add(ticket)
+        await self.db.commit()
+        await self.db.refresh(ticket)
+        await event_cache.invalidate_availability([ticket.event_id])
+        
+        return ticket
+
+    async def create_tickets_bulk(self, user_id: int, quantities: Dict[int, int]) -> List[Ticket]:
+        """Reserve tickets for several events in one transaction, all or nothing
+        
+        ``quantities`` maps event id to the number of seats. Events are locked
+        in id order so overlapping bulk purchases cannot deadlock; the tickets
+        go in with one multi-row insert.
+        """
+        quantities = {event_id: count for event_id, count in quantities.items() if count > 0}
+        if not quantities:
+            raise ValueError("No tickets requested")
+        if sum(quantities.values()) > settings.BULK_RESERVATION_MAX_TICKETS:
+            raise ValueError(
+                f"Cannot reserve more than {settings.BULK_RESERVATION_MAX_TICKETS} tickets at once"
+            )
+        
+        try:
+            if settings.INVENTORY_SHARDS > 0:
+                seats = await self._claim_seats_sharded(quantities)
+            else:
+                seats = await self._claim_seats(quantities)
+            
+            created_at = datetime.now(timezone.utc)
+            result = await self.db.scalars(
+                insert(Ticket).returning(Ticket),
+                [
+                    {
+                        "user_id": user_id,
+                        "event_id": event_id,
+                        "status": TicketStatus.RESERVED,
+                        "created_at": created_at,
+                        "inventory_shard": shard_no,
+                    }
+                    for event_id in sorted(seats)
+                    for shard_no in seats[event_id]
+                ]
+            )
+            tickets = result.all()
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        
+        await event_cache.invalidate_availability(quantities)
+        return tickets
+
+    async def _claim_seats(self, quantities: Dict[int, int]) -> Dict[int, List[Optional[int]]]:
+        """Check and take seats on the event rows; one counter update for all events"""
         result = await self.db.execute(
-            select(Ticket)
-            .where(Ticket.id == ticket_id)
+            select(Event.id, Event.total_tickets - Event.tickets_sold)
+            .where(Event.id.in_(quantities))
+            .order_by(Event.id)
             .with_for_update()
         )
-        ticket = result.scalar_one_or_none()
+        available = dict(result.all())
+        
+        for event_id in sorted(quantities):
+            if event_id not in available:
+                raise ValueError(f"Event {event_id} not found")
+            if available[event_id] < quantities[event_id]:
+                raise ValueError(f"Not enough tickets available for event {event_id}")
+        
+        await EventRepository(self.db).adjust_tickets_sold(quantities)
+        return {event_id: [None] * count for event_id, count in quantities.items()}
+
+    async def _claim_seats_sharded(self, quantities: Dict[int, int]) -> Dict[int, List[Optional[int]]]:
+        """Take seats from each event's inventory shards, events in id order"""
+        seats = {}
+        for event_id in sorted(quantities):
+            claimed = await self.inventory.claim_many(event_id, quantities[event_id])
+            
+            if claimed is None and not await self.inventory.has_shards(event_id):
+                result = await self.db.execute(
+                    select(Event)
+                    .where(Event.id == event_id)
+                    .with_for_update()
+                )
+                event = result.scalar_one_or_none()
+                
+                if not event:
+                    raise ValueError(f"Event {event_id} not found")
+                
+                await self.inventory.create_shards(event, settings.INVENTORY_SHARDS)
+                claimed = await self.inventory.claim_many(event_id, quantities[event_id])
+            
+            if claimed is None:
+                raise ValueError(f"Not enough tickets available for event {event_id}")
+            seats[event_id] = claimed
+        return seats
+
+    async def pay_ticket(self, ticket_id: int, payment_reference: str, paid_at: datetime) -> Ticket:
+        """Mark a ticket as paid
         
-        if not ticket:
-            raise ValueError("Ticket not found")
+        Idempotent on ``payment_reference``: repeating a confirmation returns
+        the paid ticket, from the payment cache when possible. The status
+        change is one conditional UPDATE, so no row lock is held in between.
+        """
+        cached = await payment_cache.get(payment_reference)
+        if cached is not None:
+            if cached["id"] != ticket_id:
+                raise ValueError("Payment reference already used for another ticket")
+            return payment_cache.to_ticket(cached)
         
-        if ticket.status != 'reserved':
-            raise ValueError(f"Cannot pay for ticket with status: {ticket.status}")
+        try:
+            result = await self.db.scalars(
+                update(Ticket)
+                .where(Ticket.id == ticket_id, Ticket.status == TicketStatus.RESERVED)
+                .values(status=TicketStatus.PAID, payment_reference=payment_reference, paid_at=paid_at)
+                .returning(Ticket)
+                .execution_options(populate_existing=True)
+            )
+            ticket = result.one_or_none()
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise ValueError("Payment reference already used for another ticket")
         
-        ticket.status = 'paid'
-        ticket.payment_reference = payment_reference
-        ticket.paid_at = paid_at
+        if ticket is None:
+            ticket = await self.get_ticket_by_id(ticket_id)
+            if not ticket:
+                raise ValueError("Ticket not found")
+            if ticket.status != TicketStatus.PAID or ticket.payment_reference != payment_reference:
+                raise ValueError(f"Cannot pay for ticket with status: {ticket.status}")
         
-        await self.db.commit()
-        await self.db.refresh(ticket)
+        await payment_cache.store([ticket])
         return ticket
 
+    async def pay_tickets(self, payments: List[Tuple[int, str]], paid_at: datetime) -> List[dict]:
+        """Confirm a batch of ``(ticket_id, payment_reference)`` pairs, e.g. a reconciliation file
+        
+        Every pair gets an outcome: ``paid``, ``already_paid`` or ``rejected``
+        with the reason. New payments go in with one UPDATE for the batch.
+        """
+        if len(payments) > settings.PAYMENT_BATCH_MAX_SIZE:
+            raise ValueError(f"Cannot confirm more than {settings.PAYMENT_BATCH_MAX_SIZE} payments at once")
+        
+        # Outcomes are keyed by line, so a ticket repeated in the batch keeps
+        # its first line's outcome and the later lines are rejected
+        outcomes = {}
+        lines = {}
+        pending = {}
+        seen_references = set()
+        for index, (ticket_id, payment_reference) in enumerate(payments):
+            if ticket_id in lines or payment_reference in seen_references:
+                outcomes[index] = self._rejected("Duplicate ticket or payment reference in batch")
+                continue
+            seen_references.add(payment_reference)
+            lines[ticket_id] = index
+            pending[ticket_id] = payment_reference
+        
+        cached = await payment_cache.get_many(pending.values())
+        known = dict(cached)
+        missing = [reference for reference in pending.values() if reference not in cached]
+        if missing:
+            result = await self.db.execute(
+                select(Ticket).where(Ticket.payment_reference.in_(missing))
+            )
+            for ticket in result.scalars():
+                known[ticket.payment_reference] = payment_cache.snapshot(ticket)
+        
+        for ticket_id, payment_reference in list(pending.items()):
+            paid = known.get(payment_reference)
+            if paid is None:
+                continue
+            del pending[ticket_id]
+            if paid["id"] == ticket_id:
+                outcomes[lines[ticket_id]] = {"status": "already_paid", "ticket": payment_cache.to_ticket(paid)}
+            else:
+                outcomes[lines[ticket_id]] = self._rejected("Payment reference already used for another ticket")
+        
+        if pending:
+            confirmed = values(
+                column("id", Integer),
+                column("payment_reference", String),
+                name="confirmed",
+            ).data(sorted(pending.items()))
+            try:
+                result = await self.db.scalars(
+                    update(Ticket)
+                    .where(
+                        Ticket.id == confirmed.c.id,
+                        Ticket.status == TicketStatus.RESERVED
+                    )
+                    .values(
+                        status=TicketStatus.PAID,
+                        payment_reference=confirmed.c.payment_reference,
+                        paid_at=paid_at
+                    )
+                    .returning(Ticket)
+                    .execution_options(populate_existing=True, synchronize_session=False)
+                )
+                paid_tickets = result.all()
+                await self.db.commit()
+            except IntegrityError:
+                # A reference was taken concurrently; settle the pairs one by one
+                await self.db.rollback()
+                for ticket_id, payment_reference in pending.items():
+                    outcomes[lines[ticket_id]] = await self._pay_one(ticket_id, payment_reference, paid_at)
+                pending = {}
+                paid_tickets = []
+            
+            await payment_cache.store(paid_tickets)
+            for ticket in paid_tickets:
+                del pending[ticket.id]
+                outcomes[lines[ticket.id]] = {"status": "paid", "ticket": ticket}
+        
+        if pending:
+            result = await self.db.execute(
+                select(Ticket.id, Ticket.status).where(Ticket.id.in_(pending))
+            )
+            statuses = dict(result.all())
+            for ticket_id in pending:
+                if ticket_id not in statuses:
+                    outcomes[lines[ticket_id]] = self._rejected("Ticket not found")
+                else:
+                    outcomes[lines[ticket_id]] = self._rejected(
+                        f"Cannot pay for ticket with status: {statuses[ticket_id]}"
+                    )
+        
+        return [
+            {"ticket_id": ticket_id, "payment_reference": payment_reference, **outcomes[index]}
+            for index, (ticket_id, payment_reference) in enumerate(payments)
+        ]
+
+    async def _pay_one(self, ticket_id: int, payment_reference: str, paid_at: datetime) -> dict:
+        try:
+            ticket = await self.pay_ticket(ticket_id, payment_reference, paid_at)
+        except ValueError as e:
+            return self._rejected(str(e))
+        status = "paid" if ticket.paid_at == paid_at else "already_paid"
+        return {"status": status, "ticket": ticket}
+
+    @staticmethod
+    def _rejected(detail: str) -> dict:
+        return {"status": "rejected", "detail": detail}
+
     async def get_ticket_by_id(self, ticket_id: int) -> Optional[Ticket]:
         """Get a ticket by its ID"""
         result = await self.db.execute(
@@ -82,38 +352,77 @@ class TicketService(BaseRepository[Ticket]):
         )
         return result.scalars().all()
     
-    async def expire_old_tickets(self) -> int:
-        """Expire tickets that haven't been paid for"""
-        result = await self.db.execute(
-            select(Ticket)
+    async def expire_old_tickets(self, batch_size: Optional[int] = None) -> int:
+        """Expire tickets that haven't been paid for
+        
+        Works through the backlog in batches of ``batch_size`` tickets, each in
+        its own short transaction. Rows locked by another worker are skipped,
+        so several beat workers can share one backlog.
+        """
+        batch_size = batch_size or settings.EXPIRY_BATCH_SIZE
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=settings.TICKET_EXPIRATION_MINUTES)
+        
+        expired_count = 0
+        while True:
+            batch_count = await self._expire_batch(Ticket.created_at < cutoff, batch_size)
+            expired_count += batch_count
+            if batch_count < batch_size:
+                return expired_count
+    
+    async def expire_tickets(self, ticket_ids: List[int]) -> int:
+        """Expire the given tickets if they are still reserved"""
+        if not ticket_ids:
+            return 0
+        return await self._expire_batch(Ticket.id.in_(ticket_ids), len(ticket_ids))
+    
+    async def _expire_batch(self, criterion, batch_size: int) -> int:
+        """Expire one batch of stale reservations and give their seats back"""
+        stale = (
+            select(Ticket.id)
             .where(
                 and_(
-                    Ticket.status == 'reserved',
-                    Ticket.created_at < datetime.now(timezone.utc) - timedelta(minutes=2)
+                    Ticket.status == TicketStatus.RESERVED,
+                    criterion
                 )
             )
-            .with_for_update()
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("stale_tickets")
         )
+        result = await self.db.execute(
+            update(Ticket)
+            .where(Ticket.id == stale.c.id)
+            .values(status=TicketStatus.EXPIRED)
+            .returning(Ticket.event_id, Ticket.inventory_shard)
+            .execution_options(synchronize_session=False)
+        )
+        expired = result.all()
         
-        tickets = result.scalars().all()
-        expired_count = 0
+        released = Counter()
+        released_shards = Counter()
+        for event_id, shard_no in expired:
+            if shard_no is None:
+                released[event_id] += 1
+            else:
+                # Sharded seats go back to their shard; reconcile updates the event
+                released_shards[(event_id, shard_no)] += 1
         
-        for ticket in tickets:
-            # Get the associated event to update available tickets
-            event_result = await self.db.execute(
-                select(Event)
-                .where(Event.id == ticket.event_id)
-                .with_for_update()
-            )
-            event = event_result.scalar_one_or_none()
-            
-            if event:
-                event.tickets_sold -= 1
-            
-            ticket.status = 'expired'
-            expired_count += 1
+        await EventRepository(self.db).adjust_tickets_sold(
+            {event_id: -count for event_id, count in released.items()}
+        )
+        await self.inventory.release_many(released_shards)
+        await self.db.commit()
+        await event_cache.invalidate_availability(released)
         
-        if expired_count > 0:
-            await self.db.commit()
+        if self.ledger is not None:
+            for event_id, count in released.items():
+                await self.ledger.release(event_id, count)
         
-        return expired_count
\ No newline at end of file
+        return len(expired)
+
+    async def reconcile_inventory(self) -> int:
+        """Sync ``Event.tickets_sold`` with the sharded inventory counters"""
+        updated = await self.inventory.reconcile()
+        await self.db.commit()
+        await event_cache.invalidate_availability(updated)
+        return len(updated)
\ No newline at end of file
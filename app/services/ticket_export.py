@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterable, List, Sequence
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import get_settings
+from app.models import Ticket
+from app.repositories.ticket import EXPORT_COLUMNS, TicketRepository
+
+settings = get_settings()
+
+FIELDS = [column.key for column in EXPORT_COLUMNS]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _values(row: Sequence) -> List:
+    values = list(row)
+    for index, value in enumerate(values):
+        if hasattr(value, "isoformat"):
+            values[index] = value.isoformat()
+        elif hasattr(value, "value"):
+            values[index] = value.value
+    return values
+
+
+def ndjson_chunk(rows: Iterable[Sequence]) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(FIELDS, _values(row)))) + "\n" for row in rows
+    ).encode()
+
+
+def csv_chunk(rows: Iterable[Sequence], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(FIELDS)
+    writer.writerows(_values(row) for row in rows)
+    return buffer.getvalue().encode()
+
+
+class TicketExporter:
+    """Streams ticket lists as NDJSON or CSV chunks as rows arrive.
+
+    Each export opens its own session: a streaming response body is sent
+    after the request's dependencies have been torn down, so the request
+    session cannot be used.
+    """
+
+    def __init__(self, sessions: async_sessionmaker, chunk_size: int = None):
+        self.sessions = sessions
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_ROWS
+
+    def for_user(self, user_id: int, fmt: str) -> AsyncIterator[bytes]:
+        return self.export(fmt, Ticket.user_id == user_id)
+
+    def for_event(self, event_id: int, fmt: str) -> AsyncIterator[bytes]:
+        return self.export(fmt, Ticket.event_id == event_id)
+
+    async def export(self, fmt: str, *criteria) -> AsyncIterator[bytes]:
+        if fmt not in MEDIA_TYPES:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        if fmt == "csv":
+            yield csv_chunk([], header=True)
+        async with self.sessions() as db:
+            result = await TicketRepository(db).stream_rows(*criteria, chunk_size=self.chunk_size)
+            async for rows in result.partitions():
+                yield csv_chunk(rows) if fmt == "csv" else ndjson_chunk(rows)
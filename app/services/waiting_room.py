@@ -0,0 +1,269 @@
+import base64
+import hashlib
+import hmac
+import math
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+import redis.asyncio as redis
+
+from app.config import get_settings
+from app.services.auth import SECRET_KEY
+
+settings = get_settings()
+
+SEQ_KEY = "waiting:event:{event_id}:seq"
+STATE_KEY = "waiting:event:{event_id}:state"
+USED_KEY = "waiting:event:{event_id}:used:{position}"
+ROOMS_KEY = "waiting:rooms"
+
+# Advance the admitted head by ``rate`` positions per second since the last
+# call, then optionally hand out the next position. Capacity is not banked
+# while nobody is waiting. Returns {position or 0, head, issued, rate}.
+ADVANCE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[2], 'head', 'last', 'rate')
+local rate = tonumber(state[3])
+if not rate then return {0, 0, 0, 0} end
+local head = tonumber(state[1]) or 0
+local last = tonumber(state[2]) or now
+local issued = tonumber(redis.call('GET', KEYS[1]) or '0')
+local released = math.floor((now - last) * rate)
+if released > 0 then
+    head = math.min(head + released, issued)
+    last = last + released / rate
+end
+if head >= issued then last = now end
+local position = 0
+if ARGV[2] == '1' then
+    position = redis.call('INCR', KEYS[1])
+    issued = position
+end
+redis.call('HSET', KEYS[2], 'head', head, 'last', tostring(last))
+return {position, head, issued, tostring(rate)}
+"""
+
+# Mark every admission token of a reservation used, or none of them if one
+# already is. Returns 0, or the 1-based index of the key already taken.
+CONSUME_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then return i end
+end
+for _, key in ipairs(KEYS) do
+    redis.call('SET', key, 1, 'EX', ARGV[1])
+end
+return 0
+"""
+
+
+class NotAdmitted(Exception):
+    """The caller may not use the reservation path for this event (yet)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class EventQueueMetrics:
+    """In-process counters for one event's waiting room"""
+
+    def __init__(self, samples: int = 1000):
+        self.joined = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.waits = deque(maxlen=samples)
+        self.admitted_at = deque(maxlen=samples)
+
+    def stats(self, window: float = 60.0) -> dict:
+        now = time.monotonic()
+        recent = sum(1 for at in self.admitted_at if now - at <= window)
+        waits = sorted(self.waits)
+
+        def percentile(pct: float) -> float:
+            if not waits:
+                return 0.0
+            index = max(0, min(len(waits) - 1, int(round(pct / 100.0 * len(waits))) - 1))
+            return round(waits[index], 3)
+
+        return {
+            "joined": self.joined,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "admission_rate_per_second": round(recent / window, 3),
+            "wait_seconds": {"p50": percentile(50), "p95": percentile(95), "max": percentile(100)},
+        }
+
+
+class WaitingRoom:
+    """FIFO admission queue in front of the reservation path during on-sales.
+
+    A room is opened per event with a release rate. Clients join and get a
+    signed token holding their position; positions up to the admitted head
+    (which moves forward ``rate`` per second) may reserve, once per token.
+    Events without an open room are not gated.
+    """
+
+    def __init__(self, client: redis.Redis, metrics: Optional[Dict[int, EventQueueMetrics]] = None):
+        self.redis = client
+        self.metrics = waiting_room_metrics if metrics is None else metrics
+        self._advance = client.register_script(ADVANCE_SCRIPT)
+        self._consume = client.register_script(CONSUME_SCRIPT)
+
+    def _metrics(self, event_id: int) -> EventQueueMetrics:
+        return self.metrics.setdefault(event_id, EventQueueMetrics())
+
+    async def open(self, event_id: int, rate: float) -> None:
+        """Gate an event, admitting ``rate`` queued clients per second"""
+        # Settle admissions made at the old rate before switching
+        await self._run(event_id, join=False)
+        await self.redis.hset(STATE_KEY.format(event_id=event_id), "rate", rate)
+        await self.redis.sadd(ROOMS_KEY, event_id)
+
+    async def close(self, event_id: int) -> None:
+        """Stop gating an event; positions keep counting up if it is reopened"""
+        await self.redis.hdel(STATE_KEY.format(event_id=event_id), "rate")
+        await self.redis.srem(ROOMS_KEY, event_id)
+
+    async def _run(self, event_id: int, join: bool) -> List:
+        position, head, issued, rate = await self._advance(
+            keys=[SEQ_KEY.format(event_id=event_id), STATE_KEY.format(event_id=event_id)],
+            args=[repr(time.time()), "1" if join else "0"],
+        )
+        return [int(position), int(head), int(issued), float(rate)]
+
+    async def join(self, event_id: int) -> dict:
+        """Take the next place in the queue"""
+        position, head, issued, rate = await self._run(event_id, join=True)
+        if not rate:
+            raise ValueError("No waiting room is open for this event")
+        self._metrics(event_id).joined += 1
+        token = self._sign(event_id, position, time.time())
+        return self._place(event_id, position, head, rate, token)
+
+    async def status(self, event_id: int, token: str) -> dict:
+        """Where a token stands in the queue"""
+        position, issued_at = self._verify(event_id, token)
+        _, head, _, rate = await self._run(event_id, join=False)
+        if not rate:
+            raise ValueError("No waiting room is open for this event")
+        return self._place(event_id, position, head, rate, token)
+
+    @staticmethod
+    def _place(event_id: int, position: int, head: int, rate: float, token: str) -> dict:
+        ahead = max(position - head, 0)
+        return {
+            "event_id": event_id,
+            "token": token,
+            "position": position,
+            "ahead": ahead,
+            "admitted": ahead == 0,
+            "estimated_wait_seconds": round(ahead / rate, 1) if rate else 0.0,
+        }
+
+    async def admit(self, event_ids: Iterable[int], tokens: Iterable[str]) -> List[str]:
+        """Check that every gated event has an admitted, unused token.
+
+        All tokens are verified before any is consumed, then consumed
+        together. Returns the used-token keys to hand to ``release`` if the
+        reservation fails. Raises ``NotAdmitted`` otherwise.
+        """
+        event_ids = sorted(set(event_ids))
+        gated = [
+            event_id for event_id, is_open in zip(
+                event_ids, await self.redis.smismember(ROOMS_KEY, event_ids)
+            ) if is_open
+        ] if event_ids else []
+        if not gated:
+            return []
+
+        by_event = {}
+        for token in tokens:
+            event_id = self._token_event(token)
+            if event_id is not None:
+                by_event[event_id] = token
+
+        admitted = {}
+        for event_id in gated:
+            metrics = self._metrics(event_id)
+            token = by_event.get(event_id)
+            if token is None:
+                metrics.rejected += 1
+                raise NotAdmitted(f"Join the waiting room for event {event_id} first")
+            try:
+                position, issued_at = self._verify(event_id, token)
+            except ValueError as e:
+                metrics.rejected += 1
+                raise NotAdmitted(str(e))
+            _, head, _, rate = await self._run(event_id, join=False)
+            if rate and position > head:
+                metrics.rejected += 1
+                raise NotAdmitted(
+                    "Not admitted yet", retry_after=math.ceil((position - head) / rate)
+                )
+            admitted[USED_KEY.format(event_id=event_id, position=position)] = (event_id, issued_at)
+
+        used = list(admitted)
+        taken = int(await self._consume(keys=used, args=[settings.WAITING_ROOM_TOKEN_TTL_SECONDS]))
+        if taken:
+            self._metrics(admitted[used[taken - 1]][0]).rejected += 1
+            raise NotAdmitted("Admission token already used")
+        for event_id, issued_at in admitted.values():
+            metrics = self._metrics(event_id)
+            metrics.admitted += 1
+            metrics.admitted_at.append(time.monotonic())
+            metrics.waits.append(time.time() - issued_at)
+        return used
+
+    async def release(self, used: List[str]) -> None:
+        """Make tokens usable again after the reservation they admitted failed"""
+        if used:
+            await self.redis.delete(*used)
+
+    async def depths(self) -> Dict[int, dict]:
+        """Queue depth and rate of every open room"""
+        rooms = {}
+        for event_id in sorted(int(event_id) for event_id in await self.redis.smembers(ROOMS_KEY)):
+            _, head, issued, rate = await self._run(event_id, join=False)
+            rooms[event_id] = {"rate": rate, "issued": issued, "admitted_head": head, "depth": issued - head}
+        return rooms
+
+    @staticmethod
+    def _signature(payload: str) -> str:
+        return hmac.new(SECRET_KEY.encode(), payload.encode(), hashlib.sha256).hexdigest()[:32]
+
+    def _sign(self, event_id: int, position: int, issued_at: float) -> str:
+        payload = f"{event_id}.{position}.{int(issued_at * 1000)}"
+        raw = f"{payload}.{self._signature(payload)}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode(token: str) -> List[str]:
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        except (ValueError, UnicodeDecodeError):
+            return []
+        return raw.split(".")
+
+    def _token_event(self, token: str) -> Optional[int]:
+        parts = self._decode(token.strip())
+        return int(parts[0]) if len(parts) == 4 and parts[0].isdigit() else None
+
+    def _verify(self, event_id: int, token: str):
+        """Return ``(position, issued_at)`` of a valid token for ``event_id``"""
+        parts = self._decode(token.strip())
+        if len(parts) != 4:
+            raise ValueError("Invalid admission token")
+        payload = ".".join(parts[:3])
+        if not hmac.compare_digest(parts[3], self._signature(payload)):
+            raise ValueError("Invalid admission token")
+        token_event, position, issued_at = int(parts[0]), int(parts[1]), int(parts[2]) / 1000
+        if token_event != event_id:
+            raise ValueError("Admission token is for another event")
+        if time.time() - issued_at > settings.WAITING_ROOM_TOKEN_TTL_SECONDS:
+            raise ValueError("Admission token expired")
+        return position, issued_at
+
+
+# Per-event metrics of this process
+waiting_room_metrics: Dict[int, EventQueueMetrics] = {}
@@ -0,0 +1,68 @@
+"""Requests/sec on ``GET /api/v1/auth/me`` with and without the principal cache.
+
+Drives the ASGI app in-process through httpx, so the numbers cover routing,
+token decoding and the user lookup but not socket overhead.
+
+    python -m benchmarks.bench_auth_me --requests 5000 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+from httpx import AsyncClient
+
+from app.api.deps import get_db
+from app.config import get_settings
+from app.main import app
+from app.models import User
+from app.services.auth import AuthService, principal_cache
+from benchmarks.common import create_bench_engine, emit, run_concurrently, session_factory, summarize
+
+
+async def seed_token(sessions) -> str:
+    async with sessions() as db:
+        user = User(name="Bench User", email=f"bench-{time.time_ns()}@example.com", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        return AuthService(db).create_access_token({"sub": user.email})
+
+
+async def run_mode(client: AsyncClient, headers: dict, cached: bool, requests: int, concurrency: int) -> dict:
+    get_settings().PRINCIPAL_CACHE_ENABLED = cached
+    principal_cache.clear()
+
+    async def me(_):
+        response = await client.get("/api/v1/auth/me", headers=headers)
+        response.raise_for_status()
+
+    start = time.perf_counter()
+    latencies = await run_concurrently(me, concurrency, requests)
+    wall = time.perf_counter() - start
+    return summarize("auth.me", latencies, wall,
+                     principal_cache=cached, requests=requests, concurrency=concurrency)
+
+
+async def main(args):
+    engine = await create_bench_engine(pool_size=args.concurrency)
+    sessions = session_factory(engine)
+
+    async def bench_get_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = bench_get_db
+    try:
+        headers = {"Authorization": f"Bearer {await seed_token(sessions)}"}
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+            for cached in (False, True):
+                emit(await run_mode(client, headers, cached, args.requests, args.concurrency))
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,140 @@
+"""Bulk import throughput: EventService.create_event per row vs COPY import.
+
+Writes ``--rows`` generated events to a CSV file, then loads them with the
+ORM path (one insert, commit and refresh per event, capped at
+``--orm-max`` rows) and with ``BulkImporter`` at each ``--batch-rows`` and
+``--workers`` (capped at one less than the CPU count).
+Tickets for the imported events are loaded the same way afterwards. The
+Redis cache tier is disabled.
+
+    python -m benchmarks.bench_bulk_import --rows 1000000 --batch-rows 5000 20000 --workers 0 4
+"""
+import argparse
+import asyncio
+import csv
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from app.cache import registered_caches
+from app.models import Event, User
+from app.schemas.event import EventCreate
+from app.services.bulk_import import BulkImporter, asyncpg_dsn
+from app.services.event import EventService
+from benchmarks.common import bench_database_url, create_bench_engine, emit, session_factory
+
+EVENT_COLUMNS = ["title", "description", "start_time", "end_time", "total_tickets", "venue_address", "latitude", "longitude"]
+
+
+def write_events(path: str, rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(EVENT_COLUMNS)
+        for n in range(rows):
+            starts = start + timedelta(hours=rng.randrange(24 * 365))
+            writer.writerow([
+                f"Import bench {n}", "", starts.isoformat(), (starts + timedelta(hours=3)).isoformat(),
+                rng.randrange(100, 5000), f"Venue {n}", rng.uniform(5.5, 7.5), rng.uniform(2.5, 4.5),
+            ])
+
+
+def write_tickets(path: str, rows: int, user_id: int, event_ids, seed: int) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["user_id", "event_id", "status"])
+        for _ in range(rows):
+            writer.writerow([user_id, rng.choice(event_ids), rng.choice(("paid", "paid", "expired"))])
+
+
+async def orm_import(sessions, path: str, rows: int) -> float:
+    with open(path, newline="") as handle:
+        records = [record for _, record in zip(range(rows), csv.DictReader(handle))]
+    start = time.perf_counter()
+    for record in records:
+        async with sessions() as db:
+            await EventService(db).create_event(EventCreate(
+                title=record["title"],
+                start_time=record["start_time"],
+                end_time=record["end_time"],
+                total_tickets=record["total_tickets"],
+                venue={"address": record["venue_address"], "latitude": record["latitude"], "longitude": record["longitude"]},
+            ))
+    return time.perf_counter() - start
+
+
+def throughput(name: str, rows: int, wall: float, **params) -> dict:
+    return {
+        "benchmark": name,
+        "params": params,
+        "rows": rows,
+        "wall_seconds": round(wall, 4),
+        "rows_per_second": round(rows / wall, 2) if wall else 0.0,
+    }
+
+
+async def main(args):
+    for cache in registered_caches():
+        cache.use_redis(None)
+    engine = await create_bench_engine(pool_size=2)
+    sessions = session_factory(engine)
+    workdir = tempfile.mkdtemp(prefix="bench-import-")
+    events_path = os.path.join(workdir, "events.csv")
+    tickets_path = os.path.join(workdir, "tickets.csv")
+    try:
+        write_events(events_path, args.rows, args.seed)
+
+        orm_rows = min(args.rows, args.orm_max)
+        wall = await orm_import(sessions, events_path, orm_rows)
+        emit(throughput("bulk_import.events", orm_rows, wall, mode="orm_create_event"))
+
+        for batch_rows in args.batch_rows:
+            for workers in args.workers:
+                importer = BulkImporter(
+                    dsn=asyncpg_dsn(bench_database_url()), batch_rows=batch_rows, workers=workers,
+                    progress=lambda p: None,
+                )
+                start = time.perf_counter()
+                progress = await importer.run("events", events_path, restart=True)
+                emit(throughput("bulk_import.events", progress.loaded, time.perf_counter() - start,
+                                mode="copy", batch_rows=batch_rows, workers=importer.workers))
+
+        async with sessions() as db:
+            user = User(name="Import Bench", email=f"bench-import-{time.time_ns()}@example.com", hashed_password="x")
+            db.add(user)
+            await db.commit()
+            event_ids = (await db.execute(
+                select(Event.id).where(Event.title.like("Import bench %")).order_by(func.random()).limit(10000)
+            )).scalars().all()
+        write_tickets(tickets_path, args.tickets, user.id, event_ids, args.seed)
+        importer = BulkImporter(
+            dsn=asyncpg_dsn(bench_database_url()), batch_rows=max(args.batch_rows), workers=max(args.workers),
+            progress=lambda p: None,
+        )
+        start = time.perf_counter()
+        progress = await importer.run("tickets", tickets_path, restart=True)
+        emit(throughput("bulk_import.tickets", progress.loaded, time.perf_counter() - start,
+                        mode="copy", batch_rows=max(args.batch_rows), workers=importer.workers))
+    finally:
+        for path in (events_path, tickets_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(workdir)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--orm-max", type=int, default=5000)
+    parser.add_argument("--batch-rows", type=int, nargs="+", default=[5000, 20000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4])
+    parser.add_argument("--tickets", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
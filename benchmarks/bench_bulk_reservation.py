@@ -0,0 +1,60 @@
+"""Group purchases: N sequential single-ticket reservations vs one bulk reservation.
+
+Each group buys ``--group-size`` seats for the same event, the way a party
+books together; several groups run concurrently.
+
+    python -m benchmarks.bench_bulk_reservation --groups 500 --group-size 8 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+from app.config import get_settings
+from app.schemas.ticket import TicketCreate
+from app.services.ticket import TicketService
+from benchmarks.bench_inventory import seed
+from benchmarks.common import create_bench_engine, emit, run_concurrently, session_factory, summarize
+
+
+async def run_mode(sessions, mode: str, args) -> dict:
+    user_id, event_id = await seed(sessions, total_tickets=args.groups * args.group_size)
+    ticket_data = TicketCreate(user_id=user_id, event_id=event_id)
+
+    async def sequential(_):
+        for _ in range(args.group_size):
+            async with sessions() as db:
+                await TicketService(db).create_ticket(ticket_data)
+
+    async def bulk(_):
+        async with sessions() as db:
+            await TicketService(db).create_tickets_bulk(user_id, {event_id: args.group_size})
+
+    start = time.perf_counter()
+    latencies = await run_concurrently(
+        sequential if mode == "sequential" else bulk, args.concurrency, args.groups
+    )
+    wall = time.perf_counter() - start
+    result = summarize("bulk_reservation.group", latencies, wall, mode=mode, groups=args.groups,
+                       group_size=args.group_size, concurrency=args.concurrency)
+    result["tickets_per_second"] = round(len(latencies) * args.group_size / wall, 2) if wall else 0.0
+    return result
+
+
+async def main(args):
+    get_settings().INVENTORY_SHARDS = 0
+    get_settings().BULK_RESERVATION_MAX_TICKETS = max(args.group_size, 1)
+    engine = await create_bench_engine(pool_size=args.concurrency)
+    sessions = session_factory(engine)
+    try:
+        for mode in ("sequential", "bulk"):
+            emit(await run_mode(sessions, mode, args))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", type=int, default=500)
+    parser.add_argument("--group-size", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
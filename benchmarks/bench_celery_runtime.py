@@ -0,0 +1,76 @@
+"""Celery task throughput: fresh engine and loop per task vs the shared worker runtime.
+
+Calls the expiry task body in-process, the way a worker pool thread would,
+for a ticket id that does not exist so the cost measured is the task
+plumbing (loop, pool, connection, handshake) rather than the expiry work.
+
+    python -m benchmarks.bench_celery_runtime --tasks 2000 --threads 16
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.celery_app.runtime import runtime
+from app.config import get_settings
+from app.celery_app.tasks import expire_ticket
+from app.services.ticket import TicketService
+from benchmarks.common import bench_database_url, emit, summarize
+
+MISSING_TICKET_ID = -1
+
+
+def per_task_engine_expire_ticket(ticket_id: int):
+    """What every task used to do: new engine, new loop, then tear both down."""
+    async def expire():
+        engine = create_async_engine(bench_database_url())
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                return await TicketService(db).expire_tickets([ticket_id]) == 1
+        finally:
+            await engine.dispose()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(expire())
+    finally:
+        loop.close()
+
+
+def run(task, tasks: int, threads: int):
+    latencies = []
+
+    def call(_):
+        start = time.perf_counter()
+        task(MISSING_TICKET_ID)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(tasks)))
+    return latencies, time.perf_counter() - start
+
+
+def main(args):
+    # The runtime builds its engine from settings
+    get_settings().DATABASE_URL = bench_database_url()
+    latencies, wall = run(per_task_engine_expire_ticket, args.tasks, args.threads)
+    emit(summarize("celery.expire_ticket", latencies, wall,
+                   mode="engine_per_task", tasks=args.tasks, threads=args.threads))
+
+    runtime.start()
+    try:
+        latencies, wall = run(expire_ticket, args.tasks, args.threads)
+    finally:
+        runtime.stop()
+    emit(summarize("celery.expire_ticket", latencies, wall,
+                   mode="shared_runtime", tasks=args.tasks, threads=args.threads))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    main(parser.parse_args())
@@ -0,0 +1,66 @@
+"""Event response serialization: per-row ``to_shape`` vs the vectorized serializer.
+
+Pure CPU benchmark over in-memory ``Event`` objects; no database needed.
+
+    python -m benchmarks.bench_event_serializer --events 100 1000 10000 --repeat 20
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+
+from geoalchemy2.shape import from_shape, to_shape
+from shapely.geometry import Point
+
+from app.models import Event
+from app.schemas.event import EventResponse
+from app.services.event_serializer import events_to_responses
+from benchmarks.common import emit, summarize
+
+
+def make_events(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        Event(
+            id=i, title=f"Event {i}", description=None, start_time=now, end_time=now,
+            total_tickets=100, tickets_sold=10, venue_address="Bench Arena",
+            venue_location=from_shape(Point(random.uniform(-180, 180), random.uniform(-90, 90)), srid=4326),
+        )
+        for i in range(count)
+    ]
+
+
+def per_row(events):
+    """The conversion loop the services used to repeat"""
+    responses = []
+    for event in events:
+        shape = to_shape(event.venue_location)
+        responses.append(EventResponse(
+            id=event.id, title=event.title, description=event.description,
+            start_time=event.start_time, end_time=event.end_time,
+            total_tickets=event.total_tickets, tickets_sold=event.tickets_sold,
+            available_tickets=event.total_tickets - event.tickets_sold,
+            venue_address=event.venue_address,
+            venue={"address": event.venue_address, "latitude": shape.y, "longitude": shape.x},
+        ))
+    return responses
+
+
+def main(args):
+    for count in args.events:
+        events = make_events(count)
+        for mode, serialize in (("to_shape", per_row), ("vectorized", events_to_responses)):
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                serialize(events)
+                latencies.append(time.perf_counter() - start)
+            emit(summarize("event_serializer", latencies, sum(latencies),
+                           mode=mode, events=count, repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
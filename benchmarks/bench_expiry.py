@@ -0,0 +1,125 @@
+"""Expiry sweep benchmark: per-ticket locking vs set-based batches.
+
+Seeds a backlog of stale reserved tickets spread over a set of events and
+times ``TicketService.expire_old_tickets`` draining it, optionally with
+several workers sharing the backlog. The original per-ticket loop is timed
+as well for backlogs up to ``--legacy-max`` rows.
+
+    python -m benchmarks.bench_expiry --rows 10000 100000 1000000 --workers 4
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, select, text
+
+from app.models import Event, Ticket, TicketStatus
+from app.services.ticket import TicketService
+from benchmarks.common import create_bench_engine, emit, session_factory
+
+SEED_SQL = """
+WITH bench_user AS (
+    INSERT INTO users (email, name, hashed_password, is_active, is_superuser)
+    VALUES (:email, 'Bench Expiry', 'x', true, false)
+    RETURNING id
+),
+bench_events AS (
+    INSERT INTO events (title, start_time, end_time, total_tickets, tickets_sold, venue_address, venue_location)
+    SELECT 'Bench expiry ' || n, now() + interval '30 days', now() + interval '31 days',
+           :per_event, :per_event, 'Bench Arena', ST_GeogFromText('SRID=4326;POINT(3.3792 6.5244)')
+    FROM generate_series(1, :events) AS n
+    RETURNING id
+),
+numbered AS (
+    SELECT id, row_number() OVER (ORDER BY id) - 1 AS slot FROM bench_events
+)
+INSERT INTO tickets (status, created_at, user_id, event_id)
+SELECT 'RESERVED', now() - interval '1 hour', bench_user.id, numbered.id
+FROM generate_series(0, :rows - 1) AS g
+JOIN numbered ON numbered.slot = g % :events
+CROSS JOIN bench_user
+"""
+
+
+async def seed(sessions, rows: int, events: int) -> None:
+    per_event = -(-rows // events)
+    async with sessions() as db:
+        await db.execute(text(SEED_SQL), {
+            "email": f"bench-expiry-{time.time_ns()}@example.com",
+            "rows": rows,
+            "events": events,
+            "per_event": per_event,
+        })
+        await db.commit()
+
+
+async def legacy_expire(db) -> int:
+    """The per-ticket loop that expire_old_tickets used to run."""
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=2)
+    result = await db.execute(
+        select(Ticket)
+        .where(and_(Ticket.status == TicketStatus.RESERVED, Ticket.created_at < cutoff))
+        .with_for_update()
+    )
+    tickets = result.scalars().all()
+    for ticket in tickets:
+        event_result = await db.execute(
+            select(Event).where(Event.id == ticket.event_id).with_for_update()
+        )
+        event = event_result.scalar_one_or_none()
+        if event:
+            event.tickets_sold -= 1
+        ticket.status = TicketStatus.EXPIRED
+    await db.commit()
+    return len(tickets)
+
+
+async def run_bulk(sessions, workers: int, batch_size: int) -> int:
+    async def worker():
+        async with sessions() as db:
+            return await TicketService(db).expire_old_tickets(batch_size=batch_size)
+
+    return sum(await asyncio.gather(*(worker() for _ in range(workers))))
+
+
+async def main(args):
+    engine = await create_bench_engine(pool_size=max(args.workers, 5))
+    sessions = session_factory(engine)
+    try:
+        for rows in args.rows:
+            modes = ["set_based"] + (["legacy"] if rows <= args.legacy_max else [])
+            for mode in modes:
+                await seed(sessions, rows, args.events)
+                start = time.perf_counter()
+                if mode == "legacy":
+                    async with sessions() as db:
+                        expired = await legacy_expire(db)
+                else:
+                    expired = await run_bulk(sessions, args.workers, args.batch_size)
+                wall = time.perf_counter() - start
+                emit({
+                    "benchmark": "expiry.sweep",
+                    "params": {
+                        "mode": mode,
+                        "rows": rows,
+                        "events": args.events,
+                        "workers": args.workers if mode == "set_based" else 1,
+                        "batch_size": args.batch_size,
+                    },
+                    "expired": expired,
+                    "wall_seconds": round(wall, 4),
+                    "rows_per_second": round(expired / wall, 2) if wall else 0.0,
+                })
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--legacy-max", type=int, default=100_000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,74 @@
+"""Nearby searches from clustered clients, with and without the geohash tile cache.
+
+Clients sit around a few neighbourhood centres with a little GPS jitter, as
+mobile users do. Reuses the event rows seeded by ``bench_nearby``.
+
+    python -m benchmarks.bench_geo_tiles --rows 100000 --queries 2000 --radius-km 1 5 10
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.config import get_settings
+from app.services.for_you import ForYouService
+from app.services.geo_tiles import geo_tile_cache
+from benchmarks.bench_nearby import MAX_LAT, MAX_LON, MIN_LAT, MIN_LON, grow
+from benchmarks.common import create_bench_engine, emit, run_concurrently, session_factory, summarize
+
+JITTER_DEGREES = 0.005  # ~500 m
+
+
+async def run_mode(sessions, cached: bool, radius_km: float, centres, args) -> dict:
+    get_settings().GEO_TILE_CACHE_ENABLED = cached
+    rng = random.Random(args.seed)
+
+    async def search(_):
+        latitude, longitude = rng.choice(centres)
+        async with sessions() as db:
+            await ForYouService(db).get_nearby_events(
+                latitude=latitude + rng.uniform(-JITTER_DEGREES, JITTER_DEGREES),
+                longitude=longitude + rng.uniform(-JITTER_DEGREES, JITTER_DEGREES),
+                radius_km=radius_km,
+                limit=args.limit,
+            )
+
+    start = time.perf_counter()
+    latencies = await run_concurrently(search, args.concurrency, args.queries)
+    result = summarize("geo_tiles.nearby", latencies, time.perf_counter() - start,
+                       tile_cache=cached, radius_km=radius_km, queries=args.queries,
+                       neighbourhoods=len(centres), concurrency=args.concurrency)
+    if cached:
+        result["tiles"] = geo_tile_cache.stats()
+    return result
+
+
+async def main(args):
+    engine = await create_bench_engine(pool_size=args.concurrency)
+    sessions = session_factory(engine)
+    rng = random.Random(args.seed)
+    centres = [
+        (rng.uniform(MIN_LAT + 0.5, MAX_LAT - 0.5), rng.uniform(MIN_LON + 0.5, MAX_LON - 0.5))
+        for _ in range(args.neighbourhoods)
+    ]
+    try:
+        await grow(sessions, args.rows)
+        for radius_km in args.radius_km:
+            for cached in (False, True):
+                geo_tile_cache.tiles.clear_local()
+                geo_tile_cache.levels.clear()
+                emit(await run_mode(sessions, cached, radius_km, centres, args))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--radius-km", type=float, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--neighbourhoods", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
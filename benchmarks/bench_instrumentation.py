@@ -0,0 +1,65 @@
+"""Per-request overhead of the instrumentation middleware and SQL listeners.
+
+Calls an in-process route that runs ``--statements`` SQLite statements,
+with and without instrumentation; no PostgreSQL needed.
+
+    python -m benchmarks.bench_instrumentation --requests 5000 --statements 5
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine, text
+
+from app.config import get_settings
+from app.instrumentation import InstrumentationMiddleware, instrument_engine
+from benchmarks.common import emit, summarize
+
+
+def build_app(instrumented: bool, statements: int) -> FastAPI:
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    if instrumented:
+        instrument_engine(engine)
+        app.add_middleware(InstrumentationMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        with engine.connect() as conn:
+            for _ in range(statements):
+                conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    return app
+
+
+async def run_mode(mode: str, args) -> dict:
+    app = build_app(mode != "off", args.statements)
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        for i in range(100):
+            await client.get(f"/items/{i}")
+        latencies = []
+        start = time.perf_counter()
+        for i in range(args.requests):
+            call_start = time.perf_counter()
+            await client.get(f"/items/{i}")
+            latencies.append(time.perf_counter() - call_start)
+        wall = time.perf_counter() - start
+    return summarize("instrumentation.request", latencies, wall, mode=mode,
+                     requests=args.requests, statements=args.statements)
+
+
+async def main(args):
+    settings = get_settings()
+    for mode, sample_rate in (("off", 0.0), ("metrics", 0.0), ("metrics+sql_log_1pct", 0.01)):
+        settings.SQL_LOG_SAMPLE_RATE = sample_rate
+        emit(await run_mode(mode, args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--statements", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,89 @@
+"""Concurrent purchase benchmark: event row lock vs sharded inventory.
+
+Every worker reserves tickets for the same event through
+``TicketService.create_ticket``, which is the on-sale hot spot.
+
+    python -m benchmarks.bench_inventory --concurrency 50 --purchases 5000 --shards 16
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from geoalchemy2.elements import WKTElement
+
+from app.config import get_settings
+from app.models import Event, User
+from app.schemas.ticket import TicketCreate
+from app.services.ticket import TicketService
+from benchmarks.common import create_bench_engine, emit, run_concurrently, session_factory, summarize
+
+
+async def seed(sessions, total_tickets: int):
+    async with sessions() as db:
+        user = User(
+            name="Bench Buyer",
+            email=f"bench-{time.time_ns()}@example.com",
+            hashed_password="x",
+        )
+        event = Event(
+            title="Bench On-sale",
+            start_time=datetime.now(timezone.utc) + timedelta(days=30),
+            end_time=datetime.now(timezone.utc) + timedelta(days=30, hours=3),
+            total_tickets=total_tickets,
+            tickets_sold=0,
+            venue_address="Bench Arena",
+            venue_location=WKTElement("POINT(3.3792 6.5244)", srid=4326),
+        )
+        db.add_all([user, event])
+        await db.commit()
+        return user.id, event.id
+
+
+async def run_mode(sessions, shards: int, concurrency: int, purchases: int) -> dict:
+    settings = get_settings()
+    settings.INVENTORY_SHARDS = shards
+    user_id, event_id = await seed(sessions, total_tickets=purchases)
+    ticket_data = TicketCreate(user_id=user_id, event_id=event_id)
+
+    async def purchase(_):
+        async with sessions() as db:
+            await TicketService(db).create_ticket(ticket_data)
+
+    start = time.perf_counter()
+    latencies = await run_concurrently(purchase, concurrency, purchases)
+    wall = time.perf_counter() - start
+
+    async with sessions() as db:
+        await TicketService(db).reconcile_inventory()
+        event = await db.get(Event, event_id)
+
+    result = summarize(
+        "inventory.create_ticket",
+        latencies,
+        wall,
+        mode="sharded" if shards else "row_lock",
+        shards=shards,
+        concurrency=concurrency,
+        purchases=purchases,
+    )
+    result["tickets_sold"] = event.tickets_sold
+    return result
+
+
+async def main(args):
+    engine = await create_bench_engine(pool_size=args.concurrency, max_overflow=0)
+    sessions = session_factory(engine)
+    try:
+        emit(await run_mode(sessions, 0, args.concurrency, args.purchases))
+        emit(await run_mode(sessions, args.shards, args.concurrency, args.purchases))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--purchases", type=int, default=5000)
+    parser.add_argument("--shards", type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
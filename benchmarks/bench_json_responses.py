@@ -0,0 +1,94 @@
+"""Serialization cost of list endpoints: stdlib ``JSONResponse`` vs ``FastJSONResponse``.
+
+Mounts two copies of a list route returning ``--items`` events or tickets,
+one per response class, and calls them in-process through ASGI. Reports
+latency and CPU time per request; no database involved.
+
+    python -m benchmarks.bench_json_responses --items 100 300 1000 --requests 500
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+from httpx import AsyncClient
+
+from app.responses import FastJSONResponse
+from app.schemas.event import EventResponse
+from app.schemas.ticket import TicketResponse
+from benchmarks.common import emit, summarize
+
+
+def sample_events(count: int) -> List[EventResponse]:
+    start = datetime.now(timezone.utc) + timedelta(days=7)
+    return [
+        EventResponse(
+            id=i, title=f"Event {i}", description="An evening of live music " * 4,
+            start_time=start, end_time=start + timedelta(hours=3), total_tickets=500,
+            tickets_sold=i % 500, available_tickets=500 - i % 500, venue_address="Eko Hotel, Lagos",
+            venue={"address": "Eko Hotel, Lagos", "latitude": 6.4281, "longitude": 3.4283},
+        )
+        for i in range(count)
+    ]
+
+
+def sample_tickets(count: int) -> List[TicketResponse]:
+    now = datetime.now(timezone.utc)
+    return [
+        TicketResponse(id=i, user_id=7, event_id=i % 20, status="paid", created_at=now,
+                       payment_reference=f"pay_{i}", paid_at=now)
+        for i in range(count)
+    ]
+
+
+def build_app(events: List[EventResponse], tickets: List[TicketResponse]) -> FastAPI:
+    app = FastAPI()
+    for name, response_class in (("stdlib", JSONResponse), ("fast", FastJSONResponse)):
+        router = APIRouter(default_response_class=response_class)
+
+        @router.get("/events", response_model=List[EventResponse])
+        async def list_events():
+            return events
+
+        @router.get("/tickets", response_model=List[TicketResponse])
+        async def list_tickets():
+            return tickets
+
+        app.include_router(router, prefix=f"/{name}")
+    return app
+
+
+async def run(client: AsyncClient, path: str, requests: int):
+    latencies = []
+    cpu_start, start = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        call_start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - call_start)
+    return latencies, time.perf_counter() - start, time.process_time() - cpu_start
+
+
+async def main(args):
+    for items in args.items:
+        app = build_app(sample_events(items), sample_tickets(items))
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+            for resource in ("events", "tickets"):
+                for mode in ("stdlib", "fast"):
+                    path = f"/{mode}/{resource}"
+                    await run(client, path, 20)
+                    latencies, wall, cpu = await run(client, path, args.requests)
+                    result = summarize(f"json_responses.{resource}", latencies, wall, mode=mode,
+                                       items=items, requests=args.requests)
+                    result["cpu_ms_per_request"] = round(cpu / args.requests * 1000, 3)
+                    emit(result)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--requests", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+"""Hot GET endpoints: ORM + Pydantic path vs lean Core-row path rendered with orjson.
+
+For each endpoint, runs the service call plus response rendering the way
+FastAPI does it (validate against ``response_model``, ``jsonable_encoder``,
+``JSONResponse``) and the lean equivalent. Reports latency and, in a
+separate tracemalloc pass, peak memory allocated per call.
+
+    python -m benchmarks.bench_lean_reads --calls 2000 --user-tickets 200
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app.config import get_settings
+from app.models import Ticket, TicketStatus
+from app.responses import FastJSONResponse
+from app.schemas.event import EventResponse
+from app.schemas.ticket import TicketResponse
+from app.services.event import EventService
+from app.services.lean_reads import LeanReadService
+from app.services.ticket import TicketService
+from benchmarks.bench_inventory import seed
+from benchmarks.common import create_bench_engine, emit, session_factory, summarize
+
+
+def render(response_model, value) -> bytes:
+    """What FastAPI does with a returned model or ORM object"""
+    validated = TypeAdapter(response_model).validate_python(value, from_attributes=True)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def endpoints(user_id: int, event_id: int, ticket_id: int):
+    return {
+        "get_event": (
+            lambda db: EventService(db).get_event_by_id(event_id), EventResponse,
+            lambda db: LeanReadService(db).get_event(event_id),
+        ),
+        "get_ticket": (
+            lambda db: TicketService(db).get_ticket_by_id(ticket_id), TicketResponse,
+            lambda db: LeanReadService(db).get_ticket(ticket_id),
+        ),
+        "get_user_tickets": (
+            lambda db: TicketService(db).get_tickets_by_user(user_id), List[TicketResponse],
+            lambda db: LeanReadService(db).get_user_tickets(user_id),
+        ),
+    }
+
+
+async def call(sessions, mode: str, load, response_model, lean) -> bytes:
+    async with sessions() as db:
+        if mode == "orm":
+            return render(response_model, await load(db))
+        return FastJSONResponse(await lean(db)).body
+
+
+async def measure(sessions, mode: str, endpoint, calls: int):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        call_start = time.perf_counter()
+        await call(sessions, mode, *endpoint)
+        latencies.append(time.perf_counter() - call_start)
+    wall = time.perf_counter() - start
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(calls, 200)):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            await call(sessions, mode, *endpoint)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return latencies, wall, sum(peaks) / len(peaks) / 1024
+
+
+async def main(args):
+    get_settings().EVENT_CACHE_ENABLED = args.event_cache
+    engine = await create_bench_engine(pool_size=1, max_overflow=0)
+    sessions = session_factory(engine)
+    try:
+        user_id, event_id = await seed(sessions, total_tickets=args.user_tickets)
+        async with sessions() as db:
+            result = await db.scalars(insert(Ticket).returning(Ticket.id), [
+                {"user_id": user_id, "event_id": event_id, "status": TicketStatus.RESERVED,
+                 "created_at": datetime.now(timezone.utc)}
+                for _ in range(args.user_tickets)
+            ])
+            ticket_id = result.all()[0]
+            await db.commit()
+
+        for name, endpoint in endpoints(user_id, event_id, ticket_id).items():
+            for mode in ("orm", "lean"):
+                # Warm up caches, prepared statements and the pool
+                for _ in range(20):
+                    await call(sessions, mode, *endpoint)
+                latencies, wall, peak_kib = await measure(sessions, mode, endpoint, args.calls)
+                result = summarize(f"lean_reads.{name}", latencies, wall, mode=mode, calls=args.calls,
+                                   user_tickets=args.user_tickets, event_cache=args.event_cache)
+                result["peak_alloc_kib_per_call"] = round(peak_kib, 1)
+                emit(result)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--user-tickets", type=int, default=200)
+    parser.add_argument("--event-cache", action="store_true", help="serve get_event through the event cache")
+    asyncio.run(main(parser.parse_args()))
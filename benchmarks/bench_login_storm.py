@@ -0,0 +1,107 @@
+"""Latency of unrelated endpoints while a burst of logins is in flight.
+
+Compares bcrypt run inline on the event loop (the old behaviour) with the
+bounded thread pool. The app is driven in-process over one event loop, so
+any blocking in a login handler shows up directly in the probe latencies.
+
+    python -m benchmarks.bench_login_storm --logins 200 --login-concurrency 50 --probes 500
+"""
+import argparse
+import asyncio
+import time
+
+from httpx import AsyncClient
+
+from app.api.deps import get_db
+from app.main import app
+from app.models import User
+from app.services import auth
+from app.services.password_hasher import PasswordHasher, password_hasher, pwd_context
+from benchmarks.common import create_bench_engine, emit, run_concurrently, session_factory, summarize
+
+PASSWORD = "bench-password"
+PROBE_PATHS = ("/health", "/api/v1/events/?limit=10")
+
+
+class InlinePasswordHasher(PasswordHasher):
+    """Hashes on the calling thread, blocking the event loop like the old code"""
+
+    async def _run(self, func, *args):
+        return func(*args)
+
+
+async def seed_user(sessions) -> str:
+    async with sessions() as db:
+        user = User(
+            name="Bench User",
+            email=f"bench-{time.time_ns()}@example.com",
+            hashed_password=pwd_context.hash(PASSWORD),
+        )
+        db.add(user)
+        await db.commit()
+        return user.email
+
+
+async def run_mode(client: AsyncClient, hasher: PasswordHasher, mode: str, email: str, args) -> list:
+    auth.password_hasher = hasher
+    login_data = {"username": email, "password": PASSWORD}
+    rejected = 0
+
+    async def login(_):
+        nonlocal rejected
+        response = await client.post("/api/v1/auth/login", data=login_data)
+        if response.status_code == 503:
+            rejected += 1
+        response.raise_for_status()
+
+    storm_start = time.perf_counter()
+    storm = asyncio.ensure_future(run_concurrently(login, args.login_concurrency, args.logins))
+    results = []
+    for path in PROBE_PATHS:
+        async def probe(_):
+            (await client.get(path)).raise_for_status()
+
+        start = time.perf_counter()
+        latencies = await run_concurrently(probe, args.probe_concurrency, args.probes)
+        results.append(summarize("login_storm.probe", latencies, time.perf_counter() - start,
+                                 mode=mode, path=path, logins=args.logins,
+                                 login_concurrency=args.login_concurrency))
+    login_latencies = await storm
+    results.append(summarize("login_storm.login", login_latencies, time.perf_counter() - storm_start,
+                             mode=mode, rejected=rejected, logins=args.logins,
+                             login_concurrency=args.login_concurrency))
+    return results
+
+
+async def main(args):
+    engine = await create_bench_engine(pool_size=args.login_concurrency)
+    sessions = session_factory(engine)
+
+    async def bench_get_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = bench_get_db
+    modes = [
+        ("inline", InlinePasswordHasher(pwd_context, max_workers=1, max_pending=1)),
+        ("thread_pool", password_hasher),
+    ]
+    try:
+        email = await seed_user(sessions)
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+            for mode, hasher in modes:
+                for result in await run_mode(client, hasher, mode, email, args):
+                    emit(result)
+    finally:
+        auth.password_hasher = password_hasher
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--login-concurrency", type=int, default=50)
+    parser.add_argument("--probes", type=int, default=500)
+    parser.add_argument("--probe-concurrency", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
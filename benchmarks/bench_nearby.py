@@ -0,0 +1,96 @@
+"""Nearby-event search latency by table size and radius.
+
+Grows the events table in steps (``--rows``) with venues scattered over a
+~200 km square and, at each size, times ``EventRepository.get_nearby_events``
+(GiST-filtered, KNN ordered) against the old ``ST_Distance`` sort for each
+radius. Rows are added, never removed, so reruns reuse earlier seeding.
+
+    python -m benchmarks.bench_nearby --rows 10000 100000 1000000 --radius-km 1 5 10 25 50
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import func, select, text
+
+from app.models import Event
+from app.repositories import EventRepository
+from app.repositories.spatial import geography_point
+from benchmarks.common import create_bench_engine, emit, session_factory, summarize
+
+# Venues and query centres fall inside this box (around Lagos)
+MIN_LON, MAX_LON = 2.5, 4.5
+MIN_LAT, MAX_LAT = 5.5, 7.5
+
+GROW_SQL = """
+INSERT INTO events (title, start_time, end_time, total_tickets, tickets_sold, venue_address, venue_location)
+SELECT 'Bench nearby ' || n, now() + interval '30 days', now() + interval '31 days', 100, 0, 'Bench Venue',
+       ST_SetSRID(ST_MakePoint(:min_lon + random() * (:max_lon - :min_lon),
+                               :min_lat + random() * (:max_lat - :min_lat)), 4326)::geography
+FROM generate_series(1, :count) AS n
+"""
+
+
+async def grow(sessions, rows: int) -> int:
+    async with sessions() as db:
+        existing = (await db.execute(select(func.count()).select_from(Event))).scalar_one()
+        if existing < rows:
+            await db.execute(text(GROW_SQL), {
+                "count": rows - existing,
+                "min_lon": MIN_LON, "max_lon": MAX_LON,
+                "min_lat": MIN_LAT, "max_lat": MAX_LAT,
+            })
+            await db.commit()
+            await db.execute(text("ANALYZE events"))
+        return max(existing, rows)
+
+
+async def distance_sort(db, latitude: float, longitude: float, radius_km: float, limit: int):
+    """The query ForYouService used to run: filter, then sort every match"""
+    point = geography_point(latitude, longitude)
+    result = await db.execute(
+        select(Event)
+        .where(func.ST_DWithin(Event.venue_location, point, radius_km * 1000.0))
+        .order_by(func.ST_Distance(Event.venue_location, point))
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def knn(db, latitude: float, longitude: float, radius_km: float, limit: int):
+    return await EventRepository(db).get_nearby_events(latitude, longitude, radius_km, limit=limit)
+
+
+async def main(args):
+    engine = await create_bench_engine()
+    sessions = session_factory(engine)
+    rng = random.Random(args.seed)
+    try:
+        for rows in sorted(args.rows):
+            total = await grow(sessions, rows)
+            for radius_km in args.radius_km:
+                for mode, query in (("distance_sort", distance_sort), ("knn", knn)):
+                    latencies = []
+                    async with sessions() as db:
+                        for _ in range(args.queries):
+                            latitude = rng.uniform(MIN_LAT, MAX_LAT)
+                            longitude = rng.uniform(MIN_LON, MAX_LON)
+                            start = time.perf_counter()
+                            await query(db, latitude, longitude, radius_km, args.limit)
+                            latencies.append(time.perf_counter() - start)
+                            db.expunge_all()
+                    emit(summarize("nearby_events", latencies, sum(latencies),
+                                   mode=mode, rows=total, radius_km=radius_km, limit=args.limit))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--radius-km", type=float, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
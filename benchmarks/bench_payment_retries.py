@@ -0,0 +1,71 @@
+"""Webhook retry storm: duplicate payment confirmations with and without the payment cache.
+
+Each of ``--tickets`` reserved tickets is confirmed ``--retries`` times with
+the same payment reference, all concurrently, the way providers retry.
+
+    python -m benchmarks.bench_payment_retries --tickets 1000 --retries 5 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+from app.config import get_settings
+from app.models import Ticket, TicketStatus
+from app.services.ticket import TicketService
+from benchmarks.bench_inventory import seed
+from benchmarks.common import create_bench_engine, emit, run_concurrently, session_factory, summarize
+
+
+async def seed_tickets(sessions, count: int):
+    user_id, event_id = await seed(sessions, total_tickets=count)
+    async with sessions() as db:
+        result = await db.scalars(
+            insert(Ticket).returning(Ticket.id),
+            [
+                {"user_id": user_id, "event_id": event_id, "status": TicketStatus.RESERVED,
+                 "created_at": datetime.now(timezone.utc)}
+                for _ in range(count)
+            ]
+        )
+        ticket_ids = result.all()
+        await db.commit()
+    return ticket_ids
+
+
+async def run_mode(sessions, cached: bool, args) -> dict:
+    get_settings().PAYMENT_CACHE_ENABLED = cached
+    ticket_ids = await seed_tickets(sessions, args.tickets)
+    run_id = time.time_ns()
+    calls = [ticket_id for _ in range(args.retries) for ticket_id in ticket_ids]
+
+    async def confirm(i):
+        ticket_id = calls[i]
+        async with sessions() as db:
+            await TicketService(db).pay_ticket(ticket_id, f"bench-{run_id}-{ticket_id}", datetime.now(timezone.utc))
+
+    start = time.perf_counter()
+    latencies = await run_concurrently(confirm, args.concurrency, len(calls))
+    wall = time.perf_counter() - start
+    return summarize("payment.pay_ticket", latencies, wall, mode="cached" if cached else "uncached",
+                     tickets=args.tickets, retries=args.retries, concurrency=args.concurrency)
+
+
+async def main(args):
+    engine = await create_bench_engine(pool_size=args.concurrency)
+    sessions = session_factory(engine)
+    try:
+        for cached in (False, True):
+            emit(await run_mode(sessions, cached, args))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=1000)
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
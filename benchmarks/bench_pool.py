@@ -0,0 +1,66 @@
+"""Short queries under bursty concurrency: fixed pool with pre-ping vs adaptive pool.
+
+The adaptive run skips pre-ping and resizes ``max_overflow`` between bursts
+the way ``PoolMonitor`` does in the API. Pool telemetry is printed with
+each result.
+
+    python -m benchmarks.bench_pool --bursts 5 --concurrency 10 80 --queries 2000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import get_settings
+from app.db_pool import InstrumentedQueuePool, PoolMonitor
+from benchmarks.common import bench_database_url, emit, run_concurrently, summarize
+
+
+async def run_mode(adaptive: bool, args) -> dict:
+    settings = get_settings()
+    settings.DB_POOL_ADAPTIVE = adaptive
+    engine = create_async_engine(
+        bench_database_url(),
+        pool_pre_ping=not adaptive,
+        pool_size=args.pool_size,
+        max_overflow=args.max_overflow,
+        poolclass=InstrumentedQueuePool,
+    )
+    monitor = PoolMonitor(engine)
+
+    async def query(_):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT pg_sleep(0.002)"))
+
+    latencies = []
+    start = time.perf_counter()
+    try:
+        for _ in range(args.bursts):
+            for concurrency in args.concurrency:
+                latencies += await run_concurrently(query, concurrency, args.queries)
+                if adaptive:
+                    monitor.resize()
+        wall = time.perf_counter() - start
+        result = summarize("pool.short_query", latencies, wall, mode="adaptive" if adaptive else "pre_ping",
+                           pool_size=args.pool_size, concurrency=args.concurrency, bursts=args.bursts)
+        result["pool"] = monitor.stats()["pool"]
+        return result
+    finally:
+        await engine.dispose()
+
+
+async def main(args):
+    for adaptive in (False, True):
+        emit(await run_mode(adaptive, args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 80])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--max-overflow", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
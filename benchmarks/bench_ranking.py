@@ -0,0 +1,89 @@
+"""Recommendation ranking: per-event Python loop vs the vectorized NumPy pass.
+
+Pure CPU benchmark over synthetic candidates; no database needed.
+
+    python -m benchmarks.bench_ranking --candidates 1000 10000 100000 --k 20
+"""
+import argparse
+import heapq
+import math
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.services.geo_tiles import EARTH_RADIUS_KM
+from app.services.ranking import DEFAULT_WEIGHTS, CandidateFeatures, rank
+from benchmarks.common import emit, summarize
+
+ORIGIN = (6.5244, 3.3792)
+
+
+def make_features(count: int, now: datetime, seed: int) -> CandidateFeatures:
+    rng = np.random.default_rng(seed)
+    total = rng.integers(50, 5000, count)
+    return CandidateFeatures(
+        ids=np.arange(count),
+        latitudes=ORIGIN[0] + rng.uniform(-1, 1, count),
+        longitudes=ORIGIN[1] + rng.uniform(-1, 1, count),
+        start_times=now.timestamp() + rng.uniform(-86400, 90 * 86400, count),
+        tickets_sold=(total * rng.random(count)).astype(int),
+        total_tickets=total,
+        affinity=rng.random(count),
+    )
+
+
+def rank_python(features: CandidateFeatures, k: int, now: datetime, origin, weights=DEFAULT_WEIGHTS):
+    """The straightforward per-event loop the vectorized path replaces"""
+    rows = list(zip(
+        features.latitudes.tolist(), features.longitudes.tolist(), features.start_times.tolist(),
+        features.tickets_sold.tolist(), features.total_tickets.tolist(), features.affinity.tolist(),
+    ))
+    max_sold = max((math.log1p(max(sold, 0)) for _, _, _, sold, _, _ in rows), default=0.0)
+    lat1, lon1 = math.radians(origin[0]), math.radians(origin[1])
+    scored = []
+    for i, (lat, lon, start, sold, total, affinity) in enumerate(rows):
+        hours = (start - now.timestamp()) / 3600.0
+        if sold >= total or hours <= 0:
+            continue
+        lat2 = math.radians(lat)
+        a = (math.sin((lat2 - lat1) / 2) ** 2
+             + math.cos(lat1) * math.cos(lat2) * math.sin((math.radians(lon) - lon1) / 2) ** 2)
+        distance = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+        score = (
+            weights.affinity * affinity
+            + weights.time * math.exp(-hours / weights.time_scale_hours)
+            + weights.fill * min(max(sold / max(total, 1), 0.0), 1.0)
+            + weights.popularity * (math.log1p(max(sold, 0)) / max_sold if max_sold else 0.0)
+            + weights.distance * math.exp(-distance / weights.distance_scale_km)
+        )
+        scored.append((score, i))
+    return [i for _, i in heapq.nlargest(k, scored)]
+
+
+def main(args):
+    now = datetime.now(timezone.utc)
+    for count in args.candidates:
+        features = make_features(count, now, args.seed)
+        expected = rank_python(features, args.k, now, ORIGIN)
+        assert rank(features, args.k, now=now, origin=ORIGIN) == expected, "rankings disagree"
+        for mode, ranker in (
+            ("python", lambda: rank_python(features, args.k, now, ORIGIN)),
+            ("numpy", lambda: rank(features, args.k, now=now, origin=ORIGIN)),
+        ):
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                ranker()
+                latencies.append(time.perf_counter() - start)
+            emit(summarize("ranking", latencies, sum(latencies),
+                           mode=mode, candidates=count, k=args.k, repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
@@ -0,0 +1,110 @@
+"""Peak RSS of exporting an event's tickets: load-all list vs streaming NDJSON/CSV.
+
+Seeds ``--tickets`` tickets for one event once, then runs every mode in a
+fresh subprocess so each peak RSS reading starts from a clean interpreter.
+
+    python -m benchmarks.bench_ticket_export --tickets 1000000
+"""
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from sqlalchemy import func, insert, literal, select
+
+from app.models import Ticket, TicketStatus
+from app.schemas.ticket import TicketResponse
+from app.services.ticket_export import TicketExporter
+from benchmarks.bench_inventory import seed
+from benchmarks.common import create_bench_engine, emit, session_factory
+
+MODES = ("list", "ndjson", "csv")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def seed_tickets(sessions, count: int) -> int:
+    user_id, event_id = await seed(sessions, total_tickets=count)
+    async with sessions() as db:
+        await db.execute(
+            insert(Ticket).from_select(
+                ["user_id", "event_id", "status", "created_at"],
+                select(
+                    literal(user_id), literal(event_id),
+                    literal(TicketStatus.RESERVED, Ticket.status.type), func.now()
+                ).select_from(func.generate_series(1, count))
+            )
+        )
+        await db.commit()
+    return event_id
+
+
+async def export_list(sessions, event_id: int) -> int:
+    """What GET /tickets/user/{id} does: load every ticket, then serialize the list"""
+    async with sessions() as db:
+        result = await db.execute(select(Ticket).where(Ticket.event_id == event_id).order_by(Ticket.id))
+        tickets = result.scalars().all()
+        body = json.dumps([TicketResponse.model_validate(ticket).model_dump(mode="json") for ticket in tickets])
+    return len(body)
+
+
+async def export_stream(sessions, event_id: int, fmt: str) -> int:
+    size = 0
+    async for chunk in TicketExporter(sessions).for_event(event_id, fmt):
+        size += len(chunk)
+    return size
+
+
+async def child(args) -> None:
+    engine = await create_bench_engine(pool_size=1, max_overflow=0)
+    sessions = session_factory(engine)
+    baseline = peak_rss_mb()
+    try:
+        start = time.perf_counter()
+        if args.child == "list":
+            size = await export_list(sessions, args.event_id)
+        else:
+            size = await export_stream(sessions, args.event_id, args.child)
+        wall = time.perf_counter() - start
+    finally:
+        await engine.dispose()
+    emit({
+        "benchmark": "ticket_export",
+        "params": {"mode": args.child, "tickets": args.tickets},
+        "bytes": size,
+        "wall_seconds": round(wall, 4),
+        "rows_per_second": round(args.tickets / wall, 2) if wall else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "peak_rss_growth_mb": round(peak_rss_mb() - baseline, 1),
+    })
+
+
+async def main(args) -> None:
+    engine = await create_bench_engine()
+    try:
+        event_id = await seed_tickets(session_factory(engine), args.tickets)
+    finally:
+        await engine.dispose()
+
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_ticket_export", "--tickets", str(args.tickets),
+             "--child", mode, "--event-id", str(event_id)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=1000000)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--event-id", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    asyncio.run(child(args) if args.child else main(args))
@@ -0,0 +1,94 @@
+"""On-sale spike: every client hits the reservation path vs a waiting room.
+
+``--clients`` buyers arrive within ``--arrival-seconds`` for one event. In
+``direct`` mode they all call ``TicketService.create_ticket`` at once and
+contend for the pool and the event row; in ``waiting_room`` mode they join
+the queue, poll until admitted and only then reserve. Needs Redis at
+``CELERY_BROKER_URL`` as well as the bench database.
+
+    python -m benchmarks.bench_waiting_room --clients 5000 --rate 200 --pool-size 20
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.config import get_settings
+from app.redis_client import create_redis
+from app.schemas.ticket import TicketCreate
+from app.services.ticket import TicketService
+from app.services.waiting_room import WaitingRoom
+from benchmarks.bench_inventory import seed
+from benchmarks.common import create_bench_engine, emit, percentile, session_factory, summarize
+
+
+async def run_mode(sessions, redis, mode: str, args) -> dict:
+    user_id, event_id = await seed(sessions, total_tickets=args.clients)
+    ticket_data = TicketCreate(user_id=user_id, event_id=event_id)
+    room = WaitingRoom(redis, metrics={})
+    if mode == "waiting_room":
+        await room.open(event_id, args.rate)
+
+    latencies = []
+    waits = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        await asyncio.sleep(random.uniform(0, args.arrival_seconds))
+        arrived = time.perf_counter()
+        tokens = []
+        if mode == "waiting_room":
+            place = await room.join(event_id)
+            while not place["admitted"]:
+                await asyncio.sleep(min(max(place["estimated_wait_seconds"], args.poll_seconds), 5.0))
+                place = await room.status(event_id, place["token"])
+            tokens.append(place["token"])
+        start = time.perf_counter()
+        waits.append(start - arrived)
+        try:
+            await room.admit([event_id], tokens)
+            async with sessions() as db:
+                await TicketService(db).create_ticket(ticket_data)
+        except Exception:
+            errors += 1
+            return
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.clients)))
+    wall = time.perf_counter() - start
+    if mode == "waiting_room":
+        await room.close(event_id)
+
+    result = summarize("waiting_room.reserve", latencies, wall, mode=mode, clients=args.clients,
+                       rate=args.rate if mode == "waiting_room" else None, pool_size=args.pool_size)
+    result["errors"] = errors
+    result["queue_wait_ms"] = {
+        "p50": round(percentile(waits, 50) * 1000, 3),
+        "p95": round(percentile(waits, 95) * 1000, 3),
+    }
+    return result
+
+
+async def main(args):
+    get_settings().INVENTORY_SHARDS = 0
+    engine = await create_bench_engine(pool_size=args.pool_size, max_overflow=0)
+    sessions = session_factory(engine)
+    redis = create_redis()
+    try:
+        for mode in ("direct", "waiting_room"):
+            emit(await run_mode(sessions, redis, mode, args))
+    finally:
+        await redis.aclose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--arrival-seconds", type=float, default=2.0)
+    parser.add_argument("--rate", type=float, default=200.0, help="waiting room release rate per second")
+    parser.add_argument("--poll-seconds", type=float, default=0.25)
+    parser.add_argument("--pool-size", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,97 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks talk to a real PostgreSQL/PostGIS database. Point them at a
+scratch database with ``BENCH_DATABASE_URL`` (defaults to ``DATABASE_URL``);
+tables are created if missing but never dropped.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.database import Base
+import app.models  # noqa: F401  (register tables on Base.metadata)
+
+
+def bench_database_url() -> str:
+    return os.getenv("BENCH_DATABASE_URL", get_settings().DATABASE_URL)
+
+
+async def create_bench_engine(pool_size: int = 20, max_overflow: int = 10) -> AsyncEngine:
+    """Engine for benchmark runs, with the schema created if needed."""
+    engine = create_async_engine(
+        bench_database_url(),
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+def session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``pct`` in 0-100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run_concurrently(
+    operation: Callable[[int], Awaitable[None]],
+    concurrency: int,
+    iterations: int,
+) -> List[float]:
+    """Run ``operation(i)`` ``iterations`` times with ``concurrency`` workers.
+
+    Returns per-call latencies in seconds. Exceptions are counted as calls
+    but not recorded as latencies.
+    """
+    latencies: List[float] = []
+    counter = iter(range(iterations))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await operation(i)
+            except Exception:
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def summarize(name: str, latencies: List[float], wall_seconds: float, **params) -> dict:
+    """Build one machine-readable result record."""
+    return {
+        "benchmark": name,
+        "params": params,
+        "ops": len(latencies),
+        "wall_seconds": round(wall_seconds, 4),
+        "ops_per_second": round(len(latencies) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+
+def emit(result: dict, stream: Optional[object] = None) -> None:
+    """Write a result record as one JSON line."""
+    stream = stream or sys.stdout
+    stream.write(json.dumps(result, sort_keys=True) + "\n")
+    stream.flush()
@@ -0,0 +1,119 @@
+"""Compare two benchmark result files and flag regressions.
+
+Records are matched on ``benchmark`` and ``params``; repeats of the same
+record are reduced to their median. A throughput drop or a p95/p99 latency
+rise beyond ``--threshold`` percent is a regression. Prints one JSON line
+per matched record plus a summary line, and exits with status 1 if
+anything regressed. Works on the output of ``benchmarks.suite`` as well as
+any of the ``bench_*`` scripts redirected to a file.
+
+    python -m benchmarks.compare results/main.jsonl results/branch.jsonl --threshold 10
+"""
+import argparse
+import json
+import statistics
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.common import emit
+
+# (field path, True if higher is better)
+METRICS = (
+    (("ops_per_second",), True),
+    (("latency_ms", "p95"), False),
+    (("latency_ms", "p99"), False),
+)
+
+Key = Tuple[str, str]
+
+
+def load(path: str, run_id: Optional[str] = None) -> List[dict]:
+    """Result records of ``path``; of run ``run_id``, or of the last run in the file"""
+    with open(path) as handle:
+        records = [json.loads(line) for line in handle if line.strip().startswith("{")]
+    runs = [record["run"]["id"] for record in records if "run" in record]
+    if run_id is None and runs:
+        run_id = runs[-1]
+    if run_id is not None:
+        records = [record for record in records if record.get("run", {}).get("id") == run_id]
+    return records
+
+
+def metric(record: dict, path: Tuple[str, ...]) -> Optional[float]:
+    value = record
+    for field in path:
+        if not isinstance(value, dict) or field not in value:
+            return None
+        value = value[field]
+    return value
+
+
+def reduce(records: List[dict]) -> Dict[Key, Dict[str, float]]:
+    """Median of every metric per (benchmark, params)"""
+    grouped = defaultdict(list)
+    for record in records:
+        grouped[(record["benchmark"], json.dumps(record.get("params", {}), sort_keys=True))].append(record)
+    medians = {}
+    for key, group in grouped.items():
+        values = {}
+        for path, _ in METRICS:
+            samples = [value for value in (metric(record, path) for record in group) if value is not None]
+            if samples:
+                values[".".join(path)] = statistics.median(samples)
+        medians[key] = values
+    return medians
+
+
+def compare(baseline: List[dict], candidate: List[dict], threshold: float) -> List[dict]:
+    """One comparison per record present in both files"""
+    before, after = reduce(baseline), reduce(candidate)
+    comparisons = []
+    for key in sorted(before.keys() & after.keys()):
+        benchmark, params = key
+        changes = {}
+        regressed = []
+        for path, higher_is_better in METRICS:
+            name = ".".join(path)
+            old, new = before[key].get(name), after[key].get(name)
+            if old is None or new is None:
+                continue
+            change = round((new - old) / old * 100, 2) if old else 0.0
+            changes[name] = {"baseline": old, "candidate": new, "change_pct": change}
+            if (-change if higher_is_better else change) > threshold:
+                regressed.append(name)
+        comparisons.append({
+            "benchmark": benchmark,
+            "params": json.loads(params),
+            "metrics": changes,
+            "regressed": regressed,
+        })
+    return comparisons
+
+
+def main(args) -> int:
+    comparisons = compare(
+        load(args.baseline, args.baseline_run),
+        load(args.candidate, args.candidate_run),
+        args.threshold,
+    )
+    for comparison in comparisons:
+        emit(comparison)
+    regressions = [comparison for comparison in comparisons if comparison["regressed"]]
+    emit({
+        "summary": True,
+        "compared": len(comparisons),
+        "regressions": len(regressions),
+        "threshold_pct": args.threshold,
+    })
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed change in percent")
+    parser.add_argument("--baseline-run", help="Run id in the baseline file (default: last)")
+    parser.add_argument("--candidate-run", help="Run id in the candidate file (default: last)")
+    sys.exit(main(parser.parse_args()))
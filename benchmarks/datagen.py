@@ -0,0 +1,222 @@
+"""Seed users, events and tickets for benchmark runs.
+
+Rows are generated inside PostgreSQL with ``generate_series`` in batches of
+``--batch-size``, each its own transaction with ``synchronous_commit`` off,
+so millions of rows take seconds to minutes instead of hours of ORM inserts.
+Tables are grown to the requested size, never truncated, so reruns reuse
+earlier seeding. ``random()`` is seeded, so a given database state and
+``--seed`` always produce the same rows.
+
+    python -m benchmarks.datagen --users 100000 --events 1000000 --tickets 5000000
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from benchmarks.common import create_bench_engine, emit
+
+# Users and venues fall inside this box (around Lagos)
+MIN_LON, MAX_LON = 2.5, 4.5
+MIN_LAT, MAX_LAT = 5.5, 7.5
+
+USERS_SQL = """
+INSERT INTO users (email, name, hashed_password, is_active, is_superuser, location)
+SELECT 'datagen-' || :run || '-' || n || '@example.com', 'Datagen User ' || n, 'x', true, false,
+       ST_SetSRID(ST_MakePoint(:min_lon + random() * (:max_lon - :min_lon),
+                               :min_lat + random() * (:max_lat - :min_lat)), 4326)::geography
+FROM generate_series(:first, :last) AS n
+"""
+
+EVENTS_SQL = """
+INSERT INTO events (title, description, start_time, end_time, total_tickets, tickets_sold,
+                    venue_address, venue_location)
+SELECT 'Datagen event ' || n, 'Generated for benchmarks', starts, starts + interval '3 hours',
+       :min_capacity + floor(random() * (:max_capacity - :min_capacity + 1))::int, 0,
+       'Datagen Venue ' || n,
+       ST_SetSRID(ST_MakePoint(:min_lon + random() * (:max_lon - :min_lon),
+                               :min_lat + random() * (:max_lat - :min_lat)), 4326)::geography
+FROM (
+    SELECT n, date_trunc('hour', now()) + (1 + floor(random() * 90 * 24)) * interval '1 hour' AS starts
+    FROM generate_series(:first, :last) AS n
+) AS generated
+"""
+
+# Dense slot numbers, so random picks never hit an id gap
+SLOTS_SQL = """
+CREATE TEMP TABLE datagen_{table} AS
+SELECT row_number() OVER (ORDER BY id) AS slot, id FROM {table};
+CREATE UNIQUE INDEX datagen_{table}_slot ON datagen_{table} (slot)
+"""
+
+TICKETS_SQL = """
+INSERT INTO tickets (status, created_at, payment_reference, paid_at, user_id, event_id)
+SELECT CAST(status AS ticketstatus), created_at,
+       CASE WHEN status = 'PAID' THEN gen_random_uuid()::text END,
+       CASE WHEN status = 'PAID' THEN created_at END,
+       u.id, e.id
+FROM (
+    SELECT CASE WHEN r < :paid_share THEN 'PAID'
+                WHEN r < :paid_share + :reserved_share THEN 'RESERVED'
+                ELSE 'EXPIRED' END AS status,
+           now() - make_interval(secs => :min_age + random() * :age_spread) AS created_at,
+           1 + floor(random() * :users)::bigint AS user_slot,
+           1 + floor(random() * :events)::bigint AS event_slot
+    FROM (SELECT random() AS r FROM generate_series(:first, :last)) AS draws
+) AS generated
+JOIN datagen_users u ON u.slot = generated.user_slot
+JOIN datagen_events e ON e.slot = generated.event_slot
+"""
+
+# Seats taken by generated tickets; capacity grows where random picks overbooked
+RECONCILE_SQL = """
+UPDATE events
+SET tickets_sold = counts.sold, total_tickets = GREATEST(events.total_tickets, counts.sold)
+FROM (
+    SELECT event_id, count(*) AS sold FROM tickets
+    WHERE status IN ('PAID', 'RESERVED') GROUP BY event_id
+) AS counts
+WHERE events.id = counts.event_id AND events.tickets_sold <> counts.sold
+"""
+
+
+async def count_rows(conn: AsyncConnection, table: str) -> int:
+    return (await conn.execute(text(f"SELECT count(*) FROM {table}"))).scalar_one()
+
+
+async def insert_batches(conn: AsyncConnection, sql: str, rows: int, batch_size: int, **params) -> None:
+    for first in range(1, rows + 1, batch_size):
+        last = min(first + batch_size - 1, rows)
+        await conn.execute(text("SET LOCAL synchronous_commit = off"))
+        await conn.execute(text(sql), {"first": first, "last": last, **params})
+        await conn.commit()
+
+
+async def grow_users(conn: AsyncConnection, rows: int, batch_size: int) -> int:
+    """Add users until the table holds ``rows``; returns how many were added"""
+    missing = rows - await count_rows(conn, "users")
+    if missing > 0:
+        await insert_batches(
+            conn, USERS_SQL, missing, batch_size, run=time.time_ns(),
+            min_lon=MIN_LON, max_lon=MAX_LON, min_lat=MIN_LAT, max_lat=MAX_LAT,
+        )
+    return max(missing, 0)
+
+
+async def grow_events(
+    conn: AsyncConnection, rows: int, batch_size: int,
+    min_capacity: int = 100, max_capacity: int = 5000,
+) -> int:
+    """Add events with upcoming start times and scattered venues"""
+    missing = rows - await count_rows(conn, "events")
+    if missing > 0:
+        await insert_batches(
+            conn, EVENTS_SQL, missing, batch_size,
+            min_capacity=min_capacity, max_capacity=max_capacity,
+            min_lon=MIN_LON, max_lon=MAX_LON, min_lat=MIN_LAT, max_lat=MAX_LAT,
+        )
+    return max(missing, 0)
+
+
+async def add_tickets(
+    conn: AsyncConnection,
+    rows: int,
+    batch_size: int,
+    paid_share: float = 0.7,
+    reserved_share: float = 0.05,
+    min_age_seconds: float = 0.0,
+    max_age_seconds: float = 90 * 24 * 3600.0,
+) -> int:
+    """Add ``rows`` tickets for random existing users and events.
+
+    ``paid_share`` and ``reserved_share`` of them are paid and reserved, the
+    rest expired; ``created_at`` lies between the two ages. Event
+    ``tickets_sold`` counters are reconciled afterwards.
+    """
+    if rows <= 0:
+        return 0
+    for table in ("users", "events"):
+        await conn.execute(text(f"DROP TABLE IF EXISTS datagen_{table}"))
+        for statement in SLOTS_SQL.format(table=table).split(";"):
+            await conn.execute(text(statement))
+    users = await count_rows(conn, "datagen_users")
+    events = await count_rows(conn, "datagen_events")
+    if not users or not events:
+        raise ValueError("Seed users and events before tickets")
+    await insert_batches(
+        conn, TICKETS_SQL, rows, batch_size,
+        paid_share=paid_share, reserved_share=reserved_share,
+        min_age=min_age_seconds, age_spread=max(max_age_seconds - min_age_seconds, 0.0),
+        users=users, events=events,
+    )
+    await conn.execute(text(RECONCILE_SQL))
+    await conn.commit()
+    return rows
+
+
+async def grow_tickets(conn: AsyncConnection, rows: int, batch_size: int, **options) -> int:
+    """Add tickets until the table holds ``rows``"""
+    return await add_tickets(conn, rows - await count_rows(conn, "tickets"), batch_size, **options)
+
+
+async def analyze(conn: AsyncConnection) -> None:
+    await conn.execute(text("ANALYZE users"))
+    await conn.execute(text("ANALYZE events"))
+    await conn.execute(text("ANALYZE tickets"))
+    await conn.commit()
+
+
+async def populate(
+    engine: AsyncEngine,
+    users: int = 0,
+    events: int = 0,
+    tickets: int = 0,
+    batch_size: int = 100000,
+    seed: Optional[float] = 0.42,
+) -> dict:
+    """Grow the tables to the given sizes and return rows added and rows/sec per table"""
+    added = {}
+    async with engine.connect() as conn:
+        if seed is not None:
+            await conn.execute(text("SELECT setseed(:seed)"), {"seed": seed})
+        for table, grow, rows in (
+            ("users", grow_users, users),
+            ("events", grow_events, events),
+            ("tickets", grow_tickets, tickets),
+        ):
+            start = time.perf_counter()
+            count = await grow(conn, rows, batch_size)
+            wall = time.perf_counter() - start
+            added[table] = {
+                "rows_added": count,
+                "wall_seconds": round(wall, 4),
+                "rows_per_second": round(count / wall, 2) if count and wall else 0.0,
+            }
+        await analyze(conn)
+    return added
+
+
+async def main(args):
+    engine = await create_bench_engine(pool_size=1, max_overflow=0)
+    try:
+        added = await populate(
+            engine, users=args.users, events=args.events, tickets=args.tickets,
+            batch_size=args.batch_size, seed=args.seed,
+        )
+        for table, result in added.items():
+            emit({"benchmark": "datagen", "params": {"table": table, "batch_size": args.batch_size}, **result})
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--tickets", type=int, default=1000000)
+    parser.add_argument("--batch-size", type=int, default=100000)
+    parser.add_argument("--seed", type=float, default=0.42, help="setseed() value, between -1 and 1")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,256 @@
+"""Scenarios of the benchmark suite, run by ``benchmarks.suite``.
+
+Each scenario takes an engine and a scale (see ``SCALES``) and returns
+result records in the ``summarize`` format. The shared population of users,
+events and tickets comes from ``benchmarks.datagen``; scenarios add only the
+rows they consume, such as the on-sale event or the expiry backlog.
+"""
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List
+
+from geoalchemy2.elements import WKTElement
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models import Event
+from app.repositories import EventRepository
+from app.schemas.ticket import TicketCreate
+from app.services.event import EventService
+from app.services.ticket import TicketService
+from benchmarks import datagen
+from benchmarks.common import run_concurrently, session_factory, summarize
+
+# Population and load per scale; "large" seeds millions of rows
+SCALES: Dict[str, dict] = {
+    "small": {
+        "users": 10000, "events": 10000, "tickets": 100000,
+        "concurrency": 50, "burst_purchases": 2000, "burst_capacity": 1500,
+        "steady_ops": 5000, "expiry_backlog": 50000, "geo_queries": 200,
+    },
+    "medium": {
+        "users": 100000, "events": 100000, "tickets": 1000000,
+        "concurrency": 100, "burst_purchases": 10000, "burst_capacity": 8000,
+        "steady_ops": 20000, "expiry_backlog": 200000, "geo_queries": 500,
+    },
+    "large": {
+        "users": 1000000, "events": 1000000, "tickets": 10000000,
+        "concurrency": 200, "burst_purchases": 50000, "burst_capacity": 40000,
+        "steady_ops": 50000, "expiry_backlog": 1000000, "geo_queries": 1000,
+    },
+}
+
+# Share of steady-state operations per kind
+STEADY_MIX = {"get_event": 0.6, "purchase": 0.25, "user_tickets": 0.15}
+
+GEO_RADII_KM = (1, 5, 10, 25)
+
+LOCK_WAITERS_SQL = """
+SELECT count(*) FROM pg_stat_activity
+WHERE datname = current_database() AND wait_event_type = 'Lock'
+"""
+
+
+class LockSampler:
+    """Samples how many backends wait on a heavyweight lock, e.g. an event row"""
+
+    def __init__(self, engine: AsyncEngine, interval: float = 0.05):
+        self.engine = engine
+        self.interval = interval
+        self.samples: List[int] = []
+        self._task = None
+
+    async def _run(self) -> None:
+        async with self.engine.connect() as conn:
+            while True:
+                self.samples.append((await conn.execute(text(LOCK_WAITERS_SQL))).scalar_one())
+                await conn.rollback()
+                await asyncio.sleep(self.interval)
+
+    async def __aenter__(self) -> "LockSampler":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def stats(self) -> dict:
+        if not self.samples:
+            return {"samples": 0, "mean_waiters": 0.0, "max_waiters": 0}
+        return {
+            "samples": len(self.samples),
+            "mean_waiters": round(sum(self.samples) / len(self.samples), 2),
+            "max_waiters": max(self.samples),
+        }
+
+
+async def sample_ids(engine: AsyncEngine, table: str, count: int, seed: int) -> List[int]:
+    """Random ids of ``table``, repeatable for a given ``seed`` and table state"""
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT setseed(:seed)"), {"seed": (seed % 1000) / 1000.0})
+        ids = (await conn.execute(
+            text(f"SELECT id FROM {table} ORDER BY random() LIMIT :count"), {"count": count}
+        )).scalars().all()
+    if not ids:
+        raise ValueError(f"No rows in {table}; run benchmarks.datagen first")
+    return list(ids)
+
+
+async def prepare(engine: AsyncEngine, scale: dict) -> None:
+    """Grow the shared population to the scale's size"""
+    await datagen.populate(engine, users=scale["users"], events=scale["events"], tickets=scale["tickets"])
+
+
+async def onsale_burst(engine: AsyncEngine, scale: dict, seed: int) -> List[dict]:
+    """Every client buys for one freshly opened event at the same time.
+
+    More attempts than seats are made, so the end of the run measures the
+    sold-out path too. Lock waiters show the contention on the event row.
+    """
+    sessions = session_factory(engine)
+    user_ids = await sample_ids(engine, "users", scale["burst_purchases"], seed)
+    async with sessions() as db:
+        event = Event(
+            title="Bench on-sale burst",
+            start_time=datetime.now(timezone.utc) + timedelta(days=30),
+            end_time=datetime.now(timezone.utc) + timedelta(days=30, hours=3),
+            total_tickets=scale["burst_capacity"],
+            tickets_sold=0,
+            venue_address="Bench Arena",
+            venue_location=WKTElement("POINT(3.3792 6.5244)", srid=4326),
+        )
+        db.add(event)
+        await db.commit()
+        event_id = event.id
+
+    async def purchase(i):
+        user_id = user_ids[i % len(user_ids)]
+        async with sessions() as db:
+            await TicketService(db).create_ticket(TicketCreate(user_id=user_id, event_id=event_id))
+
+    async with LockSampler(engine) as locks:
+        start = time.perf_counter()
+        latencies = await run_concurrently(purchase, scale["concurrency"], scale["burst_purchases"])
+        wall = time.perf_counter() - start
+
+    async with sessions() as db:
+        sold = (await db.get(Event, event_id)).tickets_sold
+    result = summarize(
+        "suite.onsale_burst",
+        latencies,
+        wall,
+        concurrency=scale["concurrency"],
+        attempts=scale["burst_purchases"],
+        capacity=scale["burst_capacity"],
+    )
+    result["tickets_sold"] = sold
+    result["rejected"] = scale["burst_purchases"] - len(latencies)
+    result["oversold"] = max(sold - scale["burst_capacity"], 0)
+    result["lock_waits"] = locks.stats()
+    return [result]
+
+
+async def steady_state(engine: AsyncEngine, scale: dict, seed: int) -> List[dict]:
+    """Mixed traffic spread over many events: event pages, purchases, ticket history"""
+    sessions = session_factory(engine)
+    rng = random.Random(seed)
+    event_ids = await sample_ids(engine, "events", 10000, seed)
+    user_ids = await sample_ids(engine, "users", 10000, seed)
+    kinds = rng.choices(list(STEADY_MIX), weights=list(STEADY_MIX.values()), k=scale["steady_ops"])
+    picks = [(rng.choice(event_ids), rng.choice(user_ids)) for _ in kinds]
+
+    async def get_event(db, event_id, user_id):
+        await EventService(db).get_event_by_id(event_id)
+
+    async def purchase(db, event_id, user_id):
+        await TicketService(db).create_ticket(TicketCreate(user_id=user_id, event_id=event_id))
+
+    async def user_tickets(db, event_id, user_id):
+        await TicketService(db).get_tickets_by_user(user_id)
+
+    operations: Dict[str, Callable[..., Awaitable[None]]] = {
+        "get_event": get_event, "purchase": purchase, "user_tickets": user_tickets,
+    }
+    latencies: Dict[str, List[float]] = {kind: [] for kind in STEADY_MIX}
+
+    async def operation(i):
+        kind = kinds[i]
+        start = time.perf_counter()
+        async with sessions() as db:
+            await operations[kind](db, *picks[i])
+        latencies[kind].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    overall = await run_concurrently(operation, scale["concurrency"], len(kinds))
+    wall = time.perf_counter() - start
+
+    params = {"concurrency": scale["concurrency"], "events": len(event_ids), "ops": len(kinds)}
+    results = [summarize("suite.steady_state", overall, wall, operation="all", **params)]
+    # Mostly purchases for events that sold out during the run
+    results[0]["errors"] = len(kinds) - len(overall)
+    for kind, samples in latencies.items():
+        results.append(summarize("suite.steady_state", samples, wall, operation=kind, **params))
+    return results
+
+
+async def expiry_backlog(engine: AsyncEngine, scale: dict, seed: int) -> List[dict]:
+    """Time the expiry sweep draining a backlog of stale reservations"""
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT setseed(:seed)"), {"seed": (seed % 1000) / 1000.0})
+        await datagen.add_tickets(
+            conn, scale["expiry_backlog"], batch_size=100000,
+            paid_share=0.0, reserved_share=1.0,
+            min_age_seconds=3600.0, max_age_seconds=7200.0,
+        )
+        await conn.execute(text("ANALYZE tickets"))
+        await conn.commit()
+
+    sessions = session_factory(engine)
+    start = time.perf_counter()
+    async with sessions() as db:
+        expired = await TicketService(db).expire_old_tickets()
+    wall = time.perf_counter() - start
+
+    result = summarize("suite.expiry_backlog", [wall], wall, backlog=scale["expiry_backlog"])
+    result["expired"] = expired
+    result["rows_per_second"] = round(expired / wall, 2) if wall else 0.0
+    return [result]
+
+
+async def geo_search(engine: AsyncEngine, scale: dict, seed: int) -> List[dict]:
+    """Nearby-event search latency per radius over the whole events table"""
+    sessions = session_factory(engine)
+    rng = random.Random(seed)
+    async with engine.connect() as conn:
+        rows = await datagen.count_rows(conn, "events")
+
+    results = []
+    for radius_km in GEO_RADII_KM:
+        latencies = []
+        async with sessions() as db:
+            repository = EventRepository(db)
+            for _ in range(scale["geo_queries"]):
+                latitude = rng.uniform(datagen.MIN_LAT, datagen.MAX_LAT)
+                longitude = rng.uniform(datagen.MIN_LON, datagen.MAX_LON)
+                start = time.perf_counter()
+                await repository.get_nearby_events(latitude, longitude, radius_km, limit=20)
+                latencies.append(time.perf_counter() - start)
+                db.expunge_all()
+        result = summarize("suite.geo_search", latencies, sum(latencies), radius_km=radius_km, limit=20)
+        result["events"] = rows
+        results.append(result)
+    return results
+
+
+SCENARIOS: Dict[str, Callable[[AsyncEngine, dict, int], Awaitable[List[dict]]]] = {
+    "onsale_burst": onsale_burst,
+    "steady_state": steady_state,
+    "expiry_backlog": expiry_backlog,
+    "geo_search": geo_search,
+}
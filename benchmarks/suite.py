@@ -0,0 +1,82 @@
+"""Benchmark suite: seeds a population, runs the scenarios, records results.
+
+Scenarios (``benchmarks.scenarios``): ``onsale_burst`` (one event, every
+client at once), ``steady_state`` (mixed reads and purchases over many
+events), ``expiry_backlog`` (sweep draining stale reservations) and
+``geo_search`` (nearby search over the whole events table). Each result is
+one JSON line tagged with the run id, scale, commit and repeat number;
+``--output`` appends them to a file that ``benchmarks.compare`` can diff
+against a baseline. The Redis cache tier is disabled, so only PostgreSQL
+is needed.
+
+    python -m benchmarks.suite --scale small --repeat 3 --output results/main.jsonl
+    python -m benchmarks.suite --scale large --scenarios onsale_burst geo_search
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.cache import registered_caches
+import app.services.event_cache  # noqa: F401  (registers the event caches)
+from benchmarks.common import create_bench_engine, emit
+from benchmarks.scenarios import SCALES, SCENARIOS, prepare
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args):
+    scale = SCALES[args.scale]
+    for cache in registered_caches():
+        cache.use_redis(None)
+    run = {
+        "id": args.run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        "scale": args.scale,
+        "commit": git_commit(),
+        "seed": args.seed,
+    }
+    output = None
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        output = open(args.output, "a")
+    # One connection per client, plus one for the lock sampler
+    engine = await create_bench_engine(pool_size=scale["concurrency"] + 1, max_overflow=0)
+    try:
+        if not args.skip_prepare:
+            start = time.perf_counter()
+            await prepare(engine, scale)
+            print(f"population ready in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        for repeat in range(args.repeat):
+            for name in args.scenarios:
+                for result in await SCENARIOS[name](engine, scale, args.seed + repeat):
+                    result["run"] = {**run, "scenario": name, "repeat": repeat}
+                    emit(result)
+                    if output:
+                        emit(result, output)
+    finally:
+        await engine.dispose()
+        if output:
+            output.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--run-id", help="Label of this run (default: UTC timestamp)")
+    parser.add_argument("--output", help="Append JSON result lines to this file")
+    parser.add_argument("--skip-prepare", action="store_true", help="Use the database as seeded")
+    asyncio.run(main(parser.parse_args()))
@@ -15,6 +15,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 # Import the Base class from database.py
 from app.database import Base
 from app.config import get_settings
+import app.models  # noqa: F401  (register tables on Base.metadata)
 
 # Exclude PostGIS schemas from autogenerate
 # This prevents Alembic from trying to manage PostGIS tables
@@ -0,0 +1,68 @@
+"""initial schema
+
+Revision ID: 0a4c8e2f6b91
+Revises:
+Create Date: 2026-10-17 07:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geography
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a4c8e2f6b91'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('location', Geography(geometry_type='POINT', srid=4326), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_superuser', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_table(
+        'events',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('total_tickets', sa.Integer(), nullable=False),
+        sa.Column('tickets_sold', sa.Integer(), nullable=True),
+        sa.Column('venue_address', sa.String(), nullable=False),
+        sa.Column('venue_location', Geography(geometry_type='POINT', srid=4326), nullable=False),
+    )
+    op.create_index('ix_events_id', 'events', ['id'])
+    op.create_table(
+        'tickets',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('status', sa.Enum('RESERVED', 'PAID', 'EXPIRED', name='ticketstatus'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('payment_reference', sa.String(), nullable=True),
+        sa.Column('paid_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('event_id', sa.Integer(), sa.ForeignKey('events.id'), nullable=False),
+    )
+    op.create_index('ix_tickets_id', 'tickets', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_table('tickets')
+    op.drop_table('events')
+    op.drop_table('users')
+    sa.Enum(name='ticketstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""add reserved ticket expiry index
+
+Revision ID: 1c9e5b7d3a42
+Revises: f2c8a6d41e07
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c9e5b7d3a42'
+down_revision: Union[str, None] = 'f2c8a6d41e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The expiry sweep claims stale reservations by created_at; only the
+    # RESERVED slice is indexed, so paid and expired tickets cost nothing
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_reserved_created_at "
+            "ON tickets (created_at) WHERE status = 'RESERVED'"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tickets_reserved_created_at")
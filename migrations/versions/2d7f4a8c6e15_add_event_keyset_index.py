@@ -0,0 +1,34 @@
+"""add event keyset pagination index
+
+Revision ID: 2d7f4a8c6e15
+Revises: 1c9e5b7d3a42
+Create Date: 2026-10-17 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d7f4a8c6e15'
+down_revision: Union[str, None] = '1c9e5b7d3a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The event listing seeks on (start_time, id), so every page is an index
+    # range scan instead of a sort of the whole table
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_start_time_id "
+            "ON events (start_time, id)"
+        )
+        op.execute("ANALYZE events")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_events_start_time_id")
@@ -0,0 +1,43 @@
+"""add GiST indexes for geospatial search
+
+Revision ID: 7b2e4f91c0a3
+Revises: b8f4e2a9c617
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4f91c0a3'
+down_revision: Union[str, None] = 'b8f4e2a9c617'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, column, index GeoAlchemy2 creates implicitly with create_all)
+SPATIAL_INDEXES = [
+    ("ix_events_venue_location", "events", "venue_location", "idx_events_venue_location"),
+    ("ix_users_location", "users", "location", "idx_users_location"),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while large indexes build;
+    # it cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, table, column, implicit_name in SPATIAL_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} USING gist ({column})"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {implicit_name}")
+            op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in SPATIAL_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
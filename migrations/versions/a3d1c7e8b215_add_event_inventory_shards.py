@@ -0,0 +1,35 @@
+"""add event inventory shards
+
+Revision ID: a3d1c7e8b215
+Revises: 0a4c8e2f6b91
+Create Date: 2026-10-17 08:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d1c7e8b215'
+down_revision: Union[str, None] = '0a4c8e2f6b91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'event_inventory_shards',
+        sa.Column('event_id', sa.Integer(), sa.ForeignKey('events.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('shard_no', sa.Integer(), primary_key=True),
+        sa.Column('capacity', sa.Integer(), nullable=False),
+        sa.Column('sold', sa.Integer(), nullable=False),
+        sa.CheckConstraint('sold >= 0 AND sold <= capacity', name='ck_event_inventory_shards_sold'),
+    )
+    op.add_column('tickets', sa.Column('inventory_shard', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('tickets', 'inventory_shard')
+    op.drop_table('event_inventory_shards')
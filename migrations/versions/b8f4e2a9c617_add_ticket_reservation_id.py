@@ -0,0 +1,30 @@
+"""add ticket reservation id
+
+Revision ID: b8f4e2a9c617
+Revises: a3d1c7e8b215
+Create Date: 2026-10-17 08:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f4e2a9c617'
+down_revision: Union[str, None] = 'a3d1c7e8b215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tickets', sa.Column('reservation_id', sa.BigInteger(), nullable=True))
+    # Same name create_all gives Column(unique=True); the ledger flush
+    # inserts with ON CONFLICT (reservation_id)
+    op.create_unique_constraint('tickets_reservation_id_key', 'tickets', ['reservation_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('tickets_reservation_id_key', 'tickets', type_='unique')
+    op.drop_column('tickets', 'reservation_id')
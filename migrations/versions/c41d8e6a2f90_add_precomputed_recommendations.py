@@ -0,0 +1,53 @@
+"""add precomputed recommendations
+
+Revision ID: c41d8e6a2f90
+Revises: 7b2e4f91c0a3
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8e6a2f90'
+down_revision: Union[str, None] = '7b2e4f91c0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'events',
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.create_index('ix_events_created_at', 'events', ['created_at'])
+    op.create_index(
+        'ix_tickets_paid_paid_at', 'tickets', ['paid_at'],
+        postgresql_where=sa.text("status = 'PAID'"),
+    )
+    op.create_table(
+        'user_recommendations',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('event_ids', postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column('scores', postgresql.ARRAY(sa.REAL()), nullable=False),
+        sa.Column('built_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        'recommendation_builds',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('users_built', sa.Integer(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('recommendation_builds')
+    op.drop_table('user_recommendations')
+    op.drop_index('ix_tickets_paid_paid_at', table_name='tickets')
+    op.drop_index('ix_events_created_at', table_name='events')
+    op.drop_column('events', 'created_at')
@@ -0,0 +1,33 @@
+"""unique ticket payment reference
+
+Revision ID: e5a7d3b19c42
+Revises: c41d8e6a2f90
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7d3b19c42'
+down_revision: Union[str, None] = 'c41d8e6a2f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fails if a reference is already shared by several tickets; those rows
+    # have to be sorted out by hand first
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_payment_reference "
+            "ON tickets (payment_reference)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tickets_payment_reference")
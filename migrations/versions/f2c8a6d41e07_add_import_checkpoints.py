@@ -0,0 +1,38 @@
+"""add import checkpoints
+
+Revision ID: f2c8a6d41e07
+Revises: e5a7d3b19c42
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8a6d41e07'
+down_revision: Union[str, None] = 'e5a7d3b19c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'import_checkpoints',
+        sa.Column('job', sa.String(), primary_key=True),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('records_done', sa.BigInteger(), nullable=False),
+        sa.Column('rows_loaded', sa.BigInteger(), nullable=False),
+        sa.Column('rows_rejected', sa.BigInteger(), nullable=False),
+        sa.Column('byte_offset', sa.BigInteger(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('import_checkpoints')
@@ -4,12 +4,19 @@ from typing import AsyncGenerator
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from httpx import AsyncClient
+from fakeredis import aioredis
 from geoalchemy2.elements import WKTElement
 
-from app.database import Base
+from app.cache import clear_local_caches, registered_caches
+from app.database import Base, get_read_db, get_read_sessionmaker, get_sessionmaker
+from app.db_replica import ReplicaRouter
 from app.main import app
-from app.api.deps import get_db
+from app.api.deps import get_db, get_expiry_scheduler
 from app.models import User, Event
+from app.redis_client import get_redis
+from app.services.auth import AuthService
+from app.services.bulk_import import BulkImporter, asyncpg_dsn
+from app.services.expiry_scheduler import ExpiryScheduler
 
 # Test database URL - using 'db' as the hostname to connect to the database container
 TEST_DATABASE_URL = "postgresql+asyncpg://postgres:postgres@db:5432/eventdb_test"
@@ -18,6 +25,11 @@ TEST_DATABASE_URL = "postgresql+asyncpg://postgres:postgres@db:5432/eventdb_test
 test_engine = create_async_engine(TEST_DATABASE_URL, echo=True)
 TestSessionLocal = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
 
+# A second, standalone database stands in for the read replica
+TEST_REPLICA_DATABASE_URL = "postgresql+asyncpg://postgres:postgres@db:5432/eventdb_test_replica"
+test_replica_engine = create_async_engine(TEST_REPLICA_DATABASE_URL)
+TestReplicaSessionLocal = async_sessionmaker(test_replica_engine, class_=AsyncSession, expire_on_commit=False)
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -31,6 +43,17 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def isolated_caches():
+    """Give every test empty caches backed by a throwaway fake Redis."""
+    redis = aioredis.FakeRedis(decode_responses=True)
+    clear_local_caches()
+    for cache in registered_caches():
+        cache.use_redis(redis)
+    yield
+    clear_local_caches()
+
+
 @pytest.fixture(scope="function")
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create a fresh database session for each test."""
@@ -57,7 +80,17 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db():
         yield db_session
     
+    redis = aioredis.FakeRedis(decode_responses=True)
+    
     app.dependency_overrides[get_db] = override_get_db
+    # Reads see the test's own writes; replica routing has its own fixture
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_read_sessionmaker] = lambda: TestSessionLocal
+    app.dependency_overrides[get_redis] = lambda: redis
+    # Streaming endpoints open their own sessions on the test database
+    app.dependency_overrides[get_sessionmaker] = lambda: TestSessionLocal
+    # Keep expiry scheduling local instead of publishing tasks to Celery
+    app.dependency_overrides[get_expiry_scheduler] = lambda: ExpiryScheduler(redis, enqueue=lambda deadline: None)
     
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
@@ -65,6 +98,32 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+async def replica_sessions() -> AsyncGenerator[async_sessionmaker, None]:
+    """Session factory of the stand-in replica database, with fresh tables"""
+    async with test_replica_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield TestReplicaSessionLocal
+
+
+@pytest.fixture(scope="function")
+def replica_client(client: AsyncClient, replica_sessions: async_sessionmaker) -> AsyncClient:
+    """Test client whose read-only routes are routed between primary and replica"""
+    router = ReplicaRouter(TestSessionLocal, replica_sessions)
+    app.dependency_overrides.pop(get_read_db)
+    app.dependency_overrides[get_read_sessionmaker] = router.sessions_for
+    return client
+
+
+@pytest.fixture(scope="function")
+def importer(db_session: AsyncSession) -> BulkImporter:
+    """Bulk importer writing to the freshly created test tables"""
+    return BulkImporter(
+        dsn=asyncpg_dsn(TEST_DATABASE_URL), batch_rows=2, workers=0, progress=lambda progress: None
+    )
+
+
 @pytest.fixture
 async def sample_user(db_session: AsyncSession) -> User:
     """Create a sample user for testing."""
@@ -96,4 +155,19 @@ async def sample_event(db_session: AsyncSession, sample_user: User) -> Event:
     db_session.add(event)
     await db_session.commit()
     await db_session.refresh(event)
-    return event
\ No newline at end of file
+    return event
+
+
+@pytest.fixture
+async def superuser_headers(db_session: AsyncSession) -> dict:
+    """Authorization headers of a freshly created superuser, for the admin routes."""
+    user = User(
+        name="Admin User",
+        email="admin@example.com",
+        hashed_password="$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW",
+        is_superuser=True
+    )
+    db_session.add(user)
+    await db_session.commit()
+    token = AuthService(db_session).create_access_token({"sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from fastapi import HTTPException, status
+from httpx import AsyncClient
+from passlib.context import CryptContext
+
+from app.models import User
+from app.services.auth import AuthService, principal_cache
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy
+
+class CountingAuthService(AuthService):
+    """AuthService whose user lookups hit an in-memory user instead of the DB"""
+
+    def __init__(self, user):
+        super().__init__(db=None)
+        self.user = user
+        self.lookups = 0
+
+    async def get_user(self, email):
+        self.lookups += 1
+        return self.user if self.user and self.user.email == email else None
+
+@pytest.mark.asyncio
+async def test_get_current_user_caches_principal():
+    user = User(id=1, email="cached@example.com", name="Cached", hashed_password="x",
+                is_active=True, is_superuser=False, created_at=datetime.now(timezone.utc))
+    service = CountingAuthService(user)
+    token = service.create_access_token({"sub": user.email})
+
+    first = await service.get_current_user(token)
+    second = await service.get_current_user(token)
+    assert service.lookups == 1
+    assert (second.id, second.email) == (first.id, first.email)
+    assert second.hashed_password is None
+
+    # Sensitive routes bypass the cache
+    await service.get_current_user(token, use_cache=False)
+    assert service.lookups == 2
+
+    # A deactivated user is rejected once the cached principal is dropped
+    user.is_active = False
+    principal_cache.delete(user.email)
+    with pytest.raises(HTTPException):
+        await service.get_current_user(token)
+
+@pytest.mark.asyncio
+async def test_deactivated_user_loses_access(client: AsyncClient, sample_user, db_session):
+    login_response = await client.post(
+        "/api/v1/auth/login", data={"username": sample_user.email, "password": "testpassword"}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    response = await client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["email"] == sample_user.email
+
+    await AuthService(db_session).deactivate_user(sample_user.id)
+
+    response = await client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+@pytest.mark.asyncio
+async def test_password_hasher_upgrades_outdated_cost():
+    old = PasswordHasher(CryptContext(schemes=["bcrypt"], bcrypt__rounds=4), max_workers=1, max_pending=4)
+    new = PasswordHasher(CryptContext(schemes=["bcrypt"], bcrypt__rounds=5), max_workers=1, max_pending=4)
+    hashed = await old.hash("secret-password")
+
+    assert await new.verify_and_update("wrong-password", hashed) == (False, None)
+    verified, new_hash = await new.verify_and_update("secret-password", hashed)
+    assert verified and new_hash.startswith("$2b$05$")
+    assert await new.verify_and_update("secret-password", new_hash) == (True, None)
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_beyond_admission_limit():
+    hasher = PasswordHasher(CryptContext(schemes=["bcrypt"], bcrypt__rounds=8), max_workers=1, max_pending=2)
+    results = await asyncio.gather(
+        *(hasher.hash("secret-password") for _ in range(4)), return_exceptions=True
+    )
+    assert sum(isinstance(result, PasswordHasherBusy) for result in results) == 2
+    assert hasher.rejected == 2
+    # Slots are handed back once the work finishes
+    assert await hasher.verify("secret-password", results[0])
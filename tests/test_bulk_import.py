@@ -0,0 +1,140 @@
+import json
+import pytest
+import shapely
+from pydantic import ValidationError
+from shapely.geometry import Point
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Event, ImportCheckpoint, Ticket, TicketStatus
+from app.repositories.recommendation import RecommendationRepository
+from app.schemas.bulk_import import TicketImport, UserImport
+from app.services.bulk_import import (
+    EventLoader, encode_chunk, ewkb_point, parse_chunk, read_chunks, read_header,
+)
+
+BCRYPT_HASH = "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW"
+
+EVENTS_CSV = """title,description,start_time,end_time,total_tickets,venue_address,latitude,longitude
+Afrobeats Night,,2030-01-01T20:00:00Z,2030-01-01T23:00:00Z,2,Eko Hotel,6.4281,3.4283
+Broken Row,,2030-01-02T20:00:00Z,2030-01-02T23:00:00Z,0,Nowhere,6.5,3.4
+Jazz Brunch,Live band,2030-01-03T11:00:00Z,2030-01-03T14:00:00Z,50,Terra Kulture,6.4355,3.4217
+"""
+
+
+def test_ewkb_point_matches_postgis_extended_wkb():
+    point = shapely.set_srid(Point(3.4283, 6.4281), 4326)
+    expected = shapely.to_wkb(point, byte_order=1, include_srid=True, flavor="extended")
+    assert ewkb_point(6.4281, 3.4283) == expected
+
+
+def test_event_records_validate_in_batches(tmp_path):
+    path = tmp_path / "events.csv"
+    path.write_text(EVENTS_CSV)
+    header, start = read_header(str(path), "csv")
+    [(data, offset)] = read_chunks(str(path), "csv", start, 10)
+    assert offset == path.stat().st_size
+
+    items, errors = EventLoader().validate(parse_chunk("csv", header, data))
+    assert [index for index, _ in items] == [0, 2]
+    assert items[0][1].venue.latitude == 6.4281
+    assert items[0][1].description is None
+    assert "total_tickets" in errors[1]
+
+    count, rows, errors, invalid = encode_chunk("events", "csv", header, data)
+    assert count == 3 and [index for index, _ in rows] == [0, 2] and list(invalid) == [1]
+    assert rows[0][1][8] == ewkb_point(6.4281, 3.4283)
+
+    path = tmp_path / "events.ndjson"
+    nested = {
+        "title": "Nested", "start_time": "2030-01-01T20:00:00Z", "end_time": "2030-01-01T23:00:00Z",
+        "total_tickets": 5, "venue": {"address": "Somewhere", "latitude": 1.0, "longitude": 2.0},
+    }
+    path.write_text(json.dumps(nested) + "\n{not json\n")
+    items, errors = EventLoader().validate(parse_chunk("ndjson", None, path.read_bytes()))
+    assert len(items) == 1 and list(errors) == [1]
+
+
+def test_csv_chunks_keep_quoted_newlines_together(tmp_path):
+    path = tmp_path / "events.csv"
+    path.write_text('title,description\nA,"two\nlines"\nB,plain\nC,"x"\n')
+    header, start = read_header(str(path), "csv")
+    chunks = list(read_chunks(str(path), "csv", start, 1))
+    assert [len(parse_chunk("csv", header, data)) for data, _ in chunks] == [1, 1, 1]
+    assert parse_chunk("csv", header, chunks[0][0])[0]["description"] == "two\nlines"
+    # Resuming from a chunk's end offset reads the remaining records
+    rest = list(read_chunks(str(path), "csv", chunks[0][1], 10))
+    assert [record["title"] for record in parse_chunk("csv", header, rest[0][0])] == ["B", "C"]
+
+
+def test_import_schemas():
+    user = UserImport(name="Ada", email="ada@example.com", hashed_password=BCRYPT_HASH)
+    assert user.latitude is None
+    with pytest.raises(ValidationError):
+        UserImport(name="Ada", email="ada@example.com", hashed_password="plaintext")
+    assert TicketImport(user_id=1, event_id=2).status == TicketStatus.PAID
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_loads_resumes_and_counts_seats(
+    importer, sample_user, db_session: AsyncSession, tmp_path
+):
+    events_path = tmp_path / "events.csv"
+    events_path.write_text(EVENTS_CSV)
+
+    progress = await importer.run("events", str(events_path))
+    assert (progress.loaded, progress.rejected, progress.finished) == (2, 1, True)
+    events = {event.title: event for event in (await db_session.execute(select(Event))).scalars()}
+    assert set(events) == {"Afrobeats Night", "Jazz Brunch"}
+
+    # Finished jobs are not loaded twice
+    progress = await importer.run("events", str(events_path))
+    assert progress.loaded == 2 and progress.resumed_from == 3
+    assert (await db_session.execute(select(func.count()).select_from(Event))).scalar_one() == 2
+
+    event_id = events["Afrobeats Night"].id
+    tickets_path = tmp_path / "tickets.ndjson"
+    tickets_path.write_text("".join(json.dumps(ticket) + "\n" for ticket in [
+        {"user_id": sample_user.id, "event_id": event_id, "payment_reference": "pay-1"},
+        {"user_id": sample_user.id, "event_id": event_id, "payment_reference": "pay-1"},
+        {"user_id": sample_user.id, "event_id": event_id, "status": "expired"},
+        {"user_id": sample_user.id, "event_id": event_id, "status": "reserved"},
+        {"user_id": sample_user.id, "event_id": event_id},
+        {"user_id": sample_user.id + 1000, "event_id": event_id},
+    ]))
+    rejects = tmp_path / "tickets.rejects.ndjson"
+    progress = await importer.run("tickets", str(tickets_path), rejects=str(rejects))
+
+    assert (progress.loaded, progress.rejected) == (3, 3)
+    reasons = [json.loads(line)["error"] for line in rejects.read_text().splitlines()]
+    assert reasons == [
+        "Payment reference already used for another ticket",
+        "No tickets available for this event",
+        "User not found",
+    ]
+    db_session.expire_all()
+    assert (await db_session.get(Event, event_id)).tickets_sold == 2
+    statuses = (await db_session.execute(select(Ticket.status).order_by(Ticket.id))).scalars().all()
+    assert statuses == [TicketStatus.PAID, TicketStatus.EXPIRED, TicketStatus.RESERVED]
+    checkpoint = await db_session.get(ImportCheckpoint, progress.job)
+    assert checkpoint.records_done == 6 and checkpoint.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_imported_purchases_reach_the_next_recommendation_build(
+    importer, sample_user, sample_event, db_session: AsyncSession, tmp_path
+):
+    repository = RecommendationRepository(db_session)
+    await repository.save({sample_user.id: ([], [])}, func.now())
+    await db_session.commit()
+    now = (await db_session.execute(select(func.now()))).scalar_one()
+    assert await repository.changed_user_ids(now, now, 50) == []
+
+    # A year-old purchase is far behind the watermark
+    tickets_path = tmp_path / "tickets.ndjson"
+    tickets_path.write_text(json.dumps({
+        "user_id": sample_user.id, "event_id": sample_event.id, "paid_at": "2025-01-01T12:00:00Z",
+    }) + "\n")
+    assert (await importer.run("tickets", str(tickets_path))).loaded == 1
+
+    assert await repository.changed_user_ids(now, now, 50) == [sample_user.id]
@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime, timezone
+from fakeredis import aioredis
+
+from app.cache import TTLCache, TwoTierCache
+from app.models import Ticket, TicketStatus
+from app.services.payment_cache import payment_cache
+from app.services.ticket import TicketService
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1, ttl=-1)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+@pytest.mark.asyncio
+async def test_two_tier_cache_reads_through_redis():
+    redis = aioredis.FakeRedis(decode_responses=True)
+    writer = TwoTierCache("test_writer", local_maxsize=10, local_ttl=60, redis_ttl=60)
+    reader = TwoTierCache("test_reader", local_maxsize=10, local_ttl=60, redis_ttl=60)
+    writer.use_redis(redis)
+    reader.use_redis(redis)
+    # Both share one Redis namespace, as two processes would
+    reader.name = writer.name
+
+    await writer.set(1, {"title": "Concert"})
+    assert await reader.get(1) == {"title": "Concert"}
+    assert reader.stats()["redis"]["hits"] == 1
+
+    # Served from the local tier now, even after Redis drops the key
+    await redis.flushall()
+    assert await reader.get(1) == {"title": "Concert"}
+    assert reader.stats()["local"]["hits"] == 1
+
+    await reader.delete(1)
+    assert await reader.get(1) is None
+    assert reader.stats()["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_repeat_payment_answered_from_cache():
+    paid_at = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    ticket = Ticket(
+        id=7, user_id=1, event_id=2, status=TicketStatus.PAID,
+        created_at=paid_at, payment_reference="pay_7", paid_at=paid_at,
+    )
+    await payment_cache.store([ticket])
+
+    # No session: a repeat confirmation must not reach the database
+    service = TicketService(None)
+    repeat = await service.pay_ticket(7, "pay_7", datetime.now(timezone.utc))
+    assert (repeat.id, repeat.status, repeat.paid_at) == (7, TicketStatus.PAID, paid_at)
+
+    with pytest.raises(ValueError):
+        await service.pay_ticket(8, "pay_7", datetime.now(timezone.utc))
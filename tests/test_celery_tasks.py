@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import patch, MagicMock
@@ -10,14 +11,10 @@ from app.services.ticket import TicketService
 
 @pytest.mark.asyncio
 async def test_expire_ticket(db_session: AsyncSession, sample_user, sample_event):
-    # Get the actual user and event objects by awaiting the fixtures
-    user = await sample_user
-    event = await sample_event
-    
     # Create a ticket that should expire
     ticket = Ticket(
-        user_id=user.id,
-        event_id=event.id,
+        user_id=sample_user.id,
+        event_id=sample_event.id,
         status=TicketStatus.RESERVED,
         created_at=datetime.now(timezone.utc) - timedelta(minutes=3)  # 3 minutes old
     )
@@ -46,16 +43,12 @@ async def test_expire_ticket(db_session: AsyncSession, sample_user, sample_event
 
 @pytest.mark.asyncio
 async def test_expire_old_tickets(db_session: AsyncSession, sample_user, sample_event):
-    # Get the actual user and event objects by awaiting the fixtures
-    user = await sample_user
-    event = await sample_event
-    
     # Create multiple tickets that should expire
     tickets = []
     for i in range(3):
         ticket = Ticket(
-            user_id=user.id,
-            event_id=event.id,
+            user_id=sample_user.id,
+            event_id=sample_event.id,
             status=TicketStatus.RESERVED,
             created_at=datetime.now(timezone.utc) - timedelta(minutes=3)  # 3 minutes old
         )
@@ -81,4 +74,66 @@ async def test_expire_old_tickets(db_session: AsyncSession, sample_user, sample_
     
     # Verify all tickets are expired
     result = await db_session.execute(select(Ticket).where(Ticket.status == TicketStatus.EXPIRED))
-    assert len(result.scalars().all()) == 3
\ No newline at end of file
+    assert len(result.scalars().all()) == 3
+
+@pytest.mark.asyncio
+async def test_expire_old_tickets_releases_seats(db_session: AsyncSession, sample_user, sample_event):
+    sample_event.tickets_sold = 3
+    stale = datetime.now(timezone.utc) - timedelta(minutes=3)
+    tickets = [
+        Ticket(user_id=sample_user.id, event_id=sample_event.id, status=TicketStatus.RESERVED, created_at=stale),
+        Ticket(user_id=sample_user.id, event_id=sample_event.id, status=TicketStatus.RESERVED, created_at=stale),
+        Ticket(user_id=sample_user.id, event_id=sample_event.id, status=TicketStatus.RESERVED,
+               created_at=datetime.now(timezone.utc)),
+    ]
+    db_session.add_all(tickets)
+    await db_session.commit()
+
+    # A batch size smaller than the backlog exercises the batching loop
+    expired_count = await TicketService(db_session).expire_old_tickets(batch_size=1)
+    assert expired_count == 2
+
+    await db_session.refresh(sample_event)
+    assert sample_event.tickets_sold == 1
+    result = await db_session.execute(select(Ticket).where(Ticket.status == TicketStatus.RESERVED))
+    assert [ticket.id for ticket in result.scalars().all()] == [tickets[2].id]
+
+@pytest.mark.asyncio
+async def test_expiry_scheduler_coalesces_same_second():
+    from fakeredis import aioredis
+    from app.services.expiry_scheduler import ExpiryScheduler
+
+    enqueued = []
+    scheduler = ExpiryScheduler(aioredis.FakeRedis(decode_responses=True), enqueue=enqueued.append)
+    created_at = datetime(2030, 1, 1, 12, 0, 0, 250000, tzinfo=timezone.utc)
+
+    deadline = await scheduler.schedule(1, created_at)
+    await scheduler.schedule_many([(2, created_at), (3, created_at + timedelta(milliseconds=500))])
+    later = await scheduler.schedule(4, created_at + timedelta(seconds=1))
+
+    # Tickets expiring in the same second share one queued task
+    assert enqueued == [deadline, later]
+    assert deadline == int((created_at + timedelta(minutes=2)).timestamp()) + 1
+    assert sorted(await scheduler.due(deadline)) == [1, 2, 3]
+
+    await scheduler.discard([1, 2, 3])
+    assert await scheduler.due(later) == [4]
+
+def test_worker_runtime_reuses_loop_and_engine():
+    from app.celery_app.runtime import WorkerRuntime
+
+    runtime = WorkerRuntime()
+    try:
+        runtime.start()
+        engine = runtime.engine
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        assert runtime.run(current_loop()) is runtime.loop
+        assert runtime.run(current_loop()) is runtime.loop
+        runtime.start()
+        assert runtime.engine is engine
+    finally:
+        runtime.stop()
+    assert not runtime.started
@@ -1,17 +1,23 @@
+import json
 import pytest
 from fastapi import status
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
+from geoalchemy2.elements import WKTElement
+from geoalchemy2.shape import from_shape
+from shapely.geometry import Point
 from app.models import Event, User
+from app.responses import FastJSONResponse
+from app.services.event_serializer import events_to_responses
+from app.services.lean_reads import EventRow
 from datetime import datetime, timedelta, timezone
 
 @pytest.mark.asyncio
 async def test_create_event(client: AsyncClient, sample_user):
     """Test creating a new event."""
     # First, login to get the token
-    user = await sample_user
     login_data = {
-        "username": user.email,
+        "username": sample_user.email,
         "password": "testpassword"
     }
     login_response = await client.post("/api/v1/auth/login", data=login_data)
@@ -49,4 +55,95 @@ async def test_create_event(client: AsyncClient, sample_user):
     assert data["available_tickets"] == event_data["total_tickets"]
     assert "id" in data
     assert "venue" in data
-    assert data["venue"]["address"] == event_data["venue"]["address"]
\ No newline at end of file
+    assert data["venue"]["address"] == event_data["venue"]["address"]
+
+def test_events_to_responses_decodes_locations_in_bulk():
+    start = datetime.now(timezone.utc)
+    locations = [
+        from_shape(Point(3.4283, 6.4281), srid=4326),
+        WKTElement('POINT(-0.1276 51.5072)', srid=4326),
+        None,
+    ]
+    events = [
+        Event(id=i, title=f"Event {i}", start_time=start, end_time=start, total_tickets=10,
+              tickets_sold=4, venue_address="Somewhere", venue_location=location)
+        for i, location in enumerate(locations)
+    ]
+
+    responses = events_to_responses(events)
+    assert [response.venue for response in responses] == [
+        {"address": "Somewhere", "latitude": 6.4281, "longitude": 3.4283},
+        {"address": "Somewhere", "latitude": 51.5072, "longitude": -0.1276},
+        None,
+    ]
+    assert responses[0].available_tickets == 6
+
+def test_lean_event_payload_matches_response_model():
+    start = datetime(2030, 5, 1, 18, 30, 15, 250000, tzinfo=timezone.utc)
+    event = Event(id=1, title="Event", description=None, start_time=start, end_time=start,
+                  total_tickets=10, tickets_sold=4, venue_address="Somewhere",
+                  venue_location=WKTElement('POINT(3.4283 6.4281)', srid=4326))
+    row = (1, "Event", None, start, start, 10, 4, "Somewhere", 3.4283, 6.4281)
+
+    lean = json.loads(FastJSONResponse(EventRow.from_row(row)).body)
+    assert lean == events_to_responses([event])[0].model_dump(mode="json")
+
+def test_pagination_cursor_round_trip():
+    from app.services.pagination import decode_cursor, encode_cursor
+
+    start_time = datetime(2030, 5, 1, 18, 30)
+    assert decode_cursor(encode_cursor(start_time, 42)) == (start_time, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+@pytest.mark.asyncio
+async def test_list_events_keyset_pages(client: AsyncClient, db_session: AsyncSession):
+    from geoalchemy2.elements import WKTElement
+
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    db_session.add_all([
+        Event(
+            title=f"Event {i}",
+            start_time=start + timedelta(hours=i),
+            end_time=start + timedelta(hours=i + 2),
+            total_tickets=10,
+            tickets_sold=0,
+            venue_address="Eko Hotel, Lagos",
+            venue_location=WKTElement('POINT(3.4283 6.4281)', srid=4326)
+        )
+        for i in range(5)
+    ])
+    await db_session.commit()
+
+    titles = []
+    response = await client.get("/api/v1/events/", params={"limit": 2})
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        titles += [event["title"] for event in response.json()]
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        response = await client.get("/api/v1/events/", params={"limit": 2, "cursor": next_cursor})
+
+    assert titles == [f"Event {i}" for i in range(5)]
+
+@pytest.mark.asyncio
+async def test_get_event_cache_tracks_ticket_sales(
+    client: AsyncClient, sample_user, sample_event, superuser_headers
+):
+    response = await client.get(f"/api/v1/events/{sample_event.id}")
+    assert response.json()["available_tickets"] == 100
+
+    # The second read is served from the cache
+    response = await client.get(f"/api/v1/events/{sample_event.id}")
+    assert response.json()["title"] == sample_event.title
+    assert (await client.get("/api/v1/admin/cache")).status_code == status.HTTP_401_UNAUTHORIZED
+    stats = (await client.get("/api/v1/admin/cache", headers=superuser_headers)).json()
+    assert stats["events"]["hits"] >= 1
+
+    ticket_data = {"event_id": sample_event.id, "user_id": sample_user.id}
+    assert (await client.post("/api/v1/tickets/", json=ticket_data)).status_code == status.HTTP_201_CREATED
+
+    response = await client.get(f"/api/v1/events/{sample_event.id}")
+    assert response.json()["tickets_sold"] == 1
+    assert response.json()["available_tickets"] == 99
@@ -0,0 +1,70 @@
+import pytest
+
+from app.services.geo_tiles import GeoTileCache, covering_cells, encode_geohash, precision_for
+
+class FakeEventRepository:
+    """Answers box queries from an in-memory list of (id, longitude, latitude)"""
+
+    def __init__(self, events):
+        self.events = events
+        self.queries = 0
+
+    async def get_locations_in_boxes(self, boxes, limit=None):
+        self.queries += 1
+        return [
+            event for event in self.events
+            if any(west <= event[1] <= east and south <= event[2] <= north
+                   for west, south, east, north in boxes)
+        ][:limit]
+
+def test_encode_geohash():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+def test_covering_cells_contain_the_search_point():
+    precision = precision_for(6.5244, 5)
+    cells = covering_cells(6.5244, 3.3792, 5, precision)
+    assert encode_geohash(6.5244, 3.3792, precision) in cells
+    assert len(cells) <= 9
+    assert covering_cells(89.99, 0, 5, precision) is None
+
+@pytest.mark.asyncio
+async def test_nearby_event_ids_filters_exactly_and_reuses_cells():
+    repository = FakeEventRepository([
+        (1, 3.3792, 6.5244),    # at the search point
+        (2, 3.4283, 6.4281),    # ~12 km away
+        (3, 3.3900, 6.5300),    # ~1.3 km away
+        (4, 4.5000, 7.5000),    # far outside
+    ])
+    tiles = GeoTileCache()
+
+    assert await tiles.nearby_event_ids(repository, 6.5244, 3.3792, 15) == [1, 3, 2]
+    # Smaller radius and a nearby point fall in the same cells: served from cache
+    assert await tiles.nearby_event_ids(repository, 6.5244, 3.3792, 5) == [1, 3]
+    assert await tiles.nearby_event_ids(repository, 6.5250, 3.3800, 5, limit=1) == [1]
+    assert repository.queries == 1
+
+    repository.events.append((5, 3.3795, 6.5246))
+    await tiles.invalidate_point(6.5246, 3.3795)
+    assert await tiles.nearby_event_ids(repository, 6.5244, 3.3792, 5) == [1, 5, 3]
+    assert repository.queries == 2
+
+    level = tiles.stats()["levels"][precision_for(6.5244, 5)]
+    assert level["lookups"] == 4
+    assert 0 < level["hit_ratio"] < 1
+
+@pytest.mark.asyncio
+async def test_nearby_event_ids_leaves_wide_and_crowded_searches_to_postgis(monkeypatch):
+    from app.services import geo_tiles as geo_tiles_module
+    repository = FakeEventRepository([(n, 3.3792 + n * 1e-4, 6.5244) for n in range(1, 6)])
+    tiles = GeoTileCache()
+
+    # Cells of a 100 km search are hundreds of km across
+    assert await tiles.nearby_event_ids(repository, 6.5244, 3.3792, 100) is None
+    assert repository.queries == 0
+
+    monkeypatch.setattr(geo_tiles_module.settings, "GEO_TILE_MAX_CELL_EVENTS", 3)
+    assert await tiles.nearby_event_ids(repository, 6.5244, 3.3792, 1) is None
+    assert tiles.stats()["bypassed"] == 2
+
+    monkeypatch.setattr(geo_tiles_module.settings, "GEO_TILE_MAX_CELL_EVENTS", 5)
+    assert await tiles.nearby_event_ids(repository, 6.5244, 3.3792, 1) == [1, 2, 3, 4, 5]
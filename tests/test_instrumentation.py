@@ -0,0 +1,90 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from app.db_pool import PoolTelemetryMixin, target_max_overflow
+
+from app.instrumentation import (
+    Histogram, InstrumentationMiddleware, instrument_engine, render_metrics,
+    request_duration, request_statements, reset_metrics,
+)
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, '/a"b')
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a\\"b"} 4.25',
+        'latency_seconds_count{route="/a\\"b"} 4',
+    ]
+
+@pytest.mark.asyncio
+async def test_middleware_counts_statements_per_route():
+    reset_metrics()
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    app = FastAPI()
+    app.add_middleware(InstrumentationMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        await client.get("/missing")
+
+    counts, total = request_statements._series[("GET", "/items/{item_id}")]
+    assert (sum(counts), total) == (2, 6)
+    assert ("GET", "unmatched", "404") in request_duration._series
+    assert 'http_request_sql_statements_count{method="GET",route="/items/{item_id}"} 2' in render_metrics()
+    reset_metrics()
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+class TelemetryPool(PoolTelemetryMixin, QueuePool):
+    pass
+
+def test_pool_telemetry_tracks_saturation_and_timeouts():
+    pool = TelemetryPool(FakeConnection, pool_size=2, max_overflow=1, timeout=0.01)
+    connections = [pool.connect() for _ in range(3)]
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+
+    stats = pool.stats()
+    assert (stats["checked_out"], stats["overflow"], stats["saturation"]) == (3, 1, 1.0)
+    assert (stats["checkouts"], stats["timeouts"], stats["peak_overflow"]) == (3, 1, 1)
+    assert pool.take_window() == {"peak_in_use": 3, "peak_waiting": 1, "timeouts": 1}
+
+    # Raising the allowance lets the waiting checkout through
+    pool.set_max_overflow(2)
+    connections.append(pool.connect())
+    for connection in connections:
+        connection.close()
+    assert pool.stats()["checked_out"] == 0
+
+def test_target_max_overflow_grows_fast_and_shrinks_slowly():
+    # 30 in use plus 10 waiting on a pool of 20: cover 40 * 1.25
+    assert target_max_overflow(20, 10, 30, 10, 1.25, 50) == 30
+    assert target_max_overflow(20, 10, 60, 20, 1.25, 50) == 50
+    # Quiet window: give back a quarter at a time
+    assert target_max_overflow(20, 30, 5, 0, 1.25, 50) == 23
+    assert target_max_overflow(20, 1, 0, 0, 1.25, 50) == 0
@@ -0,0 +1,36 @@
+import numpy as np
+from datetime import datetime, timedelta, timezone
+
+from app.services.ranking import CandidateFeatures, RankingWeights, rank, score_candidates, top_k
+
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+def features(**overrides):
+    values = dict(
+        ids=[1, 2, 3, 4],
+        latitudes=[6.52, 6.43, 51.5, np.nan],
+        longitudes=[3.38, 3.43, -0.12, np.nan],
+        start_times=[(NOW + timedelta(days=days)).timestamp() for days in (1, 1, 1, -1)],
+        tickets_sold=[10, 10, 10, 10],
+        total_tickets=[100, 100, 100, 100],
+    )
+    values.update(overrides)
+    return CandidateFeatures(**values)
+
+def test_top_k_matches_a_full_sort():
+    scores = np.random.default_rng(7).random(1000)
+    assert top_k(scores, 10).tolist() == np.argsort(-scores)[:10].tolist()
+    assert top_k(np.array([0.5, -np.inf, 0.9]), 5).tolist() == [2, 0]
+
+def test_rank_prefers_nearby_and_skips_unbookable_events():
+    weights = RankingWeights(affinity=0, time=0, fill=0, popularity=0, distance=1)
+    # Lagos user: the London event ranks last, the started event is dropped
+    assert rank(features(), 10, now=NOW, origin=(6.52, 3.38), weights=weights) == [0, 1, 2]
+
+    sold_out = features(tickets_sold=[100, 10, 10, 10])
+    scores = score_candidates(sold_out, now=NOW, origin=(6.52, 3.38))
+    assert np.isneginf(scores[0]) and np.isneginf(scores[3])
+
+def test_affinity_orders_equal_candidates():
+    ranked = rank(features(affinity=[0.1, 0.9, 0.5, 1.0]), 2, now=NOW)
+    assert ranked == [1, 2]
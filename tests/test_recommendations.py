@@ -0,0 +1,70 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from geoalchemy2.elements import WKTElement
+
+from app.models import Event, Ticket, TicketStatus, User
+from app.services.recommendations import RecommendationService, combine_candidates
+
+def test_combine_candidates_ranks_and_drops_owned_events():
+    candidates = combine_candidates(
+        co_purchases=[(1, 10, 4), (1, 11, 2), (1, 12, 4)],
+        nearby=[(1, 11, 1000.0), (1, 13, 49000.0), (2, 13, 0.0)],
+        owned=[(1, 12)],
+        user_ids=[1, 2, 3],
+        radius_km=50,
+        size=2,
+    )
+    event_ids, scores = candidates[1]
+    assert event_ids == [10, 11]
+    assert scores[0] == pytest.approx(0.7)
+    assert scores[1] == pytest.approx(0.35 + 0.3 * 0.98)
+    assert candidates[2] == ([13], [pytest.approx(0.3)])
+    assert candidates[3] == ([], [])
+
+def make_event(title: str, days: int) -> Event:
+    return Event(
+        title=title,
+        start_time=datetime.utcnow() + timedelta(days=days),
+        end_time=datetime.utcnow() + timedelta(days=days, hours=3),
+        total_tickets=100,
+        tickets_sold=0,
+        venue_address="Lagos",
+        venue_location=WKTElement('POINT(3.4283 6.4281)', srid=4326),
+    )
+
+@pytest.mark.asyncio
+async def test_recommendations_follow_co_purchases(client: AsyncClient, db_session: AsyncSession):
+    alice = User(name="Alice", email="alice@example.com", hashed_password="x")
+    bob = User(name="Bob", email="bob@example.com", hashed_password="x")
+    shared, suggested, unrelated = make_event("Shared", 1), make_event("Suggested", 9), make_event("Soon", 2)
+    db_session.add_all([alice, bob, shared, suggested, unrelated])
+    await db_session.commit()
+
+    paid_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db_session.add_all([
+        Ticket(user_id=alice.id, event_id=shared.id, status=TicketStatus.PAID, paid_at=paid_at),
+        Ticket(user_id=bob.id, event_id=shared.id, status=TicketStatus.PAID, paid_at=paid_at),
+        Ticket(user_id=bob.id, event_id=suggested.id, status=TicketStatus.PAID, paid_at=paid_at),
+    ])
+    await db_session.commit()
+
+    assert await RecommendationService(db_session).build() == 2
+    # Nothing changed since the watermark
+    assert await RecommendationService(db_session).build() == 0
+
+    # Stamped before the last build's snapshot but committed after it
+    db_session.add(Ticket(
+        user_id=bob.id, event_id=shared.id, status=TicketStatus.PAID,
+        paid_at=datetime.now(timezone.utc) - timedelta(seconds=30),
+    ))
+    await db_session.commit()
+    assert await RecommendationService(db_session).build() == 2
+
+    response = await client.get(f"/api/v1/for-you/events/recommended?user_id={alice.id}&limit=2")
+    assert response.status_code == status.HTTP_200_OK
+    titles = [event["title"] for event in response.json()]
+    # The co-purchase comes first, then upcoming events top up the list
+    assert titles == ["Suggested", "Shared"]
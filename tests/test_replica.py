@@ -0,0 +1,161 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, Request, Response, status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import database, db_replica
+from app.db_replica import READ_PRIMARY_COOKIE, ReplicaRouter
+from app.database import get_read_db, get_read_sessionmaker
+from app.models import Ticket, TicketStatus
+
+
+def make_request(cookies: dict = None) -> Request:
+    header = "; ".join(f"{name}={value}" for name, value in (cookies or {}).items())
+    headers = [(b"cookie", header.encode())] if header else []
+    return Request({"type": "http", "headers": headers})
+
+
+class FakeProbe:
+    def __init__(self, lag):
+        self.lag = lag
+        self.calls = 0
+
+    async def __call__(self) -> float:
+        self.calls += 1
+        if isinstance(self.lag, Exception):
+            raise self.lag
+        return self.lag
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_primary_when_replica_lags(monkeypatch):
+    monkeypatch.setattr(db_replica.settings, "REPLICA_MAX_LAG_SECONDS", 5.0)
+    monkeypatch.setattr(db_replica.settings, "REPLICA_LAG_CHECK_SECONDS", 60.0)
+    primary, replica = object(), object()
+
+    probe = FakeProbe(0.5)
+    router = ReplicaRouter(primary, replica, probe=probe)
+    assert await router.sessions_for(make_request()) is replica
+    assert await router.sessions_for(make_request()) is replica
+    # Lag is measured once per check interval, not per request
+    assert probe.calls == 1
+
+    router = ReplicaRouter(primary, replica, probe=FakeProbe(30.0))
+    assert await router.sessions_for(make_request()) is primary
+    router = ReplicaRouter(primary, replica, probe=FakeProbe(OSError("replica down")))
+    assert await router.sessions_for(make_request()) is primary
+    assert router.stats()["lag_fallbacks"] == 1
+
+    # Without a replica every read goes to the primary
+    assert await ReplicaRouter(primary).sessions_for(make_request()) is primary
+
+
+@pytest.mark.asyncio
+async def test_slow_lag_probe_does_not_hold_up_reads(monkeypatch):
+    monkeypatch.setattr(db_replica.settings, "REPLICA_LAG_CHECK_SECONDS", 60.0)
+    monkeypatch.setattr(db_replica.settings, "REPLICA_PROBE_TIMEOUT_SECONDS", 0.05)
+    primary, replica = object(), object()
+    probe = FakeProbe(0.0)
+
+    async def hanging_probe() -> float:
+        await probe()
+        await asyncio.sleep(30)
+        return 0.0
+
+    router = ReplicaRouter(primary, replica, probe=hanging_probe)
+    started = time.monotonic()
+    first, second = await asyncio.gather(
+        router.sessions_for(make_request()), router.sessions_for(make_request())
+    )
+    # The probe is cut short and the concurrent read did not queue behind it
+    assert time.monotonic() - started < 1
+    assert first is primary and second is primary
+    assert probe.calls == 1
+    # The timed-out result is kept for the check interval
+    assert await router.sessions_for(make_request()) is primary
+    assert probe.calls == 1
+
+
+class FakeSession:
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_session_and_sessionmaker_share_one_routing_decision(monkeypatch):
+    monkeypatch.setattr(db_replica.settings, "REPLICA_LAG_CHECK_SECONDS", 0.0)
+    primary = lambda: FakeSession(primary)
+    replica = lambda: FakeSession(replica)
+    probe = FakeProbe(0.0)
+    router = ReplicaRouter(primary, replica, probe=probe)
+    monkeypatch.setattr(database, "replica_router", router)
+
+    api = FastAPI()
+
+    @api.get("/export")
+    async def export(db=Depends(get_read_db), sessions=Depends(get_read_sessionmaker)):
+        return {"same": db.sessions is sessions}
+
+    async with AsyncClient(app=api, base_url="http://test") as client:
+        response = await client.get("/export")
+    assert response.json() == {"same": True}
+    assert probe.calls == 1
+    assert router.stats()["replica_reads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_recent_writers_read_from_primary(monkeypatch):
+    monkeypatch.setattr(db_replica.settings, "READ_YOUR_WRITES_SECONDS", 10.0)
+    primary, replica = object(), object()
+    router = ReplicaRouter(primary, replica, probe=FakeProbe(0.0))
+
+    response = Response()
+    ReplicaRouter.mark_write(response)
+    cookie = response.headers["set-cookie"]
+    assert cookie.startswith(f"{READ_PRIMARY_COOKIE}=")
+    until = cookie.split(";")[0].split("=")[1]
+
+    assert await router.sessions_for(make_request({READ_PRIMARY_COOKIE: until})) is primary
+    expired = str(int(time.time()) - 1)
+    assert await router.sessions_for(make_request({READ_PRIMARY_COOKIE: expired})) is replica
+    assert await router.sessions_for(make_request({READ_PRIMARY_COOKIE: "junk"})) is replica
+    assert router.stats()["sticky_reads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ticket_history_reads_replica_until_client_writes(
+    replica_client: AsyncClient, sample_user, sample_event, db_session: AsyncSession
+):
+    db_session.add(Ticket(user_id=sample_user.id, event_id=sample_event.id, status=TicketStatus.PAID))
+    await db_session.commit()
+
+    # The stand-in replica never receives the primary's rows
+    response = await replica_client.get(f"/api/v1/tickets/user/{sample_user.id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+    login_response = await replica_client.post(
+        "/api/v1/auth/login", data={"username": sample_user.email, "password": "testpassword"}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    response = await replica_client.post(
+        "/api/v1/tickets/", json={"event_id": sample_event.id, "user_id": sample_user.id}, headers=headers
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert READ_PRIMARY_COOKIE in response.cookies
+
+    # The purchase pins this client's reads to the primary
+    response = await replica_client.get(f"/api/v1/tickets/user/{sample_user.id}")
+    assert len(response.json()) == 2
@@ -0,0 +1,76 @@
+import json
+import pytest
+from fakeredis import aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Ticket
+from app.schemas.ticket import TicketCreate
+from app.services.reservation_ledger import ReservationLedger, PENDING_KEY, STATUS_KEY
+from app.services.ticket import TicketService
+
+@pytest.mark.asyncio
+async def test_ledger_never_oversells():
+    redis = aioredis.FakeRedis(decode_responses=True)
+    ledger = ReservationLedger(redis)
+    await ledger.prime(event_id=1, available=3)
+
+    reservation_ids = [await ledger.reserve(None, event_id=1, user_id=7) for _ in range(3)]
+    assert reservation_ids == [1, 2, 3]
+    assert await ledger.available(1) == 0
+
+    with pytest.raises(ValueError):
+        await ledger.reserve(None, event_id=1, user_id=7)
+
+    queued = [json.loads(item) for item in await redis.lrange(PENDING_KEY, 0, -1)]
+    assert [record[:3] for record in queued] == [[1, 1, 7], [2, 1, 7], [3, 1, 7]]
+
+    status = await ledger.status(2)
+    assert status["status"] == "pending"
+    assert await ledger.status(4) is None
+
+@pytest.mark.asyncio
+async def test_ledger_release_returns_seats():
+    redis = aioredis.FakeRedis(decode_responses=True)
+    ledger = ReservationLedger(redis)
+    await ledger.prime(event_id=1, available=1)
+    await ledger.reserve(None, event_id=1, user_id=7)
+
+    await ledger.release(1, 1)
+    assert await ledger.available(1) == 1
+
+    # Untracked events are left for the next load from Postgres
+    await ledger.release(2, 1)
+    assert await ledger.available(2) is None
+
+@pytest.mark.asyncio
+async def test_ledger_flush_rejects_seats_sold_through_postgres(
+    sample_user, sample_event, db_session: AsyncSession
+):
+    sample_event.total_tickets = 2
+    await db_session.commit()
+    redis = aioredis.FakeRedis(decode_responses=True)
+    ledger = ReservationLedger(redis)
+
+    first = await ledger.reserve(db_session, sample_event.id, sample_user.id)
+    second = await ledger.reserve(db_session, sample_event.id, sample_user.id)
+    # Sold through POST /tickets/ while both reservations are still queued
+    await TicketService(db_session).create_ticket(
+        TicketCreate(event_id=sample_event.id, user_id=sample_user.id)
+    )
+
+    assert await ledger.flush(db_session) == 2
+    assert (await ledger.status(first))["status"] == "confirmed"
+    assert (await ledger.status(second))["status"] == "rejected"
+    assert await ledger.available(sample_event.id) == 0
+    # Outcomes expire instead of piling up; a settled id is then unknown, not pending
+    assert await redis.ttl(STATUS_KEY.format(reservation_id=first)) > 0
+    await redis.delete(STATUS_KEY.format(reservation_id=first))
+    assert await ledger.status(first) is None
+
+    await db_session.refresh(sample_event)
+    assert sample_event.tickets_sold == 2
+    tickets = (await db_session.execute(
+        select(Ticket).where(Ticket.event_id == sample_event.id)
+    )).scalars().all()
+    assert len(tickets) == 2
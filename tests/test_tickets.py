@@ -1,19 +1,20 @@
+import json
 import pytest
 from fastapi import status
 from httpx import AsyncClient
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Ticket, TicketStatus, User, Event
+from app.responses import FastJSONResponse
+from app.schemas.ticket import TicketResponse
+from app.services.lean_reads import TicketRow
+from app.services.ticket_export import csv_chunk, ndjson_chunk
 
 @pytest.mark.asyncio
 async def test_reserve_ticket(client: AsyncClient, sample_user, sample_event):
-    # Get the actual user and event objects by awaiting the fixtures
-    user = await sample_user
-    event = await sample_event
-    
     # First, login to get the token
     login_data = {
-        "username": user.email,
+        "username": sample_user.email,
         "password": "testpassword"
     }
     login_response = await client.post("/api/v1/auth/login", data=login_data)
@@ -24,23 +25,21 @@ async def test_reserve_ticket(client: AsyncClient, sample_user, sample_event):
     
     # Prepare ticket data
     ticket_data = {
-        "event_id": event.id,
-        "user_id": user.id
+        "event_id": sample_event.id,
+        "user_id": sample_user.id
     }
     response = await client.post("/api/v1/tickets/", json=ticket_data, headers=headers)
     assert response.status_code == status.HTTP_201_CREATED
     data = response.json()
     assert data["status"] == "reserved"
-    assert data["event_id"] == event.id
-    assert data["user_id"] == user.id
+    assert data["event_id"] == sample_event.id
+    assert data["user_id"] == sample_user.id
 
 @pytest.mark.asyncio
 async def test_pay_ticket(client: AsyncClient, sample_user, sample_event, db_session: AsyncSession):
     # First, login to get the token
-    user = await sample_user
-    event = await sample_event
     login_data = {
-        "username": user.email,
+        "username": sample_user.email,
         "password": "testpassword"
     }
     login_response = await client.post("/api/v1/auth/login", data=login_data)
@@ -51,8 +50,8 @@ async def test_pay_ticket(client: AsyncClient, sample_user, sample_event, db_ses
     
     # Create a reserved ticket
     ticket = Ticket(
-        user_id=user.id,
-        event_id=event.id,
+        user_id=sample_user.id,
+        event_id=sample_event.id,
         status=TicketStatus.RESERVED,
         created_at=datetime.now(timezone.utc)
     )
@@ -73,4 +72,157 @@ async def test_pay_ticket(client: AsyncClient, sample_user, sample_event, db_ses
     data = response.json()
     assert data["status"] == "paid"
     assert data["payment_reference"] == payment_data["payment_reference"]
-    assert "paid_at" in data
\ No newline at end of file
+    assert "paid_at" in data
+
+@pytest.mark.asyncio
+async def test_reserve_ticket_sharded_inventory(
+    client: AsyncClient, sample_user, sample_event, db_session: AsyncSession, monkeypatch
+):
+    from app.services import ticket as ticket_service_module
+    from app.services.ticket import TicketService
+    monkeypatch.setattr(ticket_service_module.settings, "INVENTORY_SHARDS", 4)
+
+    ticket_data = {"event_id": sample_event.id, "user_id": sample_user.id}
+    for _ in range(3):
+        response = await client.post("/api/v1/tickets/", json=ticket_data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    # The event row is only brought up to date by the reconcile step
+    await TicketService(db_session).reconcile_inventory()
+    await db_session.refresh(sample_event)
+    assert sample_event.tickets_sold == 3
+    assert sample_event.available_tickets == sample_event.total_tickets - 3
+
+@pytest.mark.asyncio
+async def test_reserve_tickets_bulk_all_or_nothing(
+    client: AsyncClient, sample_user, sample_event, db_session: AsyncSession
+):
+    second_event = Event(
+        title="Second Show",
+        start_time=datetime.utcnow() + timedelta(days=2),
+        end_time=datetime.utcnow() + timedelta(days=2, hours=2),
+        total_tickets=3,
+        tickets_sold=0,
+        venue_address="Lagos",
+        venue_location=sample_event.venue_location,
+    )
+    db_session.add(second_event)
+    await db_session.commit()
+
+    response = await client.post("/api/v1/tickets/bulk", json={
+        "user_id": sample_user.id,
+        "items": [
+            {"event_id": second_event.id, "quantity": 2},
+            {"event_id": sample_event.id, "quantity": 3},
+        ],
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    tickets = response.json()
+    assert len(tickets) == 5
+    assert all(ticket["status"] == "reserved" for ticket in tickets)
+
+    # Only one seat left on the second event: nothing is reserved
+    response = await client.post("/api/v1/tickets/bulk", json={
+        "user_id": sample_user.id,
+        "items": [
+            {"event_id": sample_event.id, "quantity": 1},
+            {"event_id": second_event.id, "quantity": 2},
+        ],
+    })
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    await db_session.refresh(sample_event)
+    await db_session.refresh(second_event)
+    assert (sample_event.tickets_sold, second_event.tickets_sold) == (3, 2)
+
+@pytest.mark.asyncio
+async def test_pay_ticket_is_idempotent(
+    client: AsyncClient, sample_user, sample_event, db_session: AsyncSession
+):
+    tickets = [
+        Ticket(user_id=sample_user.id, event_id=sample_event.id,
+               status=TicketStatus.RESERVED, created_at=datetime.now(timezone.utc))
+        for _ in range(3)
+    ]
+    db_session.add_all(tickets)
+    await db_session.commit()
+    first, second, third = tickets
+
+    url = f"/api/v1/tickets/{first.id}/pay"
+    paid = await client.post(url, json={"payment_reference": "pay_1"})
+    repeat = await client.post(url, json={"payment_reference": "pay_1"})
+    assert paid.status_code == repeat.status_code == status.HTTP_200_OK
+    assert repeat.json()["paid_at"] == paid.json()["paid_at"]
+
+    # One reference pays for one ticket only
+    response = await client.post(f"/api/v1/tickets/{second.id}/pay", json={"payment_reference": "pay_1"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = await client.post("/api/v1/tickets/pay/batch", json={"payments": [
+        {"ticket_id": first.id, "payment_reference": "pay_1"},
+        {"ticket_id": second.id, "payment_reference": "pay_2"},
+        {"ticket_id": third.id, "payment_reference": "pay_1"},
+        {"ticket_id": 999999, "payment_reference": "pay_3"},
+        {"ticket_id": second.id, "payment_reference": "pay_4"},
+    ]})
+    assert response.status_code == status.HTTP_200_OK
+    assert [outcome["status"] for outcome in response.json()] == [
+        "already_paid", "paid", "rejected", "rejected", "rejected"
+    ]
+    # A repeated ticket keeps its first line's outcome
+    assert response.json()[4]["detail"] == "Duplicate ticket or payment reference in batch"
+
+    await db_session.refresh(third)
+    assert third.status == TicketStatus.RESERVED
+
+
+def test_lean_ticket_payload_matches_response_model():
+    created_at = datetime(2026, 1, 1, 12, 0, 0, 5000, tzinfo=timezone.utc)
+    row = (4, 2, 3, TicketStatus.PAID, created_at, "pay_4", created_at)
+    ticket = Ticket(id=4, user_id=2, event_id=3, status=TicketStatus.PAID,
+                    created_at=created_at, payment_reference="pay_4", paid_at=created_at)
+
+    lean = FastJSONResponse(TicketRow.from_row(row)).body
+    assert json.loads(lean) == TicketResponse.model_validate(ticket).model_dump(mode="json")
+
+def test_export_chunks():
+    created_at = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    rows = [(1, 2, 3, TicketStatus.PAID, created_at, "pay_1", created_at),
+            (4, 2, 3, TicketStatus.RESERVED, created_at, None, None)]
+
+    lines = ndjson_chunk(rows).decode().splitlines()
+    assert json.loads(lines[0]) == {
+        "id": 1, "user_id": 2, "event_id": 3, "status": "paid",
+        "created_at": "2026-01-01T12:00:00+00:00", "payment_reference": "pay_1",
+        "paid_at": "2026-01-01T12:00:00+00:00",
+    }
+    assert json.loads(lines[1])["paid_at"] is None
+
+    assert csv_chunk(rows[1:], header=True).decode().splitlines() == [
+        "id,user_id,event_id,status,created_at,payment_reference,paid_at",
+        "4,2,3,reserved,2026-01-01T12:00:00+00:00,,",
+    ]
+
+@pytest.mark.asyncio
+async def test_export_tickets_streams_every_row(
+    client: AsyncClient, sample_user, sample_event, db_session: AsyncSession
+):
+    db_session.add_all([
+        Ticket(user_id=sample_user.id, event_id=sample_event.id,
+               status=TicketStatus.RESERVED, created_at=datetime.now(timezone.utc))
+        for _ in range(25)
+    ])
+    await db_session.commit()
+
+    response = await client.get(f"/api/v1/tickets/user/{sample_user.id}/export")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    ids = [json.loads(line)["id"] for line in response.text.splitlines()]
+    assert len(ids) == 25 and ids == sorted(ids)
+
+    response = await client.get(f"/api/v1/events/{sample_event.id}/tickets/export", params={"format": "csv"})
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.text.splitlines()) == 26
+
+    response = await client.get("/api/v1/events/999999/tickets/export")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,116 @@
+import pytest
+from fakeredis import aioredis
+from fastapi import status
+from httpx import AsyncClient
+
+from app.services import waiting_room as waiting_room_module
+from app.services.waiting_room import NotAdmitted, WaitingRoom
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_waiting_room_admits_in_order_at_release_rate(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(waiting_room_module.time, "time", clock)
+    room = WaitingRoom(aioredis.FakeRedis(decode_responses=True), metrics={})
+
+    # Events without an open room are not gated
+    await room.admit([1], [])
+
+    await room.open(1, rate=2)
+    places = [await room.join(1) for _ in range(3)]
+    assert [place["position"] for place in places] == [1, 2, 3]
+    assert not any(place["admitted"] for place in places)
+    assert places[2]["estimated_wait_seconds"] == 1.5
+
+    with pytest.raises(NotAdmitted) as error:
+        await room.admit([1], [])
+    assert error.value.retry_after is None
+    with pytest.raises(NotAdmitted) as error:
+        await room.admit([1], [places[0]["token"]])
+    assert error.value.retry_after == 1
+
+    clock.now += 1
+    assert (await room.status(1, places[1]["token"]))["admitted"]
+    assert not (await room.status(1, places[2]["token"]))["admitted"]
+
+    await room.admit([1, 2], [places[0]["token"]])
+    with pytest.raises(NotAdmitted, match="already used"):
+        await room.admit([1], [places[0]["token"]])
+    with pytest.raises(NotAdmitted, match="Invalid"):
+        await room.admit([1], [places[1]["token"][:-2] + "xx"])
+
+    assert (await room.depths())[1]["depth"] == 1
+    stats = room.metrics[1].stats()
+    assert stats["joined"] == 3 and stats["admitted"] == 1 and stats["rejected"] == 4
+    assert stats["wait_seconds"]["max"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_waiting_room_does_not_bank_idle_capacity(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(waiting_room_module.time, "time", clock)
+    room = WaitingRoom(aioredis.FakeRedis(decode_responses=True), metrics={})
+    await room.open(1, rate=1)
+
+    # A long quiet spell must not let the next burst straight through
+    clock.now += 3600
+    places = [await room.join(1) for _ in range(10)]
+    clock.now += 2
+    assert [(await room.status(1, place["token"]))["admitted"] for place in places[:3]] == [True, True, False]
+
+    # Closing ungates the event and keeps tokens from being reused after reopening
+    await room.close(1)
+    await room.admit([1], [])
+    await room.open(1, rate=1)
+    assert (await room.join(1))["position"] == 11
+
+
+
+@pytest.mark.asyncio
+async def test_waiting_room_spends_tokens_together(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(waiting_room_module.time, "time", clock)
+    room = WaitingRoom(aioredis.FakeRedis(decode_responses=True), metrics={})
+    await room.open(1, rate=1)
+    await room.open(2, rate=1)
+    first = await room.join(1)
+    await room.join(2)
+    second = await room.join(2)
+    clock.now += 1
+
+    # The second event's token is not admitted yet, so the first one is not spent
+    with pytest.raises(NotAdmitted, match="Not admitted yet"):
+        await room.admit([1, 2], [first["token"], second["token"]])
+    used = await room.admit([1], [first["token"]])
+    assert len(used) == 1
+
+    # A failed reservation gives its token back
+    await room.release(used)
+    await room.admit([1], [first["token"]])
+    with pytest.raises(NotAdmitted, match="already used"):
+        await room.admit([1], [first["token"]])
+
+@pytest.mark.asyncio
+async def test_waiting_room_admin_routes_need_a_superuser(
+    client: AsyncClient, sample_user, sample_event, superuser_headers
+):
+    url = f"/api/v1/admin/waiting-room/{sample_event.id}"
+    assert (await client.put(url, json={"rate": 1e9})).status_code == status.HTTP_401_UNAUTHORIZED
+    assert (await client.delete(url)).status_code == status.HTTP_401_UNAUTHORIZED
+
+    login = await client.post(
+        "/api/v1/auth/login", data={"username": sample_user.email, "password": "testpassword"}
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert (await client.put(url, json={"rate": 5}, headers=headers)).status_code == status.HTTP_403_FORBIDDEN
+
+    assert (await client.put(url, json={"rate": 5}, headers=superuser_headers)).status_code == status.HTTP_204_NO_CONTENT
+    assert (await client.delete(url, headers=superuser_headers)).status_code == status.HTTP_204_NO_CONTENT